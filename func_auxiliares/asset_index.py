@@ -0,0 +1,171 @@
+# func_auxiliares/asset_index.py
+"""
+Índice en memoria de las imágenes de assets/tesis.
+
+Las galerías buscan las imágenes de cada tabla en
+``<ASSETS_DIR>/<carpeta de grupo>/<table_id>/`` (``GROUP_FOLDERS``). En vez
+de listar esas carpetas en cada página, el índice recorre ``ASSETS_DIR`` una
+vez y guarda, por tabla y grupo, el nombre, la ruta relativa a assets (la
+que usa ``dash.get_asset_url``), el tamaño y las dimensiones de cada imagen
+(las de los PNG salen de la cabecera IHDR, sin decodificar la imagen).
+
+El índice se refresca por sondeo: en una consulta, si pasaron más de
+``poll_interval`` segundos desde el último recorrido, vuelve a recorrer las
+carpetas con ``os.scandir`` (unas decenas de ``stat``) y sólo relee la
+cabecera de los archivos cuyo mtime o tamaño cambió. Las consultas son
+búsquedas en diccionarios.
+"""
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from func_auxiliares.config import ASSETS_DIR
+
+logger = logging.getLogger(__name__)
+
+# etiqueta del grupo en la galería → carpeta dentro de ASSETS_DIR
+GROUP_FOLDERS = {
+    "Serie completa": "serie_completa",
+    "Crisis": "crisis",
+}
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+DEFAULT_POLL_INTERVAL = 2.0
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    """Una imagen de la galería."""
+    name: str                   # nombre del archivo
+    path: str                   # relativa a ASSETS_DIR, con "/"
+    bytes: int
+    mtime_ns: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+def png_size(path: Path) -> Optional[Tuple[int, int]]:
+    """(ancho, alto) de un PNG leyendo sólo su cabecera; None si no es PNG."""
+    try:
+        with open(path, "rb") as fh:
+            head = fh.read(24)
+    except OSError:
+        return None
+    if len(head) < 24 or head[:8] != _PNG_SIGNATURE or head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+class AssetIndex:
+    """
+    Imágenes de ``root`` agrupadas por tabla y grupo.
+
+    Thread-safe; ``refresh()`` fuerza un recorrido inmediato.
+    """
+
+    def __init__(self, root: str | Path = ASSETS_DIR, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        self._by_table: Dict[str, Dict[str, List[ImageInfo]]] = {}
+        self._by_path: Dict[str, ImageInfo] = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.scans = 0
+        self.headers_read = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Recorre ``root`` y actualiza el índice (reutiliza lo que no cambió)."""
+        by_table: Dict[str, Dict[str, List[ImageInfo]]] = {}
+        by_path: Dict[str, ImageInfo] = {}
+        previous = self._by_path
+        read = 0
+        for label, folder in GROUP_FOLDERS.items():
+            try:
+                tables = [e for e in os.scandir(self.root / folder) if e.is_dir()]
+            except OSError:
+                continue
+            for table_dir in tables:
+                images = []
+                for entry in os.scandir(table_dir.path):
+                    if not entry.name.lower().endswith(IMAGE_SUFFIXES) or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    rel = f"{folder}/{table_dir.name}/{entry.name}"
+                    old = previous.get(rel)
+                    if old is not None and old.mtime_ns == st.st_mtime_ns and old.bytes == st.st_size:
+                        info = old
+                    else:
+                        size = png_size(Path(entry.path))
+                        read += 1
+                        info = ImageInfo(entry.name, rel, st.st_size, st.st_mtime_ns, *(size or (None, None)))
+                    images.append(info)
+                    by_path[rel] = info
+                if images:
+                    images.sort(key=lambda i: i.name)
+                    by_table.setdefault(table_dir.name, {})[label] = images
+
+        with self._lock:
+            self._by_table = by_table
+            self._by_path = by_path
+            self._checked = time.monotonic()
+            self.scans += 1
+            self.headers_read += read
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._checked < self.poll_interval:
+            return
+        # Si otro hilo ya está recorriendo, se responde con el índice actual
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                if time.monotonic() - self._checked >= self.poll_interval:
+                    self.refresh()
+            finally:
+                self._refresh_lock.release()
+
+    def groups(self, table_id: str) -> Dict[str, List[ImageInfo]]:
+        """
+        {etiqueta: [ImageInfo]} de la tabla, con todas las etiquetas de
+        ``GROUP_FOLDERS`` (vacías si no hay imágenes).
+        """
+        self._maybe_refresh()
+        with self._lock:
+            found = self._by_table.get(table_id, {})
+        return {label: list(found.get(label, [])) for label in GROUP_FOLDERS}
+
+    def image(self, path: str) -> Optional[ImageInfo]:
+        """Imagen por su ruta relativa a ``root``."""
+        self._maybe_refresh()
+        with self._lock:
+            return self._by_path.get(path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "tables": len(self._by_table),
+                "images": len(self._by_path),
+                "scans": self.scans,
+                "headers_read": self.headers_read,
+            }
+
+
+_indexes: Dict[Path, AssetIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_asset_index(root: str | Path = ASSETS_DIR) -> AssetIndex:
+    """Devuelve el índice compartido de ``root`` (se arma en la primera llamada)."""
+    root = Path(root).resolve()
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = AssetIndex(root)
+            _indexes[root] = index
+        return index
@@ -0,0 +1,353 @@
+# func_auxiliares/chart_build.py
+"""
+Construcción paralela e incremental de las gráficas de scripts/tesis y
+scripts/visualization.
+
+Descubre los scripts jupytext que llaman a ``savefig`` y ejecuta cada uno en
+su propio proceso, varios a la vez, con el backend ``Agg``. El directorio de
+trabajo es la carpeta del notebook emparejado (``formats:`` de la cabecera
+jupytext o de jupytext.toml), porque las rutas relativas y el ``sys.path.append('../')`` de los
+scripts están escritos para correr desde ahí. Un script se omite si no cambió
+ninguna de sus entradas:
+
+- el código del script,
+- el contenido de las tablas que consulta (``frame_digest``; las tablas salen
+  de :mod:`func_auxiliares.sql_deps`),
+- ``graficos_utils.py`` y ``config.py`` (los de func_auxiliares y las copias
+  locales de los notebooks que alcance su ``sys.path``).
+
+Al terminar escribe ``assets/tesis/build_manifest.json`` con, por script, el
+hash de entradas, el estado, el tiempo y los PNG que guardó.
+
+Uso (desde la raíz del proyecto):
+    python -m func_auxiliares.chart_build                 # todo, incremental
+    python -m func_auxiliares.chart_build pib -j 4        # scripts cuyo path contiene "pib"
+    python -m func_auxiliares.chart_build --force         # ignora el manifiesto
+    python -m func_auxiliares.chart_build --tables pib_ramas   # sólo lo que lee pib_ramas
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from func_auxiliares.config import ASSETS_DIR, DB_PATH, PROJECT_ROOT
+from func_auxiliares.db_pool import get_pool
+from func_auxiliares.snapshot import SNAPSHOT_ENV, ensure_snapshot
+from func_auxiliares.sql_deps import TableResolver, analyze_file
+from func_auxiliares.table_cache import frame_digest
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIRS = (PROJECT_ROOT / "scripts" / "tesis", PROJECT_ROOT / "scripts" / "visualization")
+MANIFEST_PATH = ASSETS_DIR / "build_manifest.json"
+# Módulos compartidos por los scripts: si cambian, se reconstruye lo que los usa
+LIBRARY_NAMES = ("graficos_utils.py", "config.py")
+DEFAULT_TIMEOUT = 600.0
+
+_JUPYTEXT_FORMATS = re.compile(r"^#\s+formats:\s*(\S+)", re.MULTILINE)
+_TOML_FORMATS = re.compile(r"""^formats\s*=\s*["']([^"']+)["']""", re.MULTILINE)
+
+
+@dataclass
+class ScriptResult:
+    """Entrada del manifiesto para un script."""
+    script: str                      # ruta relativa a PROJECT_ROOT
+    inputs: str                      # hash de entradas
+    status: str                      # "ok", "error", "timeout" u "omitido"
+    seconds: float = 0.0
+    outputs: List[str] = field(default_factory=list)   # PNG relativos a PROJECT_ROOT
+    tables: List[str] = field(default_factory=list)
+    error: str = ""
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def discover_scripts(patterns: Sequence[str] = ()) -> List[Path]:
+    """Scripts .py con ``savefig`` en SCRIPT_DIRS (filtrados por subcadena)."""
+    scripts = []
+    for base in SCRIPT_DIRS:
+        for path in sorted(base.rglob("*.py")):
+            if "__pycache__" in path.parts or "savefig" not in path.read_text(encoding="utf-8"):
+                continue
+            rel = path.relative_to(PROJECT_ROOT).as_posix()
+            if patterns and not any(p in rel for p in patterns):
+                continue
+            scripts.append(path)
+    return scripts
+
+
+def _project_formats() -> Optional[str]:
+    """``formats`` de jupytext.toml (emparejamiento por defecto del proyecto)."""
+    try:
+        match = _TOML_FORMATS.search((PROJECT_ROOT / "jupytext.toml").read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    return match.group(1) if match else None
+
+
+def working_dir(script: Path, source: str) -> Path:
+    """
+    Carpeta del notebook emparejado con ``script`` o, si no existe, la del script.
+
+    ``formats: notebooks/tesis/serie_completa///ipynb,scripts/tesis/serie_completa///py:percent``
+    ubica ``scripts/tesis/serie_completa/pib/x.py`` en ``notebooks/tesis/serie_completa/pib``.
+    Si la cabecera no trae ``formats`` se usa el de jupytext.toml.
+    """
+    match = _JUPYTEXT_FORMATS.search(source)
+    formats = match.group(1) if match else _project_formats()
+    if formats:
+        prefixes = {}
+        for fmt in formats.split(","):
+            prefix, _, ext = fmt.rpartition("///")
+            prefixes[ext.split(":")[0]] = prefix
+        py, nb = prefixes.get("py"), prefixes.get("ipynb")
+        rel = script.parent.relative_to(PROJECT_ROOT).as_posix()
+        if py and nb and (rel == py or rel.startswith(py + "/")):
+            candidate = PROJECT_ROOT / (nb + rel[len(py):])
+            if candidate.is_dir():
+                return candidate
+    return script.parent
+
+
+def library_files(cwd: Path) -> List[Path]:
+    """graficos_utils/config de func_auxiliares y de ``cwd`` y su carpeta padre."""
+    dirs = [PROJECT_ROOT / "func_auxiliares", cwd, cwd.parent]
+    return [d / name for d in dirs for name in LIBRARY_NAMES if (d / name).is_file()]
+
+
+class TableHashes:
+    """Hash de contenido de las tablas, calculado una vez por ejecución."""
+
+    def __init__(self, db_path: str | Path = DB_PATH):
+        self.db_path = db_path
+        self._hashes: Dict[str, str] = {}
+
+    def __getitem__(self, table: str) -> str:
+        if table not in self._hashes:
+            with get_pool(self.db_path).connection() as conn:
+                df = pd.read_sql(f'SELECT * FROM "{table}"', conn)
+            self._hashes[table] = frame_digest(df)
+        return self._hashes[table]
+
+
+def inputs_hash(script: Path, tables: Sequence[str], table_hashes: TableHashes, libraries: Sequence[Path]) -> str:
+    """Hash de todo lo que determina las gráficas de ``script``."""
+    h = hashlib.sha256()
+    h.update(_sha256(script).encode())
+    for table in tables:
+        h.update(f"{table}:{table_hashes[table]}".encode())
+    for lib in libraries:
+        h.update(f"{lib.relative_to(PROJECT_ROOT).as_posix()}:{_sha256(lib)}".encode())
+    return h.hexdigest()
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Dict[str, dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))["scripts"]
+    except (FileNotFoundError, KeyError, ValueError):
+        return {}
+
+
+def _is_fresh(entry: Optional[dict], inputs: str) -> bool:
+    """True si la última ejecución terminó bien con las mismas entradas y sus PNG siguen ahí."""
+    if not entry or entry.get("status") not in ("ok", "omitido") or entry.get("inputs") != inputs:
+        return False
+    return all((PROJECT_ROOT / out).exists() for out in entry.get("outputs", []))
+
+
+def run_script(
+    script: Path,
+    cwd: Path,
+    inputs: str,
+    tables: List[str],
+    timeout: float = DEFAULT_TIMEOUT,
+    snapshot: Optional[Path] = None,
+) -> ScriptResult:
+    """
+    Ejecuta ``script`` en un proceso aparte (desde ``cwd``) y registra los archivos que guarda.
+
+    Con ``snapshot`` el ``get_df`` del proceso hijo lee las tablas del
+    snapshot columnar en lugar de SQLite (ver func_auxiliares.snapshot).
+    """
+    rel = script.relative_to(PROJECT_ROOT).as_posix()
+    env = dict(os.environ, MPLBACKEND="Agg")
+    if snapshot is not None:
+        env[SNAPSHOT_ENV] = str(snapshot)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    with tempfile.NamedTemporaryFile("r", suffix=".json", delete=False) as fh:
+        record = Path(fh.name)
+    cmd = [sys.executable, "-m", "func_auxiliares.chart_build", "--run-one", str(script), "--record", str(record)]
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout)
+        status = "ok" if proc.returncode == 0 else "error"
+        error = "" if status == "ok" else (proc.stderr.strip().splitlines() or [""])[-1]
+    except subprocess.TimeoutExpired:
+        status, error = "timeout", f"más de {timeout:.0f} s"
+    seconds = time.perf_counter() - t0
+
+    try:
+        saved = json.loads(record.read_text(encoding="utf-8") or "[]")
+    except ValueError:
+        saved = []
+    finally:
+        record.unlink(missing_ok=True)
+    outputs = sorted({
+        Path(p).resolve().relative_to(PROJECT_ROOT).as_posix()
+        for p in saved
+        if p.lower().endswith(".png") and Path(p).resolve().is_relative_to(PROJECT_ROOT)
+    })
+    return ScriptResult(rel, inputs, status, round(seconds, 3), outputs, tables, error)
+
+
+def build(
+    patterns: Sequence[str] = (),
+    tables: Sequence[str] = (),
+    jobs: Optional[int] = None,
+    force: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+    db_path: str | Path = DB_PATH,
+    snapshot: bool = False,
+) -> List[ScriptResult]:
+    """
+    Ejecuta (en paralelo) los scripts con entradas nuevas y actualiza el manifiesto.
+
+    ``patterns`` filtra por subcadena del path y ``tables`` deja sólo los
+    scripts que leen alguna de esas tablas. Con ``snapshot`` se exporta (si
+    hace falta) el snapshot columnar de la base una vez y todos los procesos
+    lo mapean.
+
+    Returns
+    -------
+    Lista de ScriptResult, una por script descubierto (los omitidos con
+    ``status="omitido"`` y los datos de su última ejecución).
+    """
+    scripts = discover_scripts(patterns)
+    resolver = TableResolver(db_path)
+    try:
+        script_tables = {}
+        for script in scripts:
+            deps = analyze_file(script, resolver)
+            # SQL dinámico: no se sabe qué tablas lee, así que depende de todas
+            script_tables[script] = resolver.known if deps.dynamic else deps.tables
+    finally:
+        resolver.close()
+    if tables:
+        wanted = {t.lower() for t in tables}
+        scripts = [s for s in scripts if any(t.lower() in wanted for t in script_tables[s])]
+    table_hashes = TableHashes(db_path)
+    manifest = load_manifest()
+
+    results: Dict[str, ScriptResult] = {}
+    pending = []
+    for script in scripts:
+        rel = script.relative_to(PROJECT_ROOT).as_posix()
+        cwd = working_dir(script, script.read_text(encoding="utf-8"))
+        deps = script_tables[script]
+        inputs = inputs_hash(script, deps, table_hashes, library_files(cwd))
+        entry = manifest.get(rel)
+        if not force and _is_fresh(entry, inputs):
+            results[rel] = ScriptResult(
+                rel, inputs, "omitido", entry.get("seconds", 0.0), entry.get("outputs", []), deps
+            )
+        else:
+            pending.append((script, cwd, inputs, deps))
+
+    snapshot_dir = ensure_snapshot(db_path) if snapshot and pending else None
+    jobs = jobs or os.cpu_count() or 1
+    logger.info("%d scripts: %d a ejecutar con %d procesos", len(scripts), len(pending), jobs)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_script, *args, timeout, snapshot_dir) for args in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.script] = result
+            logger.info("%-70s %-7s %6.1f s", result.script, result.status, result.seconds)
+
+    ordered = [results[s.relative_to(PROJECT_ROOT).as_posix()] for s in scripts]
+    # Conserva las entradas de scripts que no entraron en este filtro
+    merged = {**manifest, **{r.script: asdict(r) for r in ordered}}
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(
+        json.dumps({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "scripts": merged}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    return ordered
+
+
+def _run_one(script: Path, record: Path) -> None:
+    """
+    Proceso hijo: ejecuta ``script`` como ``__main__`` (desde el directorio
+    actual) anotando cada archivo que guarda ``Figure.savefig``
+    (``plt.savefig`` pasa por ahí).
+    """
+    import runpy
+
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    saved: List[str] = []
+    original = Figure.savefig
+
+    def savefig(self, fname, *args, **kwargs):
+        if isinstance(fname, (str, os.PathLike)):
+            saved.append(os.path.abspath(fname))
+        return original(self, fname, *args, **kwargs)
+
+    Figure.savefig = savefig
+    sys.path.insert(0, str(script.parent))
+    sys.argv = [str(script)]
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    finally:
+        record.write_text(json.dumps(saved), encoding="utf-8")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Construye las gráficas de scripts/tesis y scripts/visualization")
+    parser.add_argument("patterns", nargs="*", help="sólo scripts cuyo path contenga alguna de estas cadenas")
+    parser.add_argument("--tables", nargs="+", default=(), metavar="TABLA",
+                        help="sólo scripts que leen alguna de estas tablas")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="procesos simultáneos (por defecto, nº de CPUs)")
+    parser.add_argument("--force", action="store_true", help="ejecuta todo aunque las entradas no hayan cambiado")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="segundos máximos por script")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="los scripts leen las tablas de un snapshot .npy compartido (get_df)")
+    parser.add_argument("--run-one", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--record", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one:
+        _run_one(args.run_one.resolve(), args.record)
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    t0 = time.perf_counter()
+    results = build(args.patterns, args.tables, args.jobs, args.force, args.timeout, snapshot=args.snapshot)
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    print(f"{len(results)} scripts en {time.perf_counter() - t0:.1f} s: {counts} → {MANIFEST_PATH}")
+    for r in results:
+        if r.status in ("error", "timeout"):
+            print(f"  {r.status}: {r.script}: {r.error}")
+    return 1 if any(r.status in ("error", "timeout") for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,9 @@ DB_PATH = PROJECT_ROOT / "db" / "proyectomacro.db"
 
 #  ── Carpeta base de salida de gráficas
 ASSETS_DIR = PROJECT_ROOT / "assets" / "tesis"
+
+#  ── Carpeta de documentos (página Documentos)
+DOCUMENTS_DIR = PROJECT_ROOT / "reports" / "documents"
 # config.py
 
 #constantes para la primera grafica
@@ -96,4 +99,37 @@ periodos_tasas_periodos = [
     (1952, 1984),
     (1985, 2005),
     (2006, 2022)
-] 
\ No newline at end of file
+] 
+
+
+#------------------------------------
+#esquemas de ciclos y de períodos (cycle_statistics, period_stats)
+#------------------------------------
+CYCLE_SCHEMES = {
+    "ciclos": CYCLES,
+    "sin_crisis": CYCLES_SIN_CRISIS,
+    "periodos": CYCLES_PERIODOS,
+}
+# esquemas de períodos de tasas (crecimiento acumulado vi→vf)
+PERIOD_SCHEMES = {
+    "tasas": periodos_tasas,
+    "tasas_sin_crisis": periodos_tasas_sin_crisis,
+    "tasas_periodos": periodos_tasas_periodos,
+}
+
+
+# ventanas de las gráficas por período (render_windows); los nombres son las
+# carpetas que espera functions.create_period_tabs_for_mineral_generic
+VENTANAS_PERIODOS = {
+    "serie_completa": None,
+    "periodo_1952-1982": (1952, 1982),
+    "periodo_1982-2006": (1982, 2006),
+    "periodo_2006-2025": (2006, 2025),
+}
+
+
+#------------------------------------
+#tablas derivadas (generadas dentro de proyectomacro.db, no son datos fuente)
+#------------------------------------
+PERIOD_STATS_TABLE = "estadisticas_periodos"
+DERIVED_TABLES = frozenset({PERIOD_STATS_TABLE})
@@ -0,0 +1,212 @@
+# func_auxiliares/coverage_index.py
+"""
+Índice de cobertura anual por tabla y columna.
+
+Para cada columna numérica guarda el primer y el último año con dato válido
+(no NaN y distinto de 0), los años sin dato válido entre ambos (huecos) y el
+número de valores válidos. Con eso los helpers de gráficos, el panel de
+metadatos y la calculadora responden sin volver a recorrer el DataFrame.
+
+Hay dos puntos de entrada:
+
+- :func:`frame_coverage` para un DataFrame cualquiera (memoizado por el hash
+  de su contenido), que es lo que usan ``adjust_periods`` y compañía.
+- :func:`get_coverage_index` para las tablas de la base. Cada tabla se indexa
+  la primera vez que se consulta; cuando cambia la versión de los datos sólo
+  se recalculan las tablas cuyo contenido (``frame_digest``) cambió.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from func_auxiliares.config import DB_PATH
+from func_auxiliares.result_cache import ResultCache, data_version
+from func_auxiliares.schema_catalog import get_schema_catalog
+from func_auxiliares.table_cache import Signature, frame_digest, resolve_db_file
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ColumnCoverage:
+    """Cobertura de una columna (años enteros)."""
+    first_year: Optional[int]
+    last_year: Optional[int]
+    gaps: Tuple[int, ...]       # años sin dato válido entre first_year y last_year
+    nonzero_count: int          # valores válidos (no NaN, ≠ 0)
+
+    def valid_count(self, lo: int, hi: int) -> int:
+        """Número de años válidos en ``[lo, hi]``."""
+        if self.first_year is None:
+            return 0
+        a, b = max(lo, self.first_year), min(hi, self.last_year)
+        if a > b:
+            return 0
+        return (b - a + 1) - sum(1 for g in self.gaps if a <= g <= b)
+
+
+@dataclass(frozen=True)
+class TableCoverage:
+    """Cobertura de todas las columnas numéricas de una tabla."""
+    digest: str
+    index_first: int            # primer año del índice (haya o no datos)
+    index_last: int             # último año del índice
+    columns: Dict[str, ColumnCoverage]
+
+    @property
+    def first_year(self) -> Optional[int]:
+        """Primer año en que alguna columna tiene dato válido."""
+        firsts = [c.first_year for c in self.columns.values() if c.first_year is not None]
+        return min(firsts) if firsts else None
+
+    @property
+    def last_year(self) -> Optional[int]:
+        """Último año en que alguna columna tiene dato válido."""
+        lasts = [c.last_year for c in self.columns.values() if c.last_year is not None]
+        return max(lasts) if lasts else None
+
+    def valid_count(self, lo: int, hi: int, cols: Iterable[str]) -> int:
+        """Total de celdas válidas de ``cols`` en ``[lo, hi]``."""
+        return sum(self.columns[c].valid_count(lo, hi) for c in cols)
+
+    def last_year_all_valid(self, cols: Sequence[str]) -> Optional[int]:
+        """Último año en que TODAS las ``cols`` tienen dato válido."""
+        if not cols:
+            return self.index_last
+        covs = [self.columns[c] for c in cols]
+        if any(c.first_year is None for c in covs):
+            return None
+        lo = max(c.first_year for c in covs)
+        year = min(c.last_year for c in covs)
+        gaps = set().union(*(c.gaps for c in covs))
+        while year >= lo and year in gaps:
+            year -= 1
+        return year if year >= lo else None
+
+
+def compute_coverage(df: pd.DataFrame, digest: Optional[str] = None) -> Optional[TableCoverage]:
+    """
+    Calcula la cobertura de ``df`` (índice = años) en una sola pasada vectorizada.
+
+    Devuelve None si el índice no son años enteros únicos; en ese caso los
+    llamadores deben recurrir al cálculo directo sobre el DataFrame.
+    """
+    if df.empty or not df.index.is_unique:
+        return None
+    try:
+        years = df.index.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        return None
+    if np.isnan(years).any() or not np.array_equal(years, np.round(years)):
+        return None
+    years = years.astype(np.int64)
+
+    numeric = df.select_dtypes(include="number")
+    values = numeric.to_numpy(dtype=float)
+    valid = ~np.isnan(values) & (values != 0)
+
+    columns: Dict[str, ColumnCoverage] = {}
+    for j, col in enumerate(numeric.columns):
+        valid_years = np.sort(years[valid[:, j]])
+        if valid_years.size == 0:
+            columns[col] = ColumnCoverage(None, None, (), 0)
+            continue
+        first, last = int(valid_years[0]), int(valid_years[-1])
+        gaps = np.setdiff1d(np.arange(first, last + 1), valid_years, assume_unique=True)
+        columns[col] = ColumnCoverage(first, last, tuple(int(g) for g in gaps), int(valid_years.size))
+
+    return TableCoverage(
+        digest=digest or frame_digest(df),
+        index_first=int(years.min()),
+        index_last=int(years.max()),
+        columns=columns,
+    )
+
+
+_frame_cache = ResultCache(max_entries=256)
+
+
+def frame_coverage(df: pd.DataFrame) -> Optional[TableCoverage]:
+    """Cobertura de ``df`` memoizada por el hash de su contenido."""
+    if df.empty:
+        return None
+    digest = frame_digest(df)
+    return _frame_cache.get_or_compute(digest, lambda: compute_coverage(df, digest))
+
+
+class CoverageIndex:
+    """
+    Cobertura de las tablas de una base, calculada bajo demanda.
+
+    Cada entrada recuerda la versión de los datos y el hash del contenido con
+    que se calculó: si la base cambia, la tabla se relee (vía la caché de
+    ``get_df``) y sólo se recalcula si su contenido es distinto.
+    """
+
+    def __init__(self, db_path: str | Path = DB_PATH):
+        self.db_file = resolve_db_file(db_path)
+        self._entries: Dict[str, Tuple[Optional[Signature], Optional[TableCoverage]]] = {}
+        self._lock = threading.Lock()
+        self.rebuilt = 0
+        self.reused = 0
+
+    def table(self, name: str) -> Optional[TableCoverage]:
+        """Cobertura de la tabla ``name`` o None si no existe o no es anual."""
+        info = get_schema_catalog(self.db_file).table(name)
+        if info is None or not info.has_year:
+            return None
+
+        version = data_version(self.db_file)
+        with self._lock:
+            entry = self._entries.get(info.name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        # Import diferido: graficos_utils importa este módulo
+        from func_auxiliares.graficos_utils import get_df
+
+        df = get_df(f'SELECT * FROM "{info.name}"', conn_str=str(self.db_file))
+        digest = frame_digest(df)
+        with self._lock:
+            if entry is not None and entry[1] is not None and entry[1].digest == digest:
+                coverage = entry[1]
+                self.reused += 1
+            else:
+                coverage = compute_coverage(df, digest)
+                self.rebuilt += 1
+            self._entries[info.name] = (version, coverage)
+        return coverage
+
+    def column(self, table: str, column: str) -> Optional[ColumnCoverage]:
+        """Cobertura de una columna o None si no existe."""
+        coverage = self.table(table)
+        return coverage.columns.get(column) if coverage else None
+
+    def refresh_all(self) -> None:
+        """Indexa (o revalida) todas las tablas anuales de la base."""
+        for name in get_schema_catalog(self.db_file).table_names():
+            self.table(name)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"tables": len(self._entries), "rebuilt": self.rebuilt, "reused": self.reused}
+
+
+_indexes: Dict[Path, CoverageIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_coverage_index(db_path: str | Path = DB_PATH) -> CoverageIndex:
+    """Devuelve el índice de cobertura compartido de ``db_path``."""
+    db_file = resolve_db_file(db_path)
+    with _indexes_lock:
+        index = _indexes.get(db_file)
+        if index is None:
+            index = CoverageIndex(db_file)
+            _indexes[db_file] = index
+        return index
@@ -0,0 +1,207 @@
+# func_auxiliares/db_pool.py
+"""
+Pool de conexiones SQLite de sólo lectura compartido por el dashboard.
+
+Las conexiones se abren como ``file:...?mode=ro&immutable=1`` con ``mmap_size``
+y ``cache_size`` ampliados, y se reutilizan entre llamadas e hilos. Como el
+modo ``immutable`` desactiva la detección de cambios de SQLite, el pool vigila
+la firma del archivo (ver :func:`func_auxiliares.table_cache.db_signature`) y
+descarta todas sus conexiones cuando la base cambia en disco.
+
+Uso:
+    from func_auxiliares.db_pool import get_pool
+    with get_pool(DB_PATH).connection() as conn:
+        df = pd.read_sql("SELECT * FROM pib_ramas", conn)
+"""
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from func_auxiliares.table_cache import db_signature, resolve_db_file
+
+logger = logging.getLogger(__name__)
+
+#  ── Parámetros por defecto (se pueden sobreescribir con variables de entorno)
+DEFAULT_POOL_SIZE = int(os.environ.get("PROYECTOMACRO_DB_POOL_SIZE", "8"))
+DEFAULT_MMAP_SIZE = int(os.environ.get("PROYECTOMACRO_DB_MMAP_MB", "256")) * 1024 * 1024
+DEFAULT_CACHE_KIB = int(os.environ.get("PROYECTOMACRO_DB_CACHE_KIB", "16384"))
+
+
+class ConnectionPool:
+    """
+    Pool acotado de conexiones de sólo lectura a una base SQLite.
+
+    Parameters
+    ----------
+    db_path : str | Path
+        Ruta (o URI ``file:``) de la base.
+    max_size : int
+        Número máximo de conexiones abiertas a la vez.
+    mmap_size : int
+        Valor de ``PRAGMA mmap_size`` en bytes.
+    cache_size_kib : int
+        Tamaño de la caché de páginas de cada conexión en KiB.
+    timeout : float, optional
+        Segundos a esperar por una conexión libre antes de lanzar ``TimeoutError``.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        max_size: int = DEFAULT_POOL_SIZE,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        cache_size_kib: int = DEFAULT_CACHE_KIB,
+        timeout: Optional[float] = 30.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size debe ser >= 1")
+        self.db_file = resolve_db_file(db_path)
+        self.max_size = max_size
+        self.mmap_size = mmap_size
+        self.cache_size_kib = cache_size_kib
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._idle: List[sqlite3.Connection] = []
+        self._generation: Dict[int, int] = {}   # id(conn) -> generación
+        self._current_gen = 0
+        self._signature = db_signature(self.db_file)
+        self._open = 0
+
+        # Métricas
+        self.created = 0
+        self.reused = 0
+        self.waits = 0
+        self.discarded = 0
+
+    # -----------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"{self.db_file.as_uri()}?mode=ro&immutable=1"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size={-int(self.cache_size_kib)}")
+        conn.execute("PRAGMA query_only=1")
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        self._generation.pop(id(conn), None)
+        self._open -= 1
+        self.discarded += 1
+        try:
+            conn.close()
+        except sqlite3.Error:  # pragma: no cover - cierre defensivo
+            pass
+
+    def _check_signature(self) -> None:
+        """Si la base cambió, descarta las conexiones ociosas (llamar con el lock)."""
+        signature = db_signature(self.db_file)
+        if signature == self._signature:
+            return
+        logger.info("Base %s modificada; renovando conexiones del pool", self.db_file)
+        self._signature = signature
+        self._current_gen += 1
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    # -----------------------------------------------------------------
+    def acquire(self) -> sqlite3.Connection:
+        """Toma una conexión del pool (o abre una nueva si hay cupo)."""
+        with self._cond:
+            self._check_signature()
+            waited = False
+            while not self._idle and self._open >= self.max_size:
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                if not self._cond.wait(timeout=self.timeout):
+                    raise TimeoutError(
+                        f"No hay conexiones libres para {self.db_file} tras {self.timeout}s"
+                    )
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            self._open += 1
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.created += 1
+            self._generation[id(conn)] = self._current_gen
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Devuelve ``conn`` al pool (se cierra si pertenece a una base vieja)."""
+        with self._cond:
+            if self._generation.get(id(conn)) != self._current_gen:
+                self._discard(conn)
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager que toma y devuelve una conexión del pool."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self) -> None:
+        """Cierra las conexiones ociosas; las que están en uso se cierran al devolverse."""
+        with self._cond:
+            self._current_gen += 1
+            while self._idle:
+                self._discard(self._idle.pop())
+
+    def stats(self) -> Dict[str, int]:
+        """Métricas de reutilización del pool."""
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+                "created": self.created,
+                "reused": self.reused,
+                "waits": self.waits,
+                "discarded": self.discarded,
+            }
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Registro global de pools (uno por archivo de base de datos)
+# ──────────────────────────────────────────────────────────────────────
+_pools: Dict[Path, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str | Path, max_size: Optional[int] = None) -> ConnectionPool:
+    """
+    Devuelve el pool compartido de ``db_path`` y lo crea si no existe.
+
+    ``max_size`` sólo se aplica al crear el pool.
+    """
+    db_file = resolve_db_file(db_path)
+    with _pools_lock:
+        pool = _pools.get(db_file)
+        if pool is None:
+            pool = ConnectionPool(db_file, max_size=max_size or DEFAULT_POOL_SIZE)
+            _pools[db_file] = pool
+        return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Métricas de todos los pools abiertos, indexadas por ruta de la base."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {str(p.db_file): p.stats() for p in pools}
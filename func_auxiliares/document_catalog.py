@@ -0,0 +1,249 @@
+# func_auxiliares/document_catalog.py
+"""
+Catálogo en memoria de los documentos de reports/documents.
+
+La página Documentos filtraba y ordenaba recorriendo el directorio con
+``os.walk`` (y un ``getsize``/``getmtime`` por archivo) en cada tecla del
+buscador. El catálogo guarda una entrada por archivo (tokens del nombre,
+categoría, extensión, tamaño y fecha) y, por encima, un índice invertido
+token → documentos, los documentos por categoría y los órdenes
+precalculados (nombre, fecha, tamaño, tipo). Una consulta es una
+intersección de conjuntos y un recorrido del orden pedido.
+
+El refresco es incremental y por sondeo, como el de
+:mod:`func_auxiliares.asset_index`: cada ``poll_interval`` segundos se hace
+un ``stat`` por directorio y sólo se vuelven a listar los directorios cuyo
+mtime cambió (agregar, borrar o renombrar un archivo cambia el mtime de su
+directorio).
+"""
+import os
+import re
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from func_auxiliares.config import DOCUMENTS_DIR
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+CATEGORIES = {
+    'Documentos': ('.pdf', '.docx', '.doc', '.txt', '.md', '.tex'),
+    'Hojas de Cálculo': ('.xlsx', '.xls', '.csv'),
+    'Imágenes': ('.png', '.jpg', '.jpeg', '.gif'),
+    'Archivos Comprimidos': ('.zip', '.rar'),
+}
+OTHER_CATEGORY = 'Otros'
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin tildes (``"Deflactor Año"`` → ``"deflactor ano"``)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokens alfanuméricos normalizados de ``text``."""
+    return _TOKEN.findall(normalize(text))
+
+
+def file_category(extension: str) -> str:
+    """Categoría de un archivo según su extensión."""
+    ext = extension.lower()
+    for category, extensions in CATEGORIES.items():
+        if ext in extensions:
+            return category
+    return OTHER_CATEGORY
+
+
+@dataclass(frozen=True)
+class Document:
+    """Un archivo del catálogo."""
+    name: str
+    path: str                   # relativa a la raíz del catálogo, con "/"
+    extension: str
+    category: str
+    size: int
+    mtime: float
+    tokens: FrozenSet[str]
+
+
+class DocumentCatalog:
+    """
+    Documentos bajo ``root`` con índices para buscar, filtrar y ordenar.
+
+    Thread-safe; ``refresh()`` fuerza un refresco inmediato.
+    """
+
+    def __init__(self, root: str | Path = DOCUMENTS_DIR, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        # directorio relativo → (mtime_ns, documentos, subdirectorios)
+        self._dirs: Dict[str, Tuple[int, List[Document], List[str]]] = {}
+        self._docs: List[Document] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocabulary: List[str] = []
+        self._term_cache: Dict[str, Set[int]] = {}
+        self._by_category: Dict[str, Set[int]] = {}
+        self._orders: Dict[str, List[int]] = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.rescanned_dirs = 0
+        self.refresh()
+
+    # ── construcción ────────────────────────────────────────────────
+    def _scan_dir(self, rel: str, path: Path) -> Tuple[List[Document], List[str]]:
+        docs, subdirs = [], []
+        for entry in os.scandir(path):
+            if entry.is_dir():
+                subdirs.append(f"{rel}/{entry.name}" if rel else entry.name)
+            elif entry.is_file():
+                st = entry.stat()
+                ext = os.path.splitext(entry.name)[1]
+                docs.append(Document(
+                    name=entry.name,
+                    path=f"{rel}/{entry.name}" if rel else entry.name,
+                    extension=ext,
+                    category=file_category(ext),
+                    size=st.st_size,
+                    mtime=st.st_mtime,
+                    tokens=frozenset(tokenize(entry.name)),
+                ))
+        return docs, sorted(subdirs)
+
+    def refresh(self) -> None:
+        """Relista los directorios cuyo mtime cambió y reconstruye los índices."""
+        dirs: Dict[str, Tuple[int, List[Document], List[str]]] = {}
+        changed = 0
+        pending = [""] if self.root.is_dir() else []
+        while pending:
+            rel = pending.pop()
+            path = self.root / rel if rel else self.root
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                continue
+            cached = self._dirs.get(rel)
+            if cached is not None and cached[0] == mtime:
+                dirs[rel] = cached
+            else:
+                try:
+                    docs, subdirs = self._scan_dir(rel, path)
+                except OSError:
+                    continue
+                dirs[rel] = (mtime, docs, subdirs)
+                changed += 1
+            pending.extend(dirs[rel][2])
+
+        unchanged = changed == 0 and dirs.keys() == self._dirs.keys()
+        with self._lock:
+            self._checked = time.monotonic()
+            if unchanged:
+                return
+            self._dirs = dirs
+            self.rescanned_dirs += changed
+            self._build_indexes([doc for _, docs, _ in dirs.values() for doc in docs])
+
+    def _build_indexes(self, docs: List[Document]) -> None:
+        docs.sort(key=lambda d: (d.name, d.path))
+        postings: Dict[str, Set[int]] = {}
+        by_category: Dict[str, Set[int]] = {}
+        for i, doc in enumerate(docs):
+            for token in doc.tokens:
+                postings.setdefault(token, set()).add(i)
+            by_category.setdefault(doc.category, set()).add(i)
+        ids = range(len(docs))
+        self._docs = docs
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+        self._term_cache = {}
+        self._by_category = by_category
+        self._orders = {
+            "name": sorted(ids, key=lambda i: docs[i].name.lower()),
+            "modified": sorted(ids, key=lambda i: docs[i].mtime, reverse=True),
+            "size": sorted(ids, key=lambda i: docs[i].size, reverse=True),
+            "extension": sorted(ids, key=lambda i: docs[i].extension),
+        }
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._checked < self.poll_interval:
+            return
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                if time.monotonic() - self._checked >= self.poll_interval:
+                    self.refresh()
+            finally:
+                self._refresh_lock.release()
+
+    # ── consultas ───────────────────────────────────────────────────
+    def _matching(self, term: str) -> Set[int]:
+        """Documentos con algún token que contiene ``term`` (no modificar el resultado)."""
+        found = self._term_cache.get(term)
+        if found is None:
+            found = set().union(*(self._postings[t] for t in self._vocabulary if term in t))
+            self._term_cache[term] = found
+        return found
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        category: Optional[str] = None,
+        sort_by: str = "name",
+    ) -> List[Document]:
+        """
+        Documentos que cumplen los filtros, en el orden ``sort_by``.
+
+        Cada palabra de ``query`` (sin distinguir mayúsculas ni tildes) tiene
+        que aparecer en algún token del nombre del archivo. ``category`` None
+        o ``"all"`` no filtra.
+        """
+        self._maybe_refresh()
+        with self._lock:
+            selected: Optional[Set[int]] = None
+            if category and category != "all":
+                selected = set(self._by_category.get(category, ()))
+            for term in tokenize(query or ""):
+                ids = self._matching(term)
+                selected = ids if selected is None else selected & ids
+                if not selected:
+                    return []
+            order = self._orders.get(sort_by, self._orders["name"])
+            if selected is None:
+                return [self._docs[i] for i in order]
+            return [self._docs[i] for i in order if i in selected]
+
+    def categories(self) -> Dict[str, int]:
+        """{categoría: nº de documentos}."""
+        self._maybe_refresh()
+        with self._lock:
+            return {cat: len(ids) for cat, ids in sorted(self._by_category.items())}
+
+    def total_size(self) -> int:
+        self._maybe_refresh()
+        with self._lock:
+            return sum(doc.size for doc in self._docs)
+
+    def __len__(self) -> int:
+        self._maybe_refresh()
+        with self._lock:
+            return len(self._docs)
+
+
+_catalogs: Dict[Path, DocumentCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_document_catalog(root: str | Path = DOCUMENTS_DIR) -> DocumentCatalog:
+    """Devuelve el catálogo compartido de ``root`` (se arma en la primera llamada)."""
+    root = Path(root).resolve()
+    with _catalogs_lock:
+        catalog = _catalogs.get(root)
+        if catalog is None:
+            catalog = DocumentCatalog(root)
+            _catalogs[root] = catalog
+        return catalog
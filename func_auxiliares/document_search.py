@@ -0,0 +1,351 @@
+# func_auxiliares/document_search.py
+"""
+Índice de texto completo (SQLite FTS5) de los documentos del proyecto.
+
+Indexa el texto de los PDF (con pypdf, dependencia opcional), de las
+fuentes LaTeX (.tex, sin comandos ni comentarios), de los .md/.txt y los
+nombres de hoja de los .xlsx (leídos de ``xl/workbook.xml`` con zipfile),
+de las carpetas de ``SEARCH_SOURCES``. El índice vive en su propia base,
+``SEARCH_DB``, fuera de proyectomacro.db.
+
+La actualización es incremental: un archivo con el mismo tamaño y mtime no
+se abre; si cambió, se compara el SHA-256 con el guardado y sólo se vuelve
+a extraer el texto si el contenido es otro. Los archivos que desaparecen se
+borran del índice. Los PDF indexados sin pypdf se vuelven a extraer cuando
+pypdf está disponible.
+
+Las búsquedas devuelven los documentos ordenados por bm25 (el nombre pesa
+más que el cuerpo) con un fragmento del texto alrededor de las coincidencias.
+
+Uso (desde la raíz del proyecto):
+    python -m func_auxiliares.document_search                 # actualiza el índice
+    python -m func_auxiliares.document_search deflactor       # busca
+"""
+import argparse
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from xml.etree import ElementTree
+
+from func_auxiliares.config import DOCUMENTS_DIR, PROJECT_ROOT
+from func_auxiliares.document_catalog import tokenize
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf es opcional: sin él los PDF se indexan sólo por nombre
+    PdfReader = None
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DB = PROJECT_ROOT / "db" / "documentos_fts.db"
+TEXT_SUFFIXES = (".pdf", ".tex", ".md", ".txt", ".xlsx")
+# (carpeta, recursivo)
+SEARCH_SOURCES: Tuple[Tuple[Path, bool], ...] = (
+    (DOCUMENTS_DIR, True),
+    (PROJECT_ROOT, False),
+    (PROJECT_ROOT / "db", True),
+)
+DEFAULT_REFRESH_INTERVAL = 60.0
+MAX_BODY_CHARS = 2_000_000
+
+# Delimitadores de las coincidencias en los fragmentos
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id        INTEGER PRIMARY KEY,
+    path      TEXT NOT NULL UNIQUE,
+    kind      TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    hash      TEXT NOT NULL,
+    has_text  INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+    title, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_TEX_COMMENT = re.compile(r"(?<!\\)%.*")
+_TEX_COMMAND = re.compile(r"\\[A-Za-z@]+\*?")
+_TEX_SYMBOLS = re.compile(r"[{}\[\]$&~^_\\]")
+_XLSX_NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Extracción de texto
+# ──────────────────────────────────────────────────────────────────────
+def tex_text(source: str) -> str:
+    """Texto de una fuente LaTeX sin comentarios, comandos ni llaves."""
+    text = _TEX_COMMENT.sub(" ", source)
+    text = _TEX_COMMAND.sub(" ", text)
+    return _TEX_SYMBOLS.sub(" ", text)
+
+
+def xlsx_sheet_names(path: Path) -> List[str]:
+    """Nombres de las hojas de un .xlsx (sin abrir las hojas)."""
+    with zipfile.ZipFile(path) as zf:
+        root = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    return [sheet.get("name", "") for sheet in root.iterfind("m:sheets/m:sheet", _XLSX_NS)]
+
+
+def pdf_text(path: Path) -> Optional[str]:
+    """Texto de un PDF, o None si pypdf no está instalado."""
+    if PdfReader is None:
+        return None
+    reader = PdfReader(str(path))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def extract_text(path: Path) -> Optional[str]:
+    """Texto indexable de ``path``; None si no se puede extraer (PDF sin pypdf)."""
+    suffix = path.suffix.lower()
+    if suffix == ".pdf":
+        return pdf_text(path)
+    if suffix == ".xlsx":
+        return "\n".join(xlsx_sheet_names(path))
+    text = path.read_text(encoding="utf-8", errors="replace")
+    return tex_text(text) if suffix == ".tex" else text
+
+
+def discover_documents(sources: Sequence[Tuple[Path, bool]] = SEARCH_SOURCES) -> List[Path]:
+    """Archivos indexables de ``sources`` (sin repetidos)."""
+    found: Dict[Path, None] = {}
+    for base, recursive in sources:
+        if not base.is_dir():
+            continue
+        for path in (base.rglob("*") if recursive else base.iterdir()):
+            if path.suffix.lower() in TEXT_SUFFIXES and path.is_file():
+                found.setdefault(path.resolve(), None)
+    return sorted(found)
+
+
+def _relative(path: Path) -> str:
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Índice
+# ──────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class SearchHit:
+    """Un documento encontrado."""
+    path: str                   # relativa a PROJECT_ROOT
+    kind: str                   # extensión sin punto
+    snippet: str                # con MATCH_START/MATCH_END alrededor de cada coincidencia
+    rank: float                 # bm25 (menor es mejor)
+
+
+def match_query(text: str) -> Optional[str]:
+    """
+    Consulta FTS5 a partir de lo que se escribió en el buscador.
+
+    Cada palabra se busca como prefijo (``"deflac"*``) y todas tienen que
+    aparecer; se citan para que la sintaxis de FTS5 no se interprete.
+    """
+    terms = tokenize(text or "")
+    return " ".join(f'"{t}"*' for t in terms) or None
+
+
+def update_index(db_path: str | Path = SEARCH_DB, sources: Sequence[Tuple[Path, bool]] = SEARCH_SOURCES) -> Dict[str, int]:
+    """
+    Actualiza el índice con los cambios desde la última vez.
+
+    Returns
+    -------
+    {"files": n, "indexed": n, "unchanged": n, "removed": n, "without_text": n}
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    counts = {"files": 0, "indexed": 0, "unchanged": 0, "removed": 0, "without_text": 0}
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.executescript(_SCHEMA)
+        known = {
+            row[0]: row[1:]
+            for row in conn.execute("SELECT path, id, size, mtime_ns, hash, has_text FROM files")
+        }
+        seen = set()
+        for path in discover_documents(sources):
+            rel = _relative(path)
+            seen.add(rel)
+            counts["files"] += 1
+            st = path.stat()
+            kind = path.suffix.lower().lstrip(".")
+            old = known.get(rel)
+            # PDF indexado sin texto: se reintenta si ahora hay extractor
+            retry = old is not None and not old[4] and kind == "pdf" and PdfReader is not None
+            if old is not None and not retry and old[1] == st.st_size and old[2] == st.st_mtime_ns:
+                counts["unchanged"] += 1
+                continue
+            digest = _sha256(path)
+            if old is not None and not retry and old[3] == digest:
+                conn.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?", (st.st_size, st.st_mtime_ns, old[0]))
+                counts["unchanged"] += 1
+                continue
+
+            try:
+                body = extract_text(path)
+            except Exception as exc:  # un archivo dañado no frena el resto
+                logger.warning("No se pudo extraer el texto de %s: %s", rel, exc)
+                body = None
+            if body is None:
+                counts["without_text"] += 1
+            title = f"{path.stem} {rel}"
+            with conn:
+                if old is not None:
+                    conn.execute("DELETE FROM docs WHERE rowid = ?", (old[0],))
+                    conn.execute("DELETE FROM files WHERE id = ?", (old[0],))
+                cur = conn.execute(
+                    "INSERT INTO files (path, kind, size, mtime_ns, hash, has_text) VALUES (?, ?, ?, ?, ?, ?)",
+                    (rel, kind, st.st_size, st.st_mtime_ns, digest, int(body is not None)),
+                )
+                conn.execute(
+                    "INSERT INTO docs (rowid, title, body) VALUES (?, ?, ?)",
+                    (cur.lastrowid, title, (body or "")[:MAX_BODY_CHARS]),
+                )
+            counts["indexed"] += 1
+
+        with conn:
+            for rel, (file_id, *_) in known.items():
+                if rel not in seen:
+                    conn.execute("DELETE FROM docs WHERE rowid = ?", (file_id,))
+                    conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                    counts["removed"] += 1
+    finally:
+        conn.close()
+    return counts
+
+
+def search(query: str, limit: int = 20, db_path: str | Path = SEARCH_DB) -> List[SearchHit]:
+    """Documentos que contienen todas las palabras de ``query``, los más relevantes primero."""
+    match = match_query(query)
+    db_path = Path(db_path)
+    if match is None or not db_path.exists():
+        return []
+    conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT f.path, f.kind,
+                   snippet(docs, 1, '{MATCH_START}', '{MATCH_END}', ' … ', 16),
+                   bm25(docs, 5.0, 1.0) AS rank
+            FROM docs JOIN files f ON f.id = docs.rowid
+            WHERE docs MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (match, limit),
+        ).fetchall()
+    except sqlite3.OperationalError as exc:
+        logger.warning("Búsqueda de texto completo fallida (%r): %s", query, exc)
+        return []
+    finally:
+        conn.close()
+    return [SearchHit(*row) for row in rows]
+
+
+class DocumentSearch:
+    """
+    Búsquedas para el dashboard con el índice al día.
+
+    La primera consulta construye el índice si no existe; después se
+    actualiza en un hilo de fondo cada ``refresh_interval`` segundos, sin
+    demorar las consultas.
+    """
+
+    def __init__(self, db_path: str | Path = SEARCH_DB, refresh_interval: float = DEFAULT_REFRESH_INTERVAL):
+        self.db_path = Path(db_path)
+        self.refresh_interval = refresh_interval
+        self._updated = 0.0
+        self._updating = threading.Lock()
+
+    def _update(self) -> None:
+        try:
+            counts = update_index(self.db_path)
+            logger.info("Índice de documentos: %s", counts)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("No se pudo actualizar el índice de documentos: %s", exc)
+        finally:
+            self._updated = time.monotonic()
+            self._updating.release()
+
+    def _maybe_update(self) -> None:
+        if time.monotonic() - self._updated < self.refresh_interval:
+            return
+        if not self._updating.acquire(blocking=False):
+            return
+        if self.db_path.exists():
+            threading.Thread(target=self._update, name="document-search-update", daemon=True).start()
+        else:
+            self._update()
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        self._maybe_update()
+        return search(query, limit, self.db_path)
+
+
+_searches: Dict[Path, DocumentSearch] = {}
+_searches_lock = threading.Lock()
+
+
+def get_document_search(db_path: str | Path = SEARCH_DB) -> DocumentSearch:
+    """Devuelve el buscador compartido de ``db_path``."""
+    db_path = Path(db_path).resolve()
+    with _searches_lock:
+        searcher = _searches.get(db_path)
+        if searcher is None:
+            searcher = DocumentSearch(db_path)
+            _searches[db_path] = searcher
+        return searcher
+
+
+def highlight_segments(snippet: str) -> Iterator[Tuple[str, bool]]:
+    """Parte un fragmento en ``(texto, es_coincidencia)``."""
+    for i, part in enumerate(re.split(f"[{MATCH_START}{MATCH_END}]", snippet)):
+        if part:
+            yield part, i % 2 == 1
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Índice de texto completo de los documentos (FTS5)")
+    parser.add_argument("consulta", nargs="*", help="palabras a buscar (sin consulta, sólo actualiza)")
+    parser.add_argument("--db", default=str(SEARCH_DB), help="base del índice")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="resultados a mostrar")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    counts = update_index(args.db)
+    print(f"{counts} en {time.perf_counter() - t0:.2f} s → {args.db}")
+    if PdfReader is None:
+        print("pypdf no está instalado: los PDF se indexan sólo por nombre")
+    if args.consulta:
+        t0 = time.perf_counter()
+        hits = search(" ".join(args.consulta), args.limit, args.db)
+        print(f"{len(hits)} resultados en {(time.perf_counter() - t0) * 1000:.1f} ms")
+        for hit in hits:
+            snippet = hit.snippet.replace(MATCH_START, "[").replace(MATCH_END, "]").replace("\n", " ")
+            print(f"  {hit.rank:7.2f}  {hit.path}\n           {snippet}")
+
+
+if __name__ == "__main__":
+    main()
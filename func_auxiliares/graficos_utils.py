@@ -6,6 +6,12 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Sequence, Mapping, Set
 import logging
 import numpy as np
+from func_auxiliares.config import CYCLE_SCHEMES, DB_PATH
+from func_auxiliares.coverage_index import frame_coverage
+from func_auxiliares.db_pool import get_pool
+from func_auxiliares.result_cache import ResultCache, data_version
+from func_auxiliares.snapshot import active_snapshot
+from func_auxiliares.table_cache import get_table_cache
 logger = logging.getLogger(__name__)
 # graficos_utils.py
 from typing import List, Tuple, Dict
@@ -206,8 +212,17 @@ def adjust_periods(
     years = df.index.astype(int)
     min_year, max_year = years.min(), years.max()
 
+    # Índice de cobertura (memoizado por contenido): evita re-slicear df en
+    # cada período. Si no aplica (índice no anual o columnas no numéricas)
+    # se cuenta directamente sobre df.
+    coverage = frame_coverage(df)
+    if coverage is not None and not all(c in coverage.columns for c in required_cols):
+        coverage = None
+
     # -- helper: cuántos valores válidos hay por periodo
     def valid_count(lo, hi):
+        if coverage is not None:
+            return coverage.valid_count(int(lo), int(hi), required_cols)
         sub = df.loc[lo:hi, required_cols]
         return ((sub.notna()) & (sub != 0)).sum().sum()
 
@@ -237,9 +252,12 @@ def adjust_periods(
     # ---------------------------
     if adjusted:
         # último año donde TODAS las columnas tienen dato válido
-        mask_valid = (df[required_cols].notna() & (df[required_cols] != 0)).all(axis=1)
-        if mask_valid.any():
-            last_valid_year = int(df.index[mask_valid].max())
+        if coverage is not None:
+            last_valid_year = coverage.last_year_all_valid(required_cols)
+        else:
+            mask_valid = (df[required_cols].notna() & (df[required_cols] != 0)).all(axis=1)
+            last_valid_year = int(df.index[mask_valid].max()) if mask_valid.any() else None
+        if last_valid_year is not None:
             # sustituir el 'stop' de la última tupla si podemos crecer
             lo_last, hi_last = adjusted[-1]
             if last_valid_year > hi_last:
@@ -268,6 +286,154 @@ def adjust_annot_years(df: pd.DataFrame, years: List[int]) -> List[int]:
     return [min_year] + mid_years + [max_year]
 
 
+CYCLE_STATS = ("mean", "cagr", "min", "max", "std")
+
+
+def cycle_statistics(
+    df: pd.DataFrame,
+    cycles: Mapping[str, slice],
+    cols: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Media, CAGR, mínimo, máximo y desviación estándar de cada ciclo y columna
+    en una sola reducción NumPy.
+
+    Cada año se etiqueta una vez con los ciclos a los que pertenece (matriz
+    de pertenencia ciclos × años; los ciclos pueden solaparse) y todas las
+    estadísticas salen de productos y reducciones sobre esa matriz. Los
+    resultados coinciden con ``df.loc[slice, cols].mean()`` (y ``.min()``,
+    ``.max()``, ``.std()``) ciclo por ciclo.
+
+    Parameters
+    ----------
+    df : DataFrame con índice numérico (años).
+    cycles : {nombre_ciclo: slice(inicio, fin)} con fin inclusivo, como CYCLES.
+    cols : columnas a resumir; por defecto todas las numéricas.
+
+    Returns
+    -------
+    DataFrame con índice (ciclo, estadística) y una columna por serie. La CAGR
+    está en % anual, entre el primer y el último año con dato positivo del
+    ciclo (NaN si no se puede calcular).
+    """
+    if cols is None:
+        cols = [c for c in df.columns if np.issubdtype(df[c].dtype, np.number)]
+    cols = list(cols)
+    names = list(cycles)
+    index = pd.MultiIndex.from_product([names, CYCLE_STATS], names=["ciclo", "estadistica"])
+    if df.empty or not names or not cols:
+        return pd.DataFrame(np.nan, index=index, columns=cols)
+
+    years = df.index.to_numpy(dtype=float)
+    X = df[cols].to_numpy(dtype=float)                          # años × columnas
+    starts = np.array([sl.start if sl.start is not None else -np.inf for sl in cycles.values()])
+    stops = np.array([sl.stop if sl.stop is not None else np.inf for sl in cycles.values()])
+    member = (years[None, :] >= starts[:, None]) & (years[None, :] <= stops[:, None])  # ciclos × años
+
+    valid = ~np.isnan(X)
+    M = member.astype(float)
+    X0 = np.where(valid, X, 0.0)
+    count = M @ valid.astype(float)                             # ciclos × columnas
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (M @ X0) / count
+        mean[count == 0] = np.nan
+
+        # Desviación estándar (ddof=1) en dos pasadas para evitar cancelación
+        inside = member[:, :, None] & valid[None, :, :]         # ciclos × años × columnas
+        dev = np.where(inside, X[None, :, :] - mean[:, None, :], 0.0)
+        std = np.sqrt((dev ** 2).sum(axis=1) / (count - 1))
+        std[count < 2] = np.nan
+
+        vmin = np.where(inside, X[None, :, :], np.inf).min(axis=1)
+        vmax = np.where(inside, X[None, :, :], -np.inf).max(axis=1)
+        vmin[count == 0] = np.nan
+        vmax[count == 0] = np.nan
+
+        # CAGR entre el primer y el último año con dato positivo
+        pos = inside & (X[None, :, :] > 0)
+        n_years = len(years)
+        first_i = np.where(pos.any(axis=1), pos.argmax(axis=1), -1)
+        last_i = np.where(pos.any(axis=1), n_years - 1 - pos[:, ::-1, :].argmax(axis=1), -1)
+        col_idx = np.arange(len(cols))[None, :]
+        v_first = np.where(first_i >= 0, X[first_i.clip(0), col_idx], np.nan)
+        v_last = np.where(last_i >= 0, X[last_i.clip(0), col_idx], np.nan)
+        span = np.where(first_i >= 0, years[last_i.clip(0)] - years[first_i.clip(0)], np.nan)
+        cagr = ((v_last / v_first) ** (1.0 / span) - 1.0) * 100
+        cagr[~(span > 0)] = np.nan
+
+    # (ciclos, estadísticas, columnas) → filas (ciclo, estadística)
+    stacked = np.stack([mean, cagr, vmin, vmax, std], axis=1)
+    return pd.DataFrame(stacked.reshape(len(names) * len(CYCLE_STATS), len(cols)), index=index, columns=cols)
+
+
+def cycle_means(
+    df: pd.DataFrame,
+    cycles: Mapping[str, slice],
+    cols: Optional[Sequence[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Medias por ciclo en el formato ``{nombre_ciclo: {col: media}}`` que
+    consumen add_cycle_means_barras / add_cycle_means_multi.
+    """
+    stats = cycle_statistics(df, cycles, cols)
+    return stats.xs("mean", level="estadistica").to_dict("index")
+
+
+_cycle_stats_cache = ResultCache()
+
+
+def table_cycle_stats(
+    table: str,
+    scheme: str = "ciclos",
+    conn_str: str | Path | None = None,
+    cols: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    ``cycle_statistics`` de una tabla de la base para un esquema de
+    ``CYCLE_SCHEMES`` ("ciclos", "sin_crisis" o "periodos").
+
+    Si la base tiene las estadísticas materializadas al día (ver
+    :mod:`func_auxiliares.period_stats`) se leen de ahí; si no, los ciclos se
+    ajustan al rango de la tabla con ``adjust_cycles`` (como en los scripts de
+    tesis) y se calculan. El resultado se cachea por tabla, esquema, columnas
+    y versión de la base. No modificar el DataFrame devuelto.
+    """
+    if scheme not in CYCLE_SCHEMES:
+        raise KeyError(f"Esquema de ciclos desconocido: {scheme!r} (opciones: {list(CYCLE_SCHEMES)})")
+    conn_str = str(conn_str or DB_PATH)
+    key = (table, scheme, tuple(cols) if cols else None, conn_str, data_version(conn_str))
+
+    def _compute() -> pd.DataFrame:
+        # Import diferido: period_stats importa este módulo
+        from func_auxiliares.period_stats import load_period_stats
+
+        stored = load_period_stats(table, scheme, cols, conn_str)
+        if stored is not None:
+            return stored
+        df = get_df(f'SELECT * FROM "{table}"', conn_str=conn_str)
+        return cycle_statistics(df, adjust_cycles(df, CYCLE_SCHEMES[scheme]), cols)
+
+    return _cycle_stats_cache.get_or_compute(key, _compute)
+
+
+def _read_sql(sql: str, conn_str: str) -> pd.DataFrame:
+    """
+    Run ``sql`` on a pooled read-only connection and return the raw result.
+
+    Simple ``SELECT ... FROM table`` queries are served from the columnar
+    snapshot when ``PROYECTOMACRO_SNAPSHOT`` points to an up-to-date one
+    (see :mod:`func_auxiliares.snapshot`).
+    """
+    snapshot = active_snapshot(conn_str)
+    if snapshot is not None:
+        df = snapshot.query(sql)
+        if df is not None:
+            return df
+    with get_pool(conn_str).connection() as conn:
+        return pd.read_sql(sql, conn)
+
+
 def get_df(
     sql: str,
     conn_str: str,
@@ -278,6 +444,7 @@ def get_df(
     compute_sum: dict[str, list[str]] | None = None,
     pivot: dict | None = None,
     sort_index: bool = True,
+    use_cache: bool = True,
 ) -> pd.DataFrame:
     """Execute a SQL query and return a cleaned ``DataFrame``.
 
@@ -300,6 +467,10 @@ def get_df(
         ``values``, ``aggfunc`` and ``fill_value``.
     sort_index : bool, optional
         Whether to sort the resulting ``DataFrame`` by the index column.
+    use_cache : bool, optional
+        Serve the raw query result from the process-wide table cache
+        (see :mod:`func_auxiliares.table_cache`). The cache is invalidated
+        automatically when the database file changes.
 
     Returns
     -------
@@ -307,8 +478,10 @@ def get_df(
         The processed DataFrame.
     """
 
-    with sqlite3.connect(conn_str) as conn:
-        df = pd.read_sql(sql, conn)
+    if use_cache:
+        df = get_table_cache().get_or_load(sql, conn_str, lambda: _read_sql(sql, conn_str))
+    else:
+        df = _read_sql(sql, conn_str)
 
     if pivot:
         df = df.pivot_table(
@@ -414,6 +587,108 @@ def init_base_plot(
         )
     plt.tight_layout()
     return fig, ax
+
+
+OUTPUT_FORMATS = ("png", "pdf", "svg")
+
+
+def render_windows(
+    df: pd.DataFrame,
+    series: list[tuple[str, str]],
+    colors: dict[str, str],
+    title,
+    xlabel: str,
+    ylabel: str,
+    windows: Mapping[str, Optional[Tuple[int, int]]],
+    output,
+    *,
+    annotate=None,
+    formats: Sequence[str] = OUTPUT_FORMATS,
+    min_points: int = 1,
+    savefig_kwargs: dict | None = None,
+    **plot_kwargs,
+) -> Dict[str, List[Path]]:
+    """
+    Dibuja la figura una sola vez con ``init_base_plot`` y guarda una imagen
+    por ventana y por formato.
+
+    Para cada ventana sólo se cambian los datos de las líneas, los límites,
+    los ticks del eje x y el título; las anotaciones se vuelven a colocar con ``annotate`` sobre el
+    tramo del DataFrame que cae en la ventana y se retiran antes de pasar a la
+    siguiente.
+
+    Parameters
+    ----------
+    df, series, colors, xlabel, ylabel : como en ``init_base_plot``.
+    title : str o función ``ventana -> str``.
+    windows : {nombre: (año_ini, año_fin) o None}; None es la serie completa.
+              Ej.: ``PERIODOS_PARA_CRISIS`` o ``VENTANAS_PERIODOS``.
+    output : función ``ventana -> Path`` sin extensión, o plantilla str con
+             ``{ventana}`` (ej. ``"assets/tesis/x/{ventana}/precio"``).
+    annotate : función ``(ax, sub_df, ventana)`` que agrega las anotaciones de
+               la ventana (hitos, valores por año, tasas...), opcional.
+    formats : extensiones a guardar por ventana (por defecto png, pdf y svg).
+    min_points : ventanas con menos filas se omiten.
+    savefig_kwargs : kwargs adicionales para ``fig.savefig`` (dpi, etc.).
+    plot_kwargs : resto de argumentos de ``init_base_plot``.
+
+    Returns
+    -------
+    {ventana: [rutas guardadas]} (sólo las ventanas con datos suficientes).
+
+    Ejemplo de uso
+    --------------
+    render_windows(
+        df, series, colors, lambda v: f"DEUDA EXTERNA ({v.upper()})",
+        "Año", "Millones de USD", PERIODOS_PARA_CRISIS,
+        lambda v: output_dir / f"deuda_externa_{v}",
+        annotate=lambda ax, sub, v: add_year_value_annotations(
+            ax, sub, adjust_annot_years(sub, years), cols, offsets, colors),
+    )
+    """
+    savefig_kwargs = savefig_kwargs or {}
+    fig, ax = init_base_plot(df, series, colors, title if isinstance(title, str) else "", xlabel, ylabel, **plot_kwargs)
+    lines = list(zip(ax.get_lines(), (col for col, _ in series)))
+
+    saved: Dict[str, List[Path]] = {}
+    try:
+        for name, window in windows.items():
+            sub = df if window is None else df.loc[window[0]:window[1]]
+            if len(sub) < min_points:
+                logger.info("Ventana %s omitida (%d filas)", name, len(sub))
+                continue
+
+            # Mismas líneas con los datos de la ventana: los límites quedan
+            # como si se hubiera graficado sólo ``sub``
+            for line, col in lines:
+                line.set_data(sub.index, sub[col])
+            ax.relim()
+            ax.autoscale_view()
+            ax.set_xticks(sub.index[::max(1, len(sub)//31)])
+            if not isinstance(title, str):
+                ax.set_title(title(name), fontweight='bold', color='red', fontsize=17)
+
+            before = set(ax.get_children()) | set(fig.get_children())
+            if annotate is not None:
+                annotate(ax, sub, name)
+            added = [a for a in (*ax.get_children(), *fig.get_children()) if a not in before]
+            fig.tight_layout()
+
+            stem = Path(output(name) if callable(output) else output.format(ventana=name))
+            stem.parent.mkdir(parents=True, exist_ok=True)
+            saved[name] = []
+            for fmt in formats:
+                path = stem.with_name(f"{stem.name}.{fmt}")
+                fig.savefig(path, format=fmt, **savefig_kwargs)
+                saved[name].append(path)
+
+            for artist in added:
+                artist.remove()
+    finally:
+        plt.close(fig)
+    return saved
+
+
 def plot_stacked_bar(
     data: pd.DataFrame,
     series: List[Tuple[str, str]], 
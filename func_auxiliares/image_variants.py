@@ -0,0 +1,236 @@
+# func_auxiliares/image_variants.py
+"""
+Miniaturas y variantes comprimidas de las imágenes de assets/tesis.
+
+Las gráficas se guardan a 150 dpi (~2000 px de ancho) y la galería del
+dashboard las mostraba tal cual. Este paso de construcción genera, para
+cada imagen de ``ASSETS_DIR``, versiones reducidas a ``THUMB_WIDTHS`` en
+WebP y en PNG con paleta dentro de ``VARIANTS_DIR``, y un manifiesto con el
+hash del original. Los nombres de las variantes llevan ese hash, así que
+una imagen que no cambió no se vuelve a procesar y el navegador nunca ve
+una versión vieja con la URL de una nueva.
+
+La galería (``page_utils.build_image_gallery_card``) usa el manifiesto para
+armar ``srcset``; el botón "Descargar" sigue apuntando al original. Las
+variantes requieren Pillow (dependencia opcional): sin Pillow, o sin
+manifiesto, la galería muestra los originales como antes.
+
+Uso (desde la raíz del proyecto):
+    python -m func_auxiliares.image_variants          # incremental
+    python -m func_auxiliares.image_variants --force  # regenera todo
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from func_auxiliares.config import ASSETS_DIR
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow es opcional
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = ASSETS_DIR / "variantes"
+VARIANTS_MANIFEST = VARIANTS_DIR / "manifest.json"
+THUMB_WIDTHS = (480, 960, 1440)
+VARIANT_FORMATS = ("webp", "png")
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+WEBP_QUALITY = 82
+
+
+def discover_images(root: Path = ASSETS_DIR) -> List[Path]:
+    """Imágenes originales bajo ``root`` (sin las variantes)."""
+    return sorted(
+        p for p in root.rglob("*")
+        if p.suffix.lower() in IMAGE_SUFFIXES and p.is_file() and VARIANTS_DIR not in p.parents
+    )
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def make_variants(source: Path, digest: str, out_dir: Path = VARIANTS_DIR) -> dict:
+    """
+    Genera las variantes de ``source`` y devuelve su entrada del manifiesto.
+
+    Sólo se generan anchos menores que el original; si el original es más
+    angosto que todos, se guarda una variante a su ancho (recomprimida). Los
+    PNG se reducen a una paleta de 256 colores.
+    """
+    with Image.open(source) as original:
+        # Las gráficas son opacas: se aplanan sobre blanco para comprimir mejor
+        if original.mode in ("RGBA", "LA", "P"):
+            img = Image.new("RGB", original.size, "white")
+            rgba = original.convert("RGBA")
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        else:
+            img = original.convert("RGB")
+        width, height = img.size
+        widths = [w for w in THUMB_WIDTHS if w < width] or [width]
+        variants = []
+        for w in widths:
+            h = max(1, round(height * w / width))
+            small = img if w == width else img.resize((w, h), Image.LANCZOS)
+            for fmt in VARIANT_FORMATS:
+                target = out_dir / f"{digest[:16]}-{w}.{fmt}"
+                if fmt == "webp":
+                    small.save(target, "WEBP", quality=WEBP_QUALITY, method=4)
+                else:
+                    # 256 colores alcanzan para una gráfica de líneas y barras
+                    small.quantize(256, method=Image.Quantize.FASTOCTREE).save(target, "PNG", optimize=True)
+                variants.append({
+                    "file": target.relative_to(ASSETS_DIR).as_posix(),
+                    "format": fmt,
+                    "width": w,
+                    "height": h,
+                    "bytes": target.stat().st_size,
+                })
+    return {
+        "hash": digest,
+        "width": width,
+        "height": height,
+        "bytes": source.stat().st_size,
+        "variants": variants,
+    }
+
+
+def load_manifest(path: Path = VARIANTS_MANIFEST) -> Dict[str, dict]:
+    """Entradas del manifiesto ({ruta relativa a ASSETS_DIR: entrada}); vacío si no existe."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("images", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_fresh(entry: Optional[dict], digest: str) -> bool:
+    return (
+        entry is not None
+        and entry.get("hash") == digest
+        and all((ASSETS_DIR / v["file"]).exists() for v in entry.get("variants", []))
+    )
+
+
+def build(force: bool = False, jobs: Optional[int] = None) -> Dict[str, int]:
+    """
+    Genera las variantes que falten y reescribe el manifiesto.
+
+    Las variantes de imágenes que ya no existen (o que cambiaron) se borran.
+
+    Returns
+    -------
+    {"images": n, "built": n, "reused": n, "bytes_in": n, "bytes_out": n}
+    """
+    if Image is None:
+        raise RuntimeError("Pillow no está instalado: pip install Pillow")
+    VARIANTS_DIR.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest()
+    images: Dict[str, dict] = {}
+    pending = []
+    for source in discover_images():
+        rel = source.relative_to(ASSETS_DIR).as_posix()
+        digest = _sha256(source)
+        if not force and _is_fresh(previous.get(rel), digest):
+            images[rel] = previous[rel]
+        else:
+            pending.append((rel, source, digest))
+
+    # Pillow libera el GIL al redimensionar y comprimir: bastan hilos
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        futures = {rel: pool.submit(make_variants, source, digest) for rel, source, digest in pending}
+        for rel, future in futures.items():
+            try:
+                images[rel] = future.result()
+            except (OSError, ValueError) as exc:
+                logger.warning("Sin variantes para %s: %s", rel, exc)
+
+    images = dict(sorted(images.items()))
+    keep = {v["file"] for entry in images.values() for v in entry["variants"]}
+    for path in VARIANTS_DIR.iterdir():
+        if path != VARIANTS_MANIFEST and path.relative_to(ASSETS_DIR).as_posix() not in keep:
+            path.unlink()
+
+    tmp = VARIANTS_MANIFEST.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "images": images}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    tmp.replace(VARIANTS_MANIFEST)
+    return {
+        "images": len(images),
+        "built": len(pending),
+        "reused": len(images) - len(pending),
+        "bytes_in": sum(e["bytes"] for e in images.values()),
+        "bytes_out": sum(v["bytes"] for e in images.values() for v in e["variants"]),
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Lectura desde el dashboard
+# ──────────────────────────────────────────────────────────────────────
+_manifest_cache: Dict[Path, tuple] = {}
+_manifest_lock = threading.Lock()
+
+
+def get_variants(asset_path: str, manifest_path: Path = VARIANTS_MANIFEST) -> Optional[dict]:
+    """
+    Entrada del manifiesto para ``asset_path`` (relativo a ASSETS_DIR) o None.
+
+    El manifiesto se relee sólo cuando cambia en disco.
+    """
+    try:
+        mtime = manifest_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    with _manifest_lock:
+        cached = _manifest_cache.get(manifest_path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, load_manifest(manifest_path))
+            _manifest_cache[manifest_path] = cached
+    return cached[1].get(asset_path)
+
+
+def srcset(entry: dict, fmt: str, url: Callable[[str], str] = lambda p: p) -> str:
+    """Atributo ``srcset`` (``"url 480w, url 960w"``) de las variantes ``fmt`` de ``entry``."""
+    return ", ".join(f"{url(v['file'])} {v['width']}w" for v in entry["variants"] if v["format"] == fmt)
+
+
+def smallest(entry: dict, fmt: str) -> Optional[dict]:
+    """Variante ``fmt`` más chica de ``entry``."""
+    variants = [v for v in entry["variants"] if v["format"] == fmt]
+    return min(variants, key=lambda v: v["width"]) if variants else None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Genera miniaturas WebP/PNG de las imágenes de assets/tesis")
+    parser.add_argument("--force", action="store_true", help="regenera aunque el original no haya cambiado")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="hilos simultáneos (por defecto, nº de CPUs)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    t0 = time.perf_counter()
+    try:
+        result = build(args.force, args.jobs)
+    except RuntimeError as exc:
+        print(exc)
+        return 1
+    print(
+        f"{result['images']} imágenes ({result['built']} procesadas, {result['reused']} sin cambios): "
+        f"{result['bytes_in'] / 2**20:.1f} MiB → {result['bytes_out'] / 2**20:.1f} MiB "
+        f"en {time.perf_counter() - t0:.1f} s → {VARIANTS_DIR}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+# func_auxiliares/period_stats.py
+"""
+Estadísticas por ciclo y por período materializadas dentro de proyectomacro.db.
+
+El paso de construcción recorre las tablas anuales y guarda, para cada
+esquema de ``CYCLE_SCHEMES`` (media, CAGR, mínimo, máximo y desviación de
+cada ciclo) y de ``PERIOD_SCHEMES`` (crecimiento acumulado vi→vf), una fila
+por (tabla, columna, esquema, período, estadística) en la tabla derivada
+``PERIOD_STATS_TABLE``. Los ciclos y períodos se ajustan al rango de cada
+tabla con ``adjust_cycles`` / ``adjust_periods``, igual que en los scripts.
+
+Cada fila lleva el hash del contenido de la tabla fuente; al leer se compara
+con el del índice de cobertura y, si la tabla cambió después de construir,
+el lector devuelve None para que el llamador recalcule.
+
+Uso:
+    python -m func_auxiliares.period_stats            # reconstruye todo
+
+    from func_auxiliares.period_stats import load_period_stats
+    load_period_stats("pib_ramas", "ciclos")        # índice (período, estadística)
+"""
+import argparse
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from func_auxiliares.config import CYCLE_SCHEMES, DB_PATH, PERIOD_SCHEMES, PERIOD_STATS_TABLE
+from func_auxiliares.coverage_index import get_coverage_index
+from func_auxiliares.db_pool import get_pool
+from func_auxiliares.graficos_utils import (
+    CYCLE_STATS, adjust_cycles, adjust_periods, cycle_statistics, get_df,
+)
+from func_auxiliares.result_cache import ResultCache, data_version
+from func_auxiliares.schema_catalog import get_schema_catalog
+from func_auxiliares.table_cache import frame_digest, resolve_db_file
+
+logger = logging.getLogger(__name__)
+
+# Estadística de los esquemas de PERIOD_SCHEMES
+GROWTH_STAT = "crecimiento"
+
+_SCHEMA = f"""
+CREATE TABLE {PERIOD_STATS_TABLE} (
+    table_name    TEXT NOT NULL,
+    column_name   TEXT NOT NULL,
+    scheme        TEXT NOT NULL,
+    period        TEXT NOT NULL,
+    period_start  INTEGER NOT NULL,
+    period_end    INTEGER NOT NULL,
+    stat          TEXT NOT NULL,
+    value         REAL,
+    content_hash  TEXT NOT NULL,
+    PRIMARY KEY (table_name, scheme, period, column_name, stat)
+)
+"""
+_INDEX = (
+    f"CREATE INDEX ix_{PERIOD_STATS_TABLE}_lookup "
+    f"ON {PERIOD_STATS_TABLE} (table_name, column_name, scheme, stat)"
+)
+
+Row = Tuple[str, str, str, str, int, int, str, Optional[float], str]
+
+
+def period_growth(
+    df: pd.DataFrame,
+    periods: Sequence[Tuple[int, int]],
+    cols: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Crecimiento acumulado en % entre el primer y el último año de cada período.
+
+    Es la tasa que anota ``add_period_growth_annotations_multi``
+    (``(v_fin / v_ini - 1) * 100``); NaN si falta alguno de los dos valores o
+    es cero. Devuelve un DataFrame con índice ``"vi-vf"`` y una columna por serie.
+    """
+    if cols is None:
+        cols = [c for c in df.columns if np.issubdtype(df[c].dtype, np.number)]
+    cols = list(cols)
+    labels = [f"{vi}-{vf}" for vi, vf in periods]
+    if not periods or not cols:
+        return pd.DataFrame(np.nan, index=labels, columns=cols)
+
+    values = df[cols]
+    v_ini = values.reindex([vi for vi, _ in periods]).to_numpy(dtype=float)
+    v_fin = values.reindex([vf for _, vf in periods]).to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth = (v_fin / v_ini - 1.0) * 100
+    growth[(v_ini == 0) | (v_fin == 0)] = np.nan
+    return pd.DataFrame(growth, index=labels, columns=cols)
+
+
+def _value(x: float) -> Optional[float]:
+    return None if np.isnan(x) else float(x)
+
+
+def table_rows(table: str, df: pd.DataFrame, digest: str) -> List[Row]:
+    """Filas de ``PERIOD_STATS_TABLE`` para una tabla ya cargada."""
+    cols = [c for c in df.columns if np.issubdtype(df[c].dtype, np.number)]
+    rows: List[Row] = []
+    if df.empty or not cols:
+        return rows
+
+    for scheme, cycles in CYCLE_SCHEMES.items():
+        adjusted = adjust_cycles(df, cycles)
+        stats = cycle_statistics(df, adjusted, cols)
+        values = stats.to_numpy(dtype=float)
+        for i, (period, stat) in enumerate(stats.index):
+            sl = adjusted[period]
+            for j, col in enumerate(cols):
+                rows.append((table, col, scheme, period, sl.start, sl.stop, stat, _value(values[i, j]), digest))
+
+    for scheme, periods in PERIOD_SCHEMES.items():
+        adjusted = adjust_periods(df, periods)
+        growth = period_growth(df, adjusted, cols)
+        values = growth.to_numpy(dtype=float)
+        for i, (vi, vf) in enumerate(adjusted):
+            for j, col in enumerate(cols):
+                rows.append((table, col, scheme, f"{vi}-{vf}", int(vi), int(vf), GROWTH_STAT, _value(values[i, j]), digest))
+    return rows
+
+
+def build_period_stats(db_path: str | Path = DB_PATH, tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    (Re)construye ``PERIOD_STATS_TABLE`` en ``db_path``.
+
+    Parameters
+    ----------
+    db_path : ruta de la base.
+    tables : tablas a recalcular; por defecto todas las anuales. Las filas de
+             las demás tablas se conservan.
+
+    Returns
+    -------
+    {"tables": n, "rows": n} de lo escrito.
+    """
+    db_file = resolve_db_file(db_path)
+    catalog = get_schema_catalog(db_file)
+    if tables is None:
+        names = [t for t in catalog.table_names() if catalog.table(t).has_year]
+    else:
+        names = []
+        for t in tables:
+            info = catalog.table(t)
+            if info is None or not info.has_year:
+                raise KeyError(f"Tabla anual no encontrada: {t!r}")
+            names.append(info.name)
+
+    rows: List[Row] = []
+    built = 0
+    for name in names:
+        df = get_df(f'SELECT * FROM "{name}"', conn_str=str(db_file))
+        if df.empty or not df.index.is_unique:
+            logger.warning("Tabla %s omitida (vacía o con años repetidos)", name)
+            continue
+        rows.extend(table_rows(name, df, frame_digest(df)))
+        built += 1
+
+    conn = sqlite3.connect(db_file, timeout=30)
+    try:
+        with conn:
+            if tables is None:
+                conn.execute(f"DROP TABLE IF EXISTS {PERIOD_STATS_TABLE}")
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (PERIOD_STATS_TABLE,)
+            ).fetchone()
+            if not exists:
+                conn.execute(_SCHEMA)
+                conn.execute(_INDEX)
+            else:
+                conn.executemany(
+                    f"DELETE FROM {PERIOD_STATS_TABLE} WHERE table_name = ?", [(n,) for n in names]
+                )
+            conn.executemany(
+                f"INSERT INTO {PERIOD_STATS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+    finally:
+        conn.close()
+    return {"tables": built, "rows": len(rows)}
+
+
+_stats_cache = ResultCache()
+
+
+def load_period_stats(
+    table: str,
+    scheme: str,
+    cols: Optional[Sequence[str]] = None,
+    db_path: str | Path = DB_PATH,
+) -> Optional[pd.DataFrame]:
+    """
+    Lee las estadísticas materializadas de ``table`` para ``scheme``.
+
+    Devuelve un DataFrame con índice (período, estadística) y una columna por
+    serie, con la misma forma que ``cycle_statistics`` (o que
+    ``period_growth`` con la estadística ``"crecimiento"``), o None si no hay
+    filas o si la tabla cambió desde que se construyeron. No modificar el
+    DataFrame devuelto.
+    """
+    if scheme not in CYCLE_SCHEMES and scheme not in PERIOD_SCHEMES:
+        raise KeyError(f"Esquema desconocido: {scheme!r}")
+    db_file = resolve_db_file(db_path)
+    catalog = get_schema_catalog(db_file)
+    info = catalog.table(table)
+    if info is None or PERIOD_STATS_TABLE not in catalog.derived:
+        return None
+
+    key = (info.name, scheme, tuple(cols) if cols else None, db_file, data_version(db_file))
+    return _stats_cache.get_or_compute(key, lambda: _load(info.name, scheme, cols, db_file))
+
+
+def _load(table: str, scheme: str, cols: Optional[Sequence[str]], db_file: Path) -> Optional[pd.DataFrame]:
+    with get_pool(db_file).connection() as conn:
+        rows = conn.execute(
+            f"SELECT column_name, period, period_start, stat, value, content_hash "
+            f"FROM {PERIOD_STATS_TABLE} WHERE table_name = ? AND scheme = ? ORDER BY rowid",
+            (table, scheme),
+        ).fetchall()
+    if not rows:
+        return None
+
+    coverage = get_coverage_index(db_file).table(table)
+    if coverage is None or any(r[5] != coverage.digest for r in rows):
+        logger.info("Estadísticas de %s desactualizadas; se recalculan", table)
+        return None
+
+    long = pd.DataFrame(rows, columns=["column", "period", "start", "stat", "value", "hash"])
+    if cols is not None and not set(cols) <= set(long["column"]):
+        return None
+
+    if scheme in CYCLE_SCHEMES:
+        stats, level = list(CYCLE_STATS), "ciclo"
+    else:
+        stats, level = [GROWTH_STAT], "periodo"
+    periods = long.drop_duplicates("period").sort_values("start")["period"].tolist()
+    columns = list(cols) if cols is not None else list(dict.fromkeys(long["column"]))
+    wide = long.pivot(index=["period", "stat"], columns="column", values="value")
+    index = pd.MultiIndex.from_product([periods, stats], names=[level, "estadistica"])
+    result = wide.reindex(index=index, columns=columns).astype(float)
+    result.columns.name = None
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=f"Construye la tabla {PERIOD_STATS_TABLE}")
+    parser.add_argument("tablas", nargs="*", help="tablas a recalcular (por defecto todas)")
+    parser.add_argument("--db", default=str(DB_PATH), help="ruta de la base")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    result = build_period_stats(args.db, args.tablas or None)
+    print(
+        f"{PERIOD_STATS_TABLE}: {result['rows']} filas de {result['tables']} tablas "
+        f"en {time.perf_counter() - t0:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
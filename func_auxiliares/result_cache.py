@@ -0,0 +1,112 @@
+# func_auxiliares/result_cache.py
+"""
+Memoización acotada (LRU + TTL) para resultados caros de los callbacks del
+dashboard, p.ej. los cálculos y gráficos de la calculadora.
+
+Las claves las arma quien llama y deben incluir la versión de los datos
+(ver :func:`data_version`) para que un cambio en la base invalide los
+resultados sin esperar al TTL. Los valores se comparten entre peticiones:
+quien los recibe no debe modificarlos.
+
+Uso:
+    from func_auxiliares.result_cache import ResultCache, data_version
+    _cache = ResultCache(max_entries=128, ttl=600)
+    key = ("pib_ramas", "agropecuario", data_version(DB_PATH))
+    value = _cache.get_or_compute(key, lambda: calculo_caro())
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from func_auxiliares.table_cache import Signature, db_signature, resolve_db_file
+
+#  ── Límites por defecto (se pueden sobreescribir con variables de entorno)
+DEFAULT_MAX_ENTRIES = int(os.environ.get("PROYECTOMACRO_RESULT_CACHE_ENTRIES", "128"))
+DEFAULT_TTL = float(os.environ.get("PROYECTOMACRO_RESULT_CACHE_TTL", "600"))
+
+_MISSING = object()
+
+
+def data_version(db_path: str | Path) -> Optional[Signature]:
+    """Firma actual de la base; cambia cuando el archivo SQLite se modifica."""
+    return db_signature(resolve_db_file(db_path))
+
+
+class ResultCache:
+    """
+    Caché LRU con expiración por tiempo.
+
+    Parameters
+    ----------
+    max_entries : int
+        Número máximo de resultados guardados.
+    ttl : float
+        Segundos que vive cada resultado desde que se calculó.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser >= 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Devuelve el valor de ``key`` o ``default`` si no existe o expiró."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expired += 1
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Guarda ``value`` bajo ``key`` y expulsa el más antiguo si no hay cupo."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor cacheado de ``key`` o lo calcula con ``compute``.
+
+        Si ``compute`` lanza una excepción no se guarda nada.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de uso de la caché."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,201 @@
+# func_auxiliares/schema_catalog.py
+"""
+Catálogo del esquema de la base: tablas, columnas, tipos declarados, si la
+columna es numérica y el primer/último año con dato no nulo de cada columna.
+
+Se construye una vez con unas pocas consultas por tabla (sin crear
+DataFrames) y se reconstruye sólo cuando cambia la versión de los datos
+(:func:`func_auxiliares.result_cache.data_version`). Las consultas posteriores
+no tocan SQLite. Las tablas derivadas (``DERIVED_TABLES``, p.ej. las
+estadísticas por período) no se listan; sólo se registra si existen.
+
+Uso:
+    from func_auxiliares.schema_catalog import get_schema_catalog
+    catalog = get_schema_catalog()
+    catalog.table_names()                      # ["PIB_Real_Gasto", ...]
+    catalog.numeric_columns("pib_ramas")       # ["agropecuario", ...]
+    catalog.year_bounds("pib_ramas", "agropecuario")   # (1950, 2022)
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from func_auxiliares.config import DB_PATH, DERIVED_TABLES
+from func_auxiliares.db_pool import get_pool
+from func_auxiliares.result_cache import data_version
+from func_auxiliares.table_cache import Signature, resolve_db_file
+
+logger = logging.getLogger(__name__)
+
+# Columna que indexa las series anuales
+YEAR_COLUMN = "año"
+
+
+def _is_numeric_type(declared_type: str) -> bool:
+    """True si el tipo declarado tiene afinidad INTEGER, REAL o NUMERIC en SQLite."""
+    t = (declared_type or "").upper()
+    if "INT" in t:
+        return True
+    if any(k in t for k in ("CHAR", "CLOB", "TEXT", "BLOB")) or not t:
+        return False
+    return True   # REAL, FLOAT, DOUBLE, NUMERIC, DECIMAL, BOOLEAN, ...
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    """Una columna de una tabla."""
+    name: str
+    declared_type: str
+    numeric: bool
+    first_year: Optional[int] = None   # primer año con valor no nulo
+    last_year: Optional[int] = None    # último año con valor no nulo
+
+
+@dataclass(frozen=True)
+class TableInfo:
+    """Una tabla y sus columnas, en el orden de la base."""
+    name: str
+    columns: Tuple[ColumnInfo, ...]
+    has_year: bool
+    first_year: Optional[int] = None
+    last_year: Optional[int] = None
+
+    def column(self, name: str) -> Optional[ColumnInfo]:
+        return next((c for c in self.columns if c.name == name), None)
+
+
+class SchemaCatalog:
+    """
+    Catálogo inmutable de una versión concreta de la base.
+
+    Como en SQLite, los nombres de tabla no distinguen mayúsculas
+    (``tasa_crecimiento_pib`` encuentra ``Tasa_Crecimiento_PIB``).
+    """
+
+    def __init__(
+        self,
+        tables: Dict[str, TableInfo],
+        version: Optional[Signature],
+        derived: FrozenSet[str] = frozenset(),
+    ):
+        self.tables = tables
+        self.version = version
+        self.derived = derived      # tablas derivadas presentes en la base
+        self._by_lower = {name.lower(): info for name, info in tables.items()}
+
+    def table_names(self) -> List[str]:
+        return list(self.tables)
+
+    def table(self, name: str) -> Optional[TableInfo]:
+        return self.tables.get(name) or self._by_lower.get((name or "").lower())
+
+    def columns(self, table: str) -> List[str]:
+        info = self.table(table)
+        return [c.name for c in info.columns] if info else []
+
+    def numeric_columns(self, table: str, include_year: bool = False) -> List[str]:
+        """Columnas numéricas de ``table`` (sin la columna de año, salvo que se pida)."""
+        info = self.table(table)
+        if info is None:
+            return []
+        return [
+            c.name for c in info.columns
+            if c.numeric and (include_year or c.name != YEAR_COLUMN)
+        ]
+
+    def year_bounds(self, table: str, column: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """
+        ``(primer_año, último_año)`` con datos de ``table`` (o de una columna).
+
+        Devuelve None si la tabla no tiene columna de año o no hay datos.
+        """
+        info = self.table(table)
+        if info is None:
+            return None
+        if column is None:
+            first, last = info.first_year, info.last_year
+        else:
+            col = info.column(column)
+            if col is None:
+                return None
+            first, last = col.first_year, col.last_year
+        if first is None or last is None:
+            return None
+        return first, last
+
+
+def _to_year(value) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def build_schema_catalog(db_path: str | Path = DB_PATH) -> SchemaCatalog:
+    """Lee el esquema completo de ``db_path`` (dos consultas por tabla)."""
+    version = data_version(db_path)
+    tables: Dict[str, TableInfo] = {}
+    with get_pool(db_path).connection() as conn:
+        names = [
+            r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )
+        ]
+        derived = frozenset(n for n in names if n in DERIVED_TABLES)
+        for name in names:
+            if name in derived:
+                continue
+            # table_xinfo incluye las columnas generadas (hidden 2/3)
+            pragma = conn.execute(f"PRAGMA table_xinfo({_quote(name)})").fetchall()
+            col_defs = [(r[1], r[2] or "") for r in pragma if r[6] != 1]
+            has_year = any(c == YEAR_COLUMN for c, _ in col_defs)
+
+            bounds: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+            if has_year and col_defs:
+                # Un solo recorrido de la tabla para todas las columnas
+                year = _quote(YEAR_COLUMN)
+                exprs = []
+                for col, _ in col_defs:
+                    q = _quote(col)
+                    exprs.append(f"MIN(CASE WHEN {q} IS NOT NULL THEN {year} END)")
+                    exprs.append(f"MAX(CASE WHEN {q} IS NOT NULL THEN {year} END)")
+                row = conn.execute(f"SELECT {', '.join(exprs)} FROM {_quote(name)}").fetchone()
+                for i, (col, _) in enumerate(col_defs):
+                    bounds[col] = (_to_year(row[2 * i]), _to_year(row[2 * i + 1]))
+
+            columns = tuple(
+                ColumnInfo(col, dtype, _is_numeric_type(dtype), *bounds.get(col, (None, None)))
+                for col, dtype in col_defs
+            )
+            year_bounds = bounds.get(YEAR_COLUMN, (None, None))
+            tables[name] = TableInfo(name, columns, has_year, *year_bounds)
+
+    logger.debug("Catálogo de esquema construido: %d tablas", len(tables))
+    return SchemaCatalog(tables, version, derived)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Catálogo compartido (uno por base), reconstruido al cambiar los datos
+# ──────────────────────────────────────────────────────────────────────
+_catalogs: Dict[Path, SchemaCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_schema_catalog(db_path: str | Path = DB_PATH) -> SchemaCatalog:
+    """
+    Devuelve el catálogo de ``db_path``; lo reconstruye si la base cambió.
+
+    Sólo hace un ``stat`` del archivo cuando el catálogo está al día.
+    """
+    db_file = resolve_db_file(db_path)
+    version = data_version(db_file)
+    with _catalogs_lock:
+        catalog = _catalogs.get(db_file)
+        if catalog is None or catalog.version != version:
+            catalog = build_schema_catalog(db_file)
+            _catalogs[db_file] = catalog
+        return catalog
@@ -0,0 +1,271 @@
+# func_auxiliares/snapshot.py
+"""
+Snapshot columnar de la base para renderizar gráficas en lote.
+
+``export_snapshot`` vuelca cada tabla a un directorio con un ``.npy`` 2-D por
+dtype numérico (una fila contigua por columna), un ``.npy`` por columna de
+texto y un ``manifest.json`` con los tipos y la firma de la base con que se
+generó. Los arreglos numéricos se abren con ``np.load(mmap_mode="c")``: todos
+los procesos que leen el snapshot comparten las mismas páginas del sistema
+operativo en lugar de parsear N veces el resultado de SQLite, y una escritura
+sobre el DataFrame nunca llega al archivo.
+
+``get_df`` lo usa de forma transparente: si la variable de entorno
+``PROYECTOMACRO_SNAPSHOT`` apunta a un snapshot generado con la versión
+actual de la base, las consultas simples (``SELECT * FROM t`` o
+``SELECT a, b FROM t``) se sirven desde ahí; cualquier otra consulta, o un
+snapshot desactualizado, sigue yendo a SQLite.
+
+Uso:
+    python -m func_auxiliares.snapshot                    # exporta a db/snapshot
+    PROYECTOMACRO_SNAPSHOT=db/snapshot python script.py   # get_df lee del snapshot
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from func_auxiliares.config import DB_PATH, PROJECT_ROOT
+from func_auxiliares.db_pool import get_pool
+from func_auxiliares.schema_catalog import get_schema_catalog
+from func_auxiliares.table_cache import db_signature, normalize_sql, resolve_db_file
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = PROJECT_ROOT / "db" / "snapshot"
+SNAPSHOT_ENV = "PROYECTOMACRO_SNAPSHOT"
+MANIFEST_NAME = "manifest.json"
+
+_IDENT = r'"[^"]+"|\[[^\]]+\]|`[^`]+`|[^\s,"\[\]`]+'
+_SIMPLE_SELECT = re.compile(
+    rf"^SELECT\s+(?P<cols>\*|(?:{_IDENT})(?:\s*,\s*(?:{_IDENT}))*)\s+FROM\s+(?P<table>{_IDENT})$",
+    re.IGNORECASE,
+)
+
+
+def _unquote(ident: str) -> str:
+    ident = ident.strip()
+    if ident[:1] in ('"', "[", "`"):
+        return ident[1:-1]
+    return ident
+
+
+def _column_meta(series: pd.Series) -> Optional[dict]:
+    """Cómo guardar una columna; None si no se puede representar sin pérdida."""
+    kind = series.dtype.kind
+    if kind in "iufb":
+        return {"kind": "numeric"}
+    values = series.to_numpy(dtype=object)
+    if all(v is None or isinstance(v, str) for v in values if not (isinstance(v, float) and np.isnan(v))):
+        return {"kind": "text"}
+    return None
+
+
+def export_snapshot(db_path: str | Path = DB_PATH, out_dir: str | Path = SNAPSHOT_DIR) -> Dict[str, int]:
+    """
+    Exporta todas las tablas de ``db_path`` a ``out_dir``.
+
+    El snapshot se escribe en un directorio temporal y se intercambia al
+    final, así que los lectores nunca ven uno a medio escribir. Las tablas
+    con columnas que no se pueden guardar sin pérdida se omiten (``get_df``
+    las sigue leyendo de SQLite).
+
+    Returns
+    -------
+    {"tables": n, "skipped": n, "bytes": n}
+    """
+    db_file = resolve_db_file(db_path)
+    out_dir = Path(out_dir)
+    signature = db_signature(db_file)
+    tmp = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    tables: Dict[str, dict] = {}
+    skipped = 0
+    total = 0
+    with get_pool(db_file).connection() as conn:
+        for i, name in enumerate(get_schema_catalog(db_file).table_names()):
+            df = pd.read_sql(f'SELECT * FROM "{name}"', conn)
+            metas = [_column_meta(df[c]) for c in df.columns]
+            if any(m is None for m in metas):
+                logger.warning("Tabla %s omitida del snapshot (tipos no soportados)", name)
+                skipped += 1
+                continue
+            table_dir = tmp / f"t{i:03d}"
+            table_dir.mkdir()
+            columns = []
+            # Las columnas numéricas de un mismo dtype van juntas en un .npy 2-D
+            # (una fila por columna, contigua): un solo mmap por dtype y tabla.
+            groups: Dict[str, List[np.ndarray]] = {}
+            for j, (col, meta) in enumerate(zip(df.columns, metas)):
+                series = df[col]
+                entry = {"name": col, "dtype": str(series.dtype), **meta}
+                if meta["kind"] == "numeric":
+                    group = groups.setdefault(series.dtype.str, [])
+                    entry.update(file=f"num{series.dtype.str.strip('<>|=')}.npy", pos=len(group))
+                    group.append(series.to_numpy())
+                else:
+                    nulls = series.isna().to_numpy()
+                    data = np.array(["" if n else v for v, n in zip(series.to_numpy(dtype=object), nulls)], dtype=str)
+                    entry["file"] = f"c{j:03d}.npy"
+                    if nulls.any():
+                        entry["nulls"] = f"c{j:03d}.nulls.npy"
+                        np.save(table_dir / entry["nulls"], nulls)
+                    np.save(table_dir / entry["file"], data)
+                    total += data.nbytes
+                columns.append(entry)
+            for dtype, arrays in groups.items():
+                data = np.stack(arrays) if len(df) else np.empty((len(arrays), 0), dtype=dtype)
+                np.save(table_dir / f"num{dtype.strip('<>|=')}.npy", data)
+                total += data.nbytes
+            tables[name] = {"dir": table_dir.name, "rows": len(df), "columns": columns}
+
+    manifest = {
+        "db": str(db_file),
+        "signature": list(signature) if signature else None,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "tables": tables,
+    }
+    (tmp / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    old = out_dir.with_name(out_dir.name + ".old")
+    shutil.rmtree(old, ignore_errors=True)
+    if out_dir.exists():
+        out_dir.rename(old)
+    tmp.rename(out_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    return {"tables": len(tables), "skipped": skipped, "bytes": total}
+
+
+class Snapshot:
+    """Snapshot exportado por :func:`export_snapshot` (sólo lectura)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        manifest = json.loads((self.path / MANIFEST_NAME).read_text(encoding="utf-8"))
+        self.db_file = Path(manifest["db"])
+        self.signature = tuple(manifest["signature"]) if manifest["signature"] else None
+        self.tables: Dict[str, dict] = manifest["tables"]
+        self._by_lower = {name.lower(): name for name in self.tables}
+
+    def is_fresh_for(self, db_path: str | Path) -> bool:
+        """True si el snapshot se generó desde ``db_path`` tal como está ahora."""
+        db_file = resolve_db_file(db_path)
+        return (
+            self.signature is not None
+            and db_file == self.db_file
+            and db_signature(db_file) == self.signature
+        )
+
+    def table(self, name: str, columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Tabla ``name`` (o sus ``columns``) como DataFrame.
+
+        Cada llamada devuelve arreglos recién mapeados, así que modificar un
+        DataFrame no afecta a los demás.
+        """
+        key = name if name in self.tables else self._by_lower.get(name.lower())
+        if key is None:
+            return None
+        info = self.tables[key]
+        by_name = {c["name"]: c for c in info["columns"]}
+        wanted = list(by_name) if columns is None else list(columns)
+        if any(c not in by_name for c in wanted):
+            return None
+        table_dir = self.path / info["dir"]
+
+        data = {}
+        mapped: Dict[str, np.ndarray] = {}
+        for col in wanted:
+            meta = by_name[col]
+            if meta["kind"] == "numeric":
+                if meta["file"] not in mapped:
+                    mapped[meta["file"]] = np.load(table_dir / meta["file"], mmap_mode="c").view(np.ndarray)
+                data[col] = mapped[meta["file"]][meta["pos"]]
+            else:
+                values = np.load(table_dir / meta["file"]).astype(object)
+                if "nulls" in meta:
+                    values[np.load(table_dir / meta["nulls"])] = None
+                data[col] = pd.Series(values, dtype=meta["dtype"])
+        return pd.DataFrame(data, columns=wanted, copy=False)
+
+    def query(self, sql: str) -> Optional[pd.DataFrame]:
+        """Resultado de ``sql`` si es un SELECT simple de una tabla; si no, None."""
+        match = _SIMPLE_SELECT.match(normalize_sql(sql))
+        if match is None:
+            return None
+        table = _unquote(match.group("table"))
+        cols = match.group("cols")
+        columns = None if cols == "*" else [_unquote(c) for c in cols.split(",")]
+        return self.table(table, columns)
+
+
+_snapshots: Dict[Path, tuple] = {}
+_snapshots_lock = threading.Lock()
+
+
+def active_snapshot(db_path: str | Path) -> Optional[Snapshot]:
+    """
+    Snapshot indicado por ``PROYECTOMACRO_SNAPSHOT`` si está al día con ``db_path``.
+
+    El manifiesto se relee sólo cuando cambia en disco.
+    """
+    location = os.environ.get(SNAPSHOT_ENV)
+    if not location:
+        return None
+    path = Path(location).resolve()
+    try:
+        mtime = (path / MANIFEST_NAME).stat().st_mtime_ns
+    except OSError:
+        return None
+    with _snapshots_lock:
+        cached = _snapshots.get(path)
+        if cached is None or cached[0] != mtime:
+            try:
+                cached = (mtime, Snapshot(path))
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning("Snapshot %s ilegible: %s", path, exc)
+                return None
+            _snapshots[path] = cached
+    snapshot = cached[1]
+    return snapshot if snapshot.is_fresh_for(db_path) else None
+
+
+def ensure_snapshot(db_path: str | Path = DB_PATH, out_dir: str | Path = SNAPSHOT_DIR) -> Path:
+    """Exporta el snapshot sólo si no existe o quedó desactualizado; devuelve su ruta."""
+    out_dir = Path(out_dir)
+    try:
+        if Snapshot(out_dir).is_fresh_for(db_path):
+            return out_dir
+    except (OSError, ValueError, KeyError):
+        pass
+    export_snapshot(db_path, out_dir)
+    return out_dir
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Exporta la base a un snapshot columnar (.npy)")
+    parser.add_argument("--db", default=str(DB_PATH), help="ruta de la base")
+    parser.add_argument("--out", default=str(SNAPSHOT_DIR), help="directorio del snapshot")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    result = export_snapshot(args.db, args.out)
+    print(
+        f"{result['tables']} tablas ({result['skipped']} omitidas), "
+        f"{result['bytes'] / 1024:.0f} KiB en {time.perf_counter() - t0:.2f} s → {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
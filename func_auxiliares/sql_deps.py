@@ -0,0 +1,252 @@
+# func_auxiliares/sql_deps.py
+"""
+Análisis estático de las tablas que lee cada script o notebook.
+
+Recorre ``scripts/`` y ``notebooks/`` (``.py`` y celdas de código de
+``.ipynb``), extrae con ``ast`` las cadenas literales que parecen SQL y
+resuelve sus tablas preparando la consulta contra la base con un
+``set_authorizer`` de sqlite3: SQLite informa cada tabla que leería (vistas,
+CTE y subconsultas incluidas) sin ejecutar nada. Si la consulta no se puede
+preparar (f-strings con huecos, SQL inválido) se recurre a buscar nombres
+de tabla conocidos tras FROM/JOIN.
+
+Con eso arma el grafo script → tablas → imágenes (las imágenes salen del
+manifiesto de :mod:`func_auxiliares.chart_build`) y responde qué scripts
+dependen de un conjunto de tablas.
+
+Uso (desde la raíz del proyecto):
+    python -m func_auxiliares.sql_deps                         # grafo completo (JSON)
+    python -m func_auxiliares.sql_deps --changed pib_ramas     # scripts afectados
+"""
+import argparse
+import ast
+import json
+import logging
+import re
+import sqlite3
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from func_auxiliares.config import DB_PATH, PROJECT_ROOT
+from func_auxiliares.schema_catalog import get_schema_catalog
+from func_auxiliares.table_cache import resolve_db_file
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DIRS = (PROJECT_ROOT / "scripts", PROJECT_ROOT / "notebooks")
+
+_SQL_START = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_SQL_TABLE = re.compile(r"""\b(?:FROM|JOIN)\s+["'`\[]?([A-Za-z_][A-Za-z0-9_]*)""", re.IGNORECASE)
+_HOLE = "__hueco__"
+
+
+@dataclass
+class ScriptDeps:
+    """Dependencias de un script o notebook."""
+    path: str                                              # relativo a PROJECT_ROOT
+    tables: List[str] = field(default_factory=list)
+    sql: List[str] = field(default_factory=list)           # consultas literales encontradas
+    dynamic: bool = False                                  # SQL con partes no literales
+    outputs: List[str] = field(default_factory=list)       # imágenes (del manifiesto)
+
+
+def _code_of(path: Path) -> str:
+    """Código Python de un .py o de las celdas de código de un .ipynb."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix != ".ipynb":
+        return text
+    cells = json.loads(text).get("cells", [])
+    lines: List[str] = []
+    for cell in cells:
+        if cell.get("cell_type") != "code":
+            continue
+        source = cell.get("source", "")
+        source = "".join(source) if isinstance(source, list) else source
+        # Magias y comandos de shell no son Python
+        lines.extend(l for l in source.splitlines() if not l.lstrip().startswith(("%", "!")))
+    return "\n".join(lines)
+
+
+def sql_strings(code: str) -> List[tuple]:
+    """
+    Cadenas de ``code`` que empiezan como SQL.
+
+    Returns
+    -------
+    Lista de ``(sql, dinamica)``; en las f-strings cada hueco ``{...}`` se
+    reemplaza por un marcador y ``dinamica`` es True.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return []
+    found = []
+    fstring_parts: Set[int] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                fstring_parts.add(id(value))
+                if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                    parts.append(value.value)
+                else:
+                    parts.append(_HOLE)
+            text = "".join(parts)
+            if _SQL_START.match(text):
+                found.append((text, _HOLE in text))
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Constant) and isinstance(node.value, str)
+                and id(node) not in fstring_parts and _SQL_START.match(node.value)):
+            found.append((node.value, False))
+    return found
+
+
+class TableResolver:
+    """Resuelve las tablas de una consulta preparándola en SQLite."""
+
+    def __init__(self, db_path: str | Path = DB_PATH):
+        db_file = resolve_db_file(db_path)
+        self.known = get_schema_catalog(db_file).table_names()
+        self._by_lower = {name.lower(): name for name in self.known}
+        # Conexión propia: el autorizador no debe quedar en las del pool. Sin
+        # caché de sentencias, porque una sentencia reutilizada no se vuelve a
+        # preparar y el autorizador no vería sus lecturas.
+        self._conn = sqlite3.connect(f"{db_file.as_uri()}?mode=ro", uri=True, cached_statements=0)
+        self._reads: Set[str] = set()
+        self._conn.set_authorizer(self._authorize)
+
+    def _authorize(self, action, arg1, arg2, db_name, trigger):
+        if action == sqlite3.SQLITE_READ and arg1:
+            self._reads.add(arg1)
+        return sqlite3.SQLITE_OK
+
+    def tables(self, sql: str) -> List[str]:
+        """Tablas fuente que lee ``sql`` (nombres tal como están en la base)."""
+        self._reads = set()
+        if _HOLE not in sql:
+            try:
+                self._conn.execute(f"EXPLAIN {sql}")
+                return sorted({self._by_lower[t.lower()] for t in self._reads if t.lower() in self._by_lower})
+            except sqlite3.Error:
+                pass
+        return sorted({
+            self._by_lower[m.lower()] for m in _SQL_TABLE.findall(sql) if m.lower() in self._by_lower
+        })
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def analyze_file(path: Path, resolver: TableResolver) -> ScriptDeps:
+    """Dependencias de un archivo."""
+    deps = ScriptDeps(path.relative_to(PROJECT_ROOT).as_posix())
+    tables: Set[str] = set()
+    for sql, dynamic in sql_strings(_code_of(path)):
+        deps.sql.append(sql.strip())
+        deps.dynamic = deps.dynamic or dynamic
+        tables.update(resolver.tables(sql))
+    deps.tables = sorted(tables)
+    return deps
+
+
+def discover_sources(dirs: Iterable[Path] = SOURCE_DIRS) -> List[Path]:
+    """Archivos .py e .ipynb de ``dirs`` (sin checkpoints ni cachés)."""
+    files = []
+    for base in dirs:
+        for path in sorted(base.rglob("*")):
+            if path.suffix not in (".py", ".ipynb") or not path.is_file():
+                continue
+            if any(part in ("__pycache__", ".ipynb_checkpoints") for part in path.parts):
+                continue
+            files.append(path)
+    return files
+
+
+class DependencyGraph:
+    """Grafo script → tablas → imágenes."""
+
+    def __init__(self, scripts: Dict[str, ScriptDeps]):
+        self.scripts = scripts
+
+    def tables(self) -> Dict[str, List[str]]:
+        """Tabla → scripts que la leen."""
+        inverse: Dict[str, List[str]] = {}
+        for path, deps in self.scripts.items():
+            for table in deps.tables:
+                inverse.setdefault(table, []).append(path)
+        return dict(sorted(inverse.items()))
+
+    def downstream(self, tables: Iterable[str]) -> List[str]:
+        """
+        Scripts que leen alguna de ``tables`` (sin distinguir mayúsculas).
+
+        Los que arman SQL dinámico se incluyen siempre: no se sabe qué leen.
+        """
+        wanted = {t.lower() for t in tables}
+        return sorted(
+            path for path, deps in self.scripts.items()
+            if deps.dynamic or any(t.lower() in wanted for t in deps.tables)
+        )
+
+    def outputs(self, tables: Iterable[str]) -> List[str]:
+        """Imágenes producidas por los scripts que dependen de ``tables``."""
+        return sorted({out for path in self.downstream(tables) for out in self.scripts[path].outputs})
+
+    def to_dict(self) -> dict:
+        return {
+            "scripts": {path: asdict(deps) for path, deps in self.scripts.items()},
+            "tables": self.tables(),
+        }
+
+
+def build_graph(
+    paths: Optional[Sequence[Path]] = None,
+    db_path: str | Path = DB_PATH,
+    manifest: Optional[Dict[str, dict]] = None,
+) -> DependencyGraph:
+    """
+    Analiza ``paths`` (por defecto todo scripts/ y notebooks/).
+
+    ``manifest`` son las entradas de ``build_manifest.json``; si no se pasa
+    se lee el de chart_build para completar las imágenes de cada script.
+    """
+    if manifest is None:
+        # Import diferido: chart_build usa este módulo
+        from func_auxiliares.chart_build import load_manifest
+        manifest = load_manifest()
+
+    resolver = TableResolver(db_path)
+    try:
+        scripts = {}
+        for path in (paths if paths is not None else discover_sources()):
+            deps = analyze_file(path, resolver)
+            deps.outputs = list(manifest.get(deps.path, {}).get("outputs", []))
+            scripts[deps.path] = deps
+    finally:
+        resolver.close()
+    return DependencyGraph(scripts)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Dependencias script → tablas → imágenes")
+    parser.add_argument("--changed", nargs="+", metavar="TABLA", help="lista los scripts e imágenes afectados")
+    parser.add_argument("--output", type=Path, help="guarda el grafo en este JSON")
+    args = parser.parse_args(argv)
+
+    graph = build_graph()
+    if args.changed:
+        for path in graph.downstream(args.changed):
+            print(path)
+        for out in graph.outputs(args.changed):
+            print(f"  → {out}")
+        return
+    text = json.dumps(graph.to_dict(), ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
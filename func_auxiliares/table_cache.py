@@ -0,0 +1,188 @@
+# func_auxiliares/table_cache.py
+"""
+Caché en memoria, compartida por todo el proceso, para los DataFrames que
+devuelve ``get_df``.
+
+Las entradas se indexan por ``(SQL normalizado, ruta absoluta de la base)`` y
+guardan la firma del archivo SQLite (mtime + tamaño) con la que se leyeron.
+Si la base cambia en disco la firma deja de coincidir y la consulta se vuelve
+a ejecutar. La caché expulsa por LRU cuando se supera el número máximo de
+entradas o el presupuesto de bytes.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+#  ── Límites por defecto (se pueden sobreescribir con variables de entorno)
+DEFAULT_MAX_BYTES = int(os.environ.get("PROYECTOMACRO_CACHE_MAX_MB", "256")) * 1024 * 1024
+DEFAULT_MAX_ENTRIES = int(os.environ.get("PROYECTOMACRO_CACHE_MAX_ENTRIES", "512"))
+
+Signature = Tuple[int, int, int]
+CacheKey = Tuple[str, str]
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Colapsa espacios en blanco y elimina el ``;`` final de una consulta."""
+    return _WS_RE.sub(" ", sql).strip().rstrip(";").strip()
+
+
+def resolve_db_file(db_path: str | Path) -> Path:
+    """
+    Devuelve la ruta absoluta del archivo SQLite.
+
+    Acepta rutas simples y URIs ``file:...?mode=ro`` como las que reciben
+    ``validate_database`` y ``load_validated_tables``.
+    """
+    raw = str(db_path)
+    if raw.startswith("file:"):
+        raw = unquote(urlparse(raw).path)
+    return Path(raw).resolve()
+
+
+def db_signature(db_path: str | Path) -> Optional[Signature]:
+    """
+    Devuelve la firma ``(mtime_ns, tamaño, mtime_ns del -wal)`` de la base.
+
+    Devuelve ``None`` si el archivo no existe; en ese caso no se cachea nada.
+    """
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    try:
+        wal_mtime = os.stat(f"{db_path}-wal").st_mtime_ns
+    except OSError:
+        wal_mtime = 0
+    return (st.st_mtime_ns, st.st_size, wal_mtime)
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Memoria ocupada por ``df`` (incluye índice y objetos Python)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """
+    Hash SHA-256 del contenido de ``df``: nombres y tipos de columnas, índice
+    y valores. Dos lecturas de la misma tabla sin cambios dan el mismo hash.
+    """
+    h = hashlib.sha256()
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+    h.update(repr((df.index.name, str(df.index.dtype))).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+class TableCache:
+    """
+    Caché LRU de DataFrames con presupuesto de memoria.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memoria máxima total de los DataFrames guardados.
+    max_entries : int
+        Número máximo de consultas guardadas.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[Signature, pd.DataFrame, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(sql: str, db_path: str | Path) -> CacheKey:
+        return (normalize_sql(sql), str(resolve_db_file(db_path)))
+
+    def get_or_load(
+        self,
+        sql: str,
+        db_path: str | Path,
+        loader: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        Devuelve una copia del resultado cacheado de ``sql`` o lo carga con
+        ``loader`` si no existe o la base cambió desde la última lectura.
+        """
+        key = self.make_key(sql, db_path)
+        signature = db_signature(key[1])
+        if signature is None:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1].copy()
+            self.misses += 1
+
+        df = loader()
+        self._store(key, signature, df)
+        return df.copy()
+
+    def _store(self, key: CacheKey, signature: Signature, df: pd.DataFrame) -> None:
+        nbytes = frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            logger.debug("Consulta %r excede el presupuesto de la caché (%d bytes)", key[0], nbytes)
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (signature, df, nbytes)
+            self._bytes += nbytes
+            while self._entries and (
+                self._bytes > self.max_bytes or len(self._entries) > self.max_entries
+            ):
+                _, (_, _, freed) = self._entries.popitem(last=False)
+                self._bytes -= freed
+                self.evictions += 1
+
+    def invalidate(self, db_path: str | Path | None = None) -> None:
+        """Vacía la caché completa o sólo las entradas de ``db_path``."""
+        with self._lock:
+            if db_path is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            target = str(resolve_db_file(db_path))
+            for key in [k for k in self._entries if k[1] == target]:
+                self._bytes -= self._entries.pop(key)[2]
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de uso de la caché."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+# Instancia global compartida por get_df
+_table_cache = TableCache()
+
+
+def get_table_cache() -> TableCache:
+    """Devuelve la caché de tablas del proceso."""
+    return _table_cache
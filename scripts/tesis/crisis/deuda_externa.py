@@ -26,7 +26,7 @@ import matplotlib.pyplot as plt
 # sys.path.append(os.path.abspath('../'))
 
 from func_auxiliares.graficos_utils import (
-    get_df, set_style, init_base_plot,
+    get_df, set_style, render_windows,
     add_year_value_annotations
 )
 from func_auxiliares.config import DB_PATH, ASSETS_DIR, PERIODOS_PARA_CRISIS
@@ -105,39 +105,30 @@ annotation_offsets = {
 # ─────────────────────────────────────────────────────────────────────
 # Generación de gráficas por subperíodo de crisis
 # ─────────────────────────────────────────────────────────────────────
-for nombre, (ini, fin) in PERIODOS_PARA_CRISIS.items():
-    # Recorta al rango disponible en df
-    sub = df.loc[ini:fin]
-    if sub.empty:
-        continue  # salta si no hay datos en ese rango
-    #si sub tiene solo 3 datos
-    if len(sub) < 4:
-        print(f"Subperíodo {nombre} tiene menos de 3 datos, omitiendo.")
-        continue
-
-    # Calcula años a anotar: siempre ini/fin + extras dentro del rango
-    years_to_annot = list(sub.index)  # Aquí tomas los años directamente del índice del DataFrame
-
-    fig, ax = init_base_plot(
-        sub,
-        series=componentes,
-        colors=colors,
-        title=f"DEUDA EXTERNA ({nombre.upper()})",
-        xlabel="Año",
-        ylabel="Millones de USD",
-        source_text="Fuente: BCB / INE"
-    )
-
+# La figura se dibuja una vez; cada subperíodo sólo cambia límites, título y
+# anotaciones (se anotan todos los años del subperíodo). Los subperíodos con
+# menos de 4 datos se omiten.
+def anotar(ax, sub, nombre):
     add_year_value_annotations(
         ax,
         sub,
-        years_to_annot,
+        list(sub.index),
         cols_componentes,
         annotation_offsets,
         colors,
         arrow_lw=0.7
     )
 
-    fig.savefig(output_dir / f"deuda_externa_{nombre}.png")
-    plt.show()  # Muestra la gráfica en pantalla
-    plt.close(fig) 
+render_windows(
+    df,
+    series=componentes,
+    colors=colors,
+    title=lambda nombre: f"DEUDA EXTERNA ({nombre.upper()})",
+    xlabel="Año",
+    ylabel="Millones de USD",
+    windows=PERIODOS_PARA_CRISIS,
+    output=lambda nombre: output_dir / f"deuda_externa_{nombre}",
+    annotate=anotar,
+    min_points=4,
+    source_text="Fuente: BCB / INE"
+)
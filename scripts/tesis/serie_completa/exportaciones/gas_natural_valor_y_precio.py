@@ -54,7 +54,7 @@ colors = {"valor_musd": "#1f77b4", "precio_usd_MPC": "#d62728"}
 annot_years = adjust_annot_years(df, annot_years)
 
 cycles      = adjust_cycles(df, CYCLES)
-cycle_stats = {n: df.loc[s].mean().to_dict() for n, s in cycles.items()}
+cycle_stats = cycle_means(df, cycles)
 periodos    = adjust_periods(df, periodos_tasas)
 
 #modificaciones a los dicts
@@ -188,10 +188,7 @@ with sqlite3.connect("../../../../db/proyectomacro.db") as conn:
 # ── 2. Definición de ciclos y estadísticas ───────────────────────────
 annot_years_vol     = adjust_annot_years(df_vol, annot_years)
 cycles_vol      = adjust_cycles(df_vol, CYCLES)
-cycle_stats_vol = {
-    name: df_vol.loc[slice_].mean().to_dict()
-    for name, slice_ in cycles_vol.items()
-}
+cycle_stats_vol = cycle_means(df_vol, cycles_vol)
 
 # ── 3. Hitos, años clave y offsets ────────────────────────────────────
 hitos_offset = {yr: 0.88 for yr in hitos_v}
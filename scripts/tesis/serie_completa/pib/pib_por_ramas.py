@@ -63,10 +63,7 @@ abbr = {
 annot_years=adjust_annot_years(df,annot_years_sin_crisis)
 # Ciclos y estadísticas
 CYCLES_SIN_CRISIS = adjust_cycles(df, CYCLES_SIN_CRISIS)
-cycle_stats_sin_crisis = {
-    name: df.loc[period, cols_componentes].mean().to_dict()
-    for name, period in CYCLES_SIN_CRISIS.items()
-}
+cycle_stats_sin_crisis = cycle_means(df, CYCLES_SIN_CRISIS, cols_componentes)
 periodos_sin_crisis=adjust_periods(df,periodos_tasas_sin_crisis)
 # Colores personalizados
 custom_colors = {
@@ -190,10 +187,7 @@ plt.show()
 # Estadísticas de ciclos
 annot_years_periodos=adjust_annot_years(df,annot_years_periodos)
 CYCLES_PERIODOS=adjust_cycles(df,CYCLES_PERIODOS)
-cycle_stats_periodos = {
-    name: df.loc[period, cols_componentes].mean().to_dict()
-    for name, period in CYCLES_PERIODOS.items()
-}
+cycle_stats_periodos = cycle_means(df, CYCLES_PERIODOS, cols_componentes)
 periodos_periodos=adjust_periods(df,periodos_tasas_periodos)
 
 # ── Offsets ──────────────────────────────────────────────────────────
@@ -298,10 +292,7 @@ plt.show()
 # Estadísticas de ciclos
 annot_years=adjust_annot_years(df,annot_years)
 CYCLES=adjust_cycles(df,CYCLES)
-cycle_stats = {
-    name: df.loc[period, cols_componentes].mean().to_dict()
-    for name, period in CYCLES.items()
-}
+cycle_stats = cycle_means(df, CYCLES, cols_componentes)
 periodos=adjust_periods(df,periodos_tasas)
 
 # ── Offsets ──────────────────────────────────────────────────────────
@@ -14,6 +14,10 @@ setup(
         "plotly",
         # agregá lo que uses (e.g., sqlalchemy, pyyaml, etc.)
     ],
+    extras_require={
+        "imagenes": ["Pillow"],  # miniaturas de la galería (func_auxiliares.image_variants)
+        "documentos": ["pypdf"],  # texto de los PDF en la búsqueda (func_auxiliares.document_search)
+    },
     packages=find_packages(
         include=[
             "func_auxiliares",
@@ -2,6 +2,7 @@
 import dash
 import dash_bootstrap_components as dbc
 from dash import html, page_container, page_registry
+from func_auxiliares.asset_index import get_asset_index
 from func_auxiliares.config import ASSETS_DIR
 ########################################################################
 # 1. Crear la aplicación y habilitar Dash pages
@@ -15,6 +16,10 @@ app = dash.Dash(
 )
 server = app.server
 
+# Índice de imágenes de assets/: se arma una vez al arrancar y después se
+# refresca por sondeo de mtime (las galerías no listan carpetas)
+get_asset_index(ASSETS_DIR)
+
 ########################################################################
 # 2. Construir el sidebar con las SECCIONES PRINCIPALES
 #    (Inicio, Cuentas Nacionales, Sector Externo, Precios y Producción,
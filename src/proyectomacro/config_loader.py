@@ -75,6 +75,36 @@ class ConfigLoader:
                     }
         return None
     
+    def find_table_by_route(self, section_slug: str, table_slug: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca la tabla que corresponde a la URL /<section_slug>/<table_slug>.
+
+        La sección se identifica por su ``path``. La tabla se acepta por su clave
+        en pages.yml o por su nombre en la base (ambos con '_' → '-' y sin
+        distinguir mayúsculas), que son las dos formas de enlace que usa el
+        dashboard (p.ej. /cuentas-nacionales/pib-real-gasto y
+        /cuentas-nacionales/PIB-Real-Gasto).
+        Retorna: {"section_key": str, "section": dict, "table_key": str, "config": dict}
+        """
+        section_slug = (section_slug or "").strip("/").lower()
+        table_slug = (table_slug or "").strip("/").lower()
+        for section_key, section_data in self.get_sections().items():
+            if section_data.get("path", "").strip("/").lower() != section_slug:
+                continue
+            for table_key, table_config in section_data.get("tablas", {}).items():
+                aliases = {
+                    table_key.replace("_", "-").lower(),
+                    str(table_config.get("tabla", "")).replace("_", "-").lower(),
+                }
+                if table_slug in aliases:
+                    return {
+                        "section_key": section_key,
+                        "section": section_data,
+                        "table_key": table_key,
+                        "config": table_config,
+                    }
+        return None
+
     def get_metadata_for_table_id(self, table_id: str) -> Optional[Dict[str, Any]]:
         """
         Busca y retorna los metadatos de una tabla por su ID
@@ -101,3 +131,7 @@ def get_table_config(table_id: str) -> Optional[Dict[str, Any]]:
 def get_all_sections() -> Dict[str, Any]:
     """Función de conveniencia para obtener todas las secciones"""
     return config_loader.get_sections()
+
+def get_table_by_route(section_slug: str, table_slug: str) -> Optional[Dict[str, Any]]:
+    """Función de conveniencia para resolver la URL /<sección>/<tabla> de una página de detalle"""
+    return config_loader.find_table_by_route(section_slug, table_slug)
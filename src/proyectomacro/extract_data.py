@@ -1,67 +1,110 @@
 #src/proyectomacro/extract_data.py
-import os
-from validation.validate_all import validate_database
-import sqlite3
+import time
+from validation.cache import ValidationCache
+from validation.validate_all import list_tables, validate_frame
 import pandas as pd
-from func_auxiliares.config import ASSETS_DIR, DB_PATH
-from typing import Dict, List
+from func_auxiliares.asset_index import get_asset_index
+from func_auxiliares.config import DB_PATH
+from func_auxiliares.db_pool import get_pool
+from typing import Dict, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
-def load_validated_tables(db_path: str = str(DB_PATH)) -> dict[str, pd.DataFrame]:
-    # 1.1. Ejecutar la validación y obtener el DataFrame de resultados
-    results = validate_database(db_path)
+def load_tables_bulk(
+    db_path: str = str(DB_PATH),
+    use_cache: bool = True,
+) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Lee cada tabla de la base UNA sola vez, la valida en memoria y redondea
+    sus columnas numéricas. Con ``use_cache`` las tablas sin cambios reutilizan
+    el resultado guardado en la caché de validación.
 
-    # 1.2. Filtrar sólo las tablas con status "OK"
-    valid_tables = results.loc[results.status == "OK", "table"].tolist()
+    Devuelve ``(dfs, report)``:
+      - dfs: {tabla: DataFrame indexado por año} sólo con las tablas "OK".
+      - report: DataFrame con una fila por tabla y las columnas
+        ``table, status, error, warnings, cached, rows, load_s, validate_s``.
+    """
+    dfs: Dict[str, pd.DataFrame] = {}
+    rows: List[dict] = []
+    cache = ValidationCache.for_database(db_path) if use_cache else None
 
-    # 1.3. Conectar a la base y leer cada tabla validada en un DataFrame
-    conn = sqlite3.connect(db_path, uri=True)
-    dfs: dict[str, pd.DataFrame] = {}
-    for tbl in valid_tables:
-        try:
-            df = pd.read_sql(f"SELECT * FROM {tbl}", conn, index_col="año")
-            num_cols = df.select_dtypes(include="number").columns
-            df[num_cols] = df[num_cols].round(2)
-            dfs[tbl] = df
-        except Exception as e:
-            # log warning, no rompe toda la carga
-            logger.warning("No se pudo cargar tabla %s: %s", tbl, e)
-    conn.close()
+    with get_pool(db_path).connection() as conn:
+        for tbl in list_tables(conn):
+            # 1. Lectura única de la tabla
+            t0 = time.perf_counter()
+            try:
+                df = pd.read_sql(f"SELECT * FROM {tbl}", conn)
+            except Exception as e:
+                # log warning, no rompe toda la carga
+                logger.warning("No se pudo cargar tabla %s: %s", tbl, e)
+                rows.append({
+                    "table": tbl, "status": "ERROR", "error": str(e), "warnings": [],
+                    "cached": False, "rows": 0, "load_s": time.perf_counter() - t0, "validate_s": 0.0,
+                })
+                continue
+            load_s = time.perf_counter() - t0
 
-    return dfs
+            # 2. Validación sobre el DataFrame ya cargado
+            t1 = time.perf_counter()
+            result = validate_frame(df, tbl, cache)
+            validate_s = time.perf_counter() - t1
 
+            # 3. Indexar por año y redondear sólo las tablas válidas
+            if result["status"] == "OK":
+                if "año" in df.columns:
+                    df = df.set_index("año")
+                    num_cols = df.select_dtypes(include="number").columns
+                    df[num_cols] = df[num_cols].round(2)
+                    dfs[tbl] = df
+                else:
+                    logger.warning("No se pudo cargar tabla %s: falta la columna 'año'", tbl)
 
-def list_table_image_groups(table_id: str) -> Dict[str, List[str]]:
+            rows.append({
+                **result,
+                "rows": len(df),
+                "load_s": load_s,
+                "validate_s": validate_s,
+            })
+
+    report = pd.DataFrame(
+        rows,
+        columns=["table", "status", "error", "warnings", "cached", "rows", "load_s", "validate_s"],
+    )
+    return dfs, report
+
+
+def load_validated_tables(db_path: str = str(DB_PATH)) -> dict[str, pd.DataFrame]:
     """
-    Busca dentro de assets/ las subcarpetas relevantes para la tabla y devuelve
-    un dict {etiqueta: [nombres de png]}.
+    Devuelve ``{tabla: DataFrame}`` con las tablas que pasan la validación.
 
-    Convenciones:
-      - assets/serie_completa/<table_id>/ → "Serie completa"
-      - assets/crisis/<table_id>/         → "Crisis"
+    Usa :func:`load_tables_bulk` (una sola lectura por tabla) y registra en el
+    log el tiempo total de carga y de validación.
     """
-    groups: Dict[str, List[str]] = {
-        "Serie completa": [],
-        "Crisis": [],
-    }
+    dfs, report = load_tables_bulk(db_path)
+    logger.info(
+        "Tablas cargadas: %d/%d (carga %.3fs, validación %.3fs, %d desde caché)",
+        len(dfs), len(report), report["load_s"].sum(), report["validate_s"].sum(),
+        int(report["cached"].sum()),
+    )
+    return dfs
 
-    mapping = {
-        "Serie completa": ASSETS_DIR / "serie_completa" / table_id,
-        "Crisis": ASSETS_DIR / "crisis" / table_id,
-    }
 
-    for label, folder in mapping.items():
-        if folder.exists() and folder.is_dir():
-            imgs = sorted([
-                f for f in os.listdir(folder)
-                if f.lower().endswith((".png", ".jpg", ".jpeg"))
-            ])
-            groups[label] = imgs
+def list_table_image_groups(table_id: str) -> Dict[str, List[str]]:
+    """
+    Devuelve {etiqueta: [nombres de imagen]} de la tabla según el índice de
+    assets (:mod:`func_auxiliares.asset_index`), sin listar carpetas.
 
-    return groups
+    Convenciones (``GROUP_FOLDERS``):
+      - assets/tesis/serie_completa/<table_id>/ → "Serie completa"
+      - assets/tesis/crisis/<table_id>/         → "Crisis"
+    """
+    return {
+        label: [img.name for img in imgs]
+        for label, imgs in get_asset_index().groups(table_id).items()
+    }
 
 if __name__ == "__main__":
-    data_dict = load_validated_tables()
-    # Ejemplo: listar tablas cargadas
+    data_dict, timings = load_tables_bulk()
+    # Ejemplo: listar tablas cargadas y tiempos por tabla
     print("Tablas cargadas:", list(data_dict.keys()))
+    print(timings[["table", "status", "cached", "rows", "load_s", "validate_s"]].to_string(index=False))
@@ -1,13 +1,20 @@
 # page_factory.py
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 import dash
 import dash_bootstrap_components as dbc
-from dash import html, dash_table, get_asset_url
-from .extract_data import load_validated_tables, list_table_image_groups
+import pandas as pd
+from dash import html, dcc, dash_table, get_asset_url, callback, clientside_callback, Input, Output, State, MATCH
+from dash.exceptions import PreventUpdate
+from .extract_data import load_validated_tables
 from typing import Dict, List
-from .config_loader import get_table_metadata
+from .config_loader import get_table_metadata, get_table_by_route, get_table_config
+from func_auxiliares.asset_index import GROUP_FOLDERS, get_asset_index
+from func_auxiliares.config import DB_PATH
+from func_auxiliares.coverage_index import get_coverage_index
+from func_auxiliares.graficos_utils import get_df
+from func_auxiliares.image_variants import get_variants, smallest, srcset
 
 # ──────────────────────────────────────────────────────────────────────
 # Estilos predeterminados para tablas
@@ -30,6 +37,40 @@ DEFAULT_TABLE_STYLES = {
     },
 }
 
+# ──────────────────────────────────────────────────────────────────────
+# Paneles colapsables (metadatos, galería): ids con patrón + callback en el cliente
+# ──────────────────────────────────────────────────────────────────────
+COLLAPSE_TOGGLE = "collapse-toggle"
+COLLAPSE_PANEL = "collapse-panel"
+
+
+def collapse_ids(name: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Ids del botón y del Collapse de un panel colapsable.
+
+    Todos los paneles comparten un único callback MATCH que corre en el
+    navegador, así que abrir o cerrar un panel no hace ninguna petición al
+    servidor. ``name`` sólo tiene que ser único dentro de la página.
+
+    Returns
+    -------
+    (toggle_id, collapse_id)
+    """
+    return (
+        {"type": COLLAPSE_TOGGLE, "index": name},
+        {"type": COLLAPSE_PANEL, "index": name},
+    )
+
+
+clientside_callback(
+    "function(n_clicks, is_open) { return !is_open; }",
+    Output({"type": COLLAPSE_PANEL, "index": MATCH}, "is_open"),
+    Input({"type": COLLAPSE_TOGGLE, "index": MATCH}, "n_clicks"),
+    State({"type": COLLAPSE_PANEL, "index": MATCH}, "is_open"),
+    prevent_initial_call=True,
+)
+
+
 def get_table_styles(
     custom_styles: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Dict[str, Dict[str, Any]]:
@@ -75,6 +116,29 @@ def get_table_styles(
     
     return styles
 
+def load_table_data(table_id: str) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Carga una tabla para su página de detalle.
+
+    Se llama desde el ``layout`` de cada página, es decir en la primera visita
+    y no al importar el módulo. La lectura pasa por la caché de ``get_df``,
+    así que las visitas siguientes no tocan la base mientras ésta no cambie.
+
+    Returns
+    -------
+    (df, load_error)
+        DataFrame indexado por año (vacío si falló la carga) y el mensaje de
+        error o None.
+    """
+    try:
+        df = get_df(f"SELECT * FROM {table_id}", conn_str=str(DB_PATH))
+        if "año" in df.columns:
+            df = df.set_index("año").sort_index()
+    except Exception as e:
+        return pd.DataFrame(), str(e)
+    return df, None
+
+
 def build_section_cards(tablas: list[str], labels: dict[str,str], base_path: str, cols_per_row: dict = None):
     """
     Genera una lista de dbc.Col(dbc.Card) para una sección:
@@ -330,8 +394,8 @@ def build_header(
     title: str,
     desc: str,
     metadata: dict,
-    toggle_id: str = "btn-toggle-meta",
-    collapse_id: str = "meta-panel"
+    toggle_id: Optional[Dict[str, str]] = None,
+    collapse_id: Optional[Dict[str, str]] = None,
 ) -> html.Div:
     """
     Construye el bloque de título, subtítulo y metadatos colapsables.
@@ -344,15 +408,18 @@ def build_header(
         Subtítulo o descripción breve.
     metadata : dict
         Diccionario de metadatos que será pasado a build_metadata_panel().
-    toggle_id : str
-        ID para el botón que abre/cierra el panel.
-    collapse_id : str
+    toggle_id : dict, optional
+        ID para el botón que abre/cierra el panel (por defecto collapse_ids("meta")).
+    collapse_id : dict, optional
         ID para el componente Collapse del panel.
 
     Returns
     -------
     html.Div
     """
+    default_toggle, default_collapse = collapse_ids("meta")
+    toggle_id = toggle_id or default_toggle
+    collapse_id = collapse_id or default_collapse
 
     return html.Div(
         [
@@ -374,90 +441,176 @@ def build_header(
     )
 
 
+# ──────────────────────────────────────────────────────────────────────
+# Galería de imágenes: se arma recién cuando se abre el panel
+# ──────────────────────────────────────────────────────────────────────
+GALLERY_TABS = "gallery-tabs"
+GALLERY_BODY = "gallery-body"
+GALLERY_SPEC = "gallery-spec"
+
+# Ancho con que se muestra cada imagen de la galería (para elegir del srcset)
+GALLERY_IMG_SIZES = "(max-width: 1400px) 100vw, 1400px"
+
+
+def gallery_image(
+    asset_path: str,
+    alt: str,
+    className: str = "img-fluid rounded shadow-sm mb-2",
+    lazy: bool = False,
+):
+    """
+    Imagen de la galería a partir de su ruta relativa a assets/.
+
+    Si ``func_auxiliares.image_variants`` generó variantes para la imagen,
+    devuelve un ``<picture>`` con srcset WebP y PNG reducidos; si no, el
+    ``<img>`` del original. Con ``lazy`` las URLs van en ``data-src`` /
+    ``data-srcset`` y el callback de cliente de la galería las pasa a
+    ``src`` / ``srcset`` con ``loading="lazy"`` (html.Img no expone
+    ``loading``).
+    """
+    def src_props(src: Optional[str], srcset_value: Optional[str] = None) -> Dict[str, str]:
+        props = {"data-src" if lazy else "src": src} if src else {}
+        if srcset_value:
+            props["data-srcset" if lazy else "srcSet"] = srcset_value
+        return props
+
+    entry = get_variants(asset_path)
+    if entry is None:
+        # Con las dimensiones del índice el navegador reserva el alto antes de cargar
+        info = get_asset_index().image(asset_path)
+        size = {"width": info.width, "height": info.height} if info and info.width else {}
+        return html.Img(alt=alt, className=className, **size, **src_props(dash.get_asset_url(asset_path)))
+    fallback = smallest(entry, "png")
+    return html.Picture([
+        html.Source(
+            type="image/webp",
+            sizes=GALLERY_IMG_SIZES,
+            **src_props(None, srcset(entry, "webp", dash.get_asset_url)),
+        ),
+        html.Img(
+            sizes=GALLERY_IMG_SIZES,
+            width=entry["width"],
+            height=entry["height"],
+            alt=alt,
+            className=className,
+            **src_props(dash.get_asset_url(fallback["file"]), srcset(entry, "png", dash.get_asset_url)),
+        ),
+    ])
+
+
+def _gallery_folder(label: str) -> str:
+    """Mapea la etiqueta del grupo a la carpeta dentro de assets/."""
+    if label in GROUP_FOLDERS:
+        return GROUP_FOLDERS[label]
+    low = label.strip().lower()
+    if "serie" in low and "completa" in low:
+        return "serie_completa"
+    if "crisis" in low:
+        return "crisis"
+    # fallback: slugify simple
+    return low.replace(" ", "_")
+
+
+def build_gallery_group(label: str, imgs: List[str], table_id: str, lazy: bool = True):
+    """
+    Imágenes de un grupo de la galería, cada una con su botón 'Descargar'.
+
+    ``imgs`` son rutas relativas a assets/ (las del índice de assets); un
+    nombre sin carpeta se busca en ``<carpeta del grupo>/<table_id>/``.
+    """
+    if not imgs:
+        return html.P("No hay imágenes disponibles.", className="text-muted")
+    rows = []
+    for img in imgs:
+        asset_path = img if "/" in img else f"{_gallery_folder(label)}/{table_id}/{img}"
+        name = asset_path.rsplit("/", 1)[-1]
+        rows.append(
+            dbc.Row(
+                [
+                    dbc.Col(
+                        gallery_image(asset_path, alt=f"{label} – {name}", lazy=lazy),
+                        width=12,
+                    ),
+                    dbc.Col(
+                        html.A(
+                            "Descargar",
+                            href=dash.get_asset_url(asset_path),
+                            download=name,
+                            target="_blank",
+                            className="btn btn-primary mb-4",
+                        ),
+                        width="auto",
+                    ),
+                ],
+                className="align-items-center",
+            )
+        )
+    return html.Div(rows)
+
+
 def build_image_gallery_card(
     groups: Dict[str, List[str]],
     table_id: str,
     title: str = "Galería de imágenes",
     initially_open: bool = False,
-    toggle_id: str = "btn-toggle-img",
-    collapse_id: str = "img-panel",
+    toggle_id: Optional[Dict[str, str]] = None,
+    collapse_id: Optional[Dict[str, str]] = None,
 ) -> dbc.Card:
     """
     Devuelve una Card con Header (título + botón mostrar/ocultar) y un Collapse
-    que contiene Tabs con las imágenes. Cada tab renderiza la lista de imágenes
-    del grupo; cada imagen tiene un botón 'Descargar'.
+    que contiene Tabs con las imágenes. Cada tab muestra las imágenes del grupo
+    (miniaturas con srcset si hay variantes generadas); cada imagen tiene un
+    botón 'Descargar' que apunta al original en resolución completa.
+
+    El layout sólo lleva la lista de archivos: las imágenes de la tab activa
+    las arma un callback cuando el panel está abierto (la primera vez que se
+    abre y al cambiar de tab), con ``loading="lazy"``. Una página con la
+    galería cerrada no descarga ninguna imagen.
 
     Parámetros
     ----------
     groups : dict[str, list[str]]
-        Mapa { etiqueta_grupo: [ "img1.png", "img2.png", ... ] }.
+        Mapa { etiqueta_grupo: [ rutas relativas a assets/ ] }, como las da
+        ``get_asset_index().groups(table_id)``. También se aceptan nombres
+        sueltos ("img1.png"), que se buscan en /assets/<folder>/<table_id>/.
         Suele tener claves como "Serie completa" y/o "Crisis".
     table_id : str
-        Id de la tabla para resolver la ruta en /assets/<folder>/<table_id>/<img>.
+        Id de la tabla (para resolver los nombres sueltos).
     title : str
         Título a mostrar en el CardHeader.
     initially_open : bool
-        Si True, el Collapse arranca abierto.
-    toggle_id : str
-        ID del botón que abre/cierra el Collapse.
-    collapse_id : str
+        Si True, el Collapse arranca abierto (y la primera tab ya renderizada).
+    toggle_id : dict, opcional
+        ID del botón que abre/cierra el Collapse (por defecto collapse_ids("img")).
+    collapse_id : dict, opcional
         ID del Collapse.
 
     Retorna
     -------
     dbc.Card
     """
+    default_toggle, default_collapse = collapse_ids("img")
+    toggle_id = toggle_id or default_toggle
+    collapse_id = collapse_id or default_collapse
+    index = collapse_id["index"]
 
-    def _infer_folder(label: str) -> str:
-        """Mapea la etiqueta del grupo a la carpeta dentro de assets/."""
-        low = label.strip().lower()
-        if "serie" in low and "completa" in low:
-            return "serie_completa"
-        if "crisis" in low:
-            return "crisis"
-        # fallback: slugify simple
-        return low.replace(" ", "_")
-
-    # Construir Tabs (una por grupo)
-    tabs = []
-    for label, imgs in groups.items():
-        if not imgs:
-            content = html.P("No hay imágenes disponibles.", className="text-muted")
-        else:
-            rows = []
-            folder = _infer_folder(label)
-            for img in imgs:
-                asset_path = f"{folder}/{table_id}/{img}"  # relativo a assets/
-                src = dash.get_asset_url(asset_path)
-                rows.append(
-                    dbc.Row(
-                        [
-                            dbc.Col(
-                                html.Img(
-                                    src=src,
-                                    alt=f"{label} – {img}",
-                                    className="img-fluid rounded shadow-sm mb-2",
-                                ),
-                                width=12,
-                            ),
-                            dbc.Col(
-                                html.A(
-                                    "Descargar",
-                                    href=src,
-                                    download=img,
-                                    target="_blank",
-                                    className="btn btn-primary mb-4",
-                                ),
-                                width="auto",
-                            ),
-                        ],
-                        className="align-items-center",
-                    )
-                )
-            content = html.Div(rows)
-        tabs.append(dbc.Tab(content, label=label))
-
-    tabs_component = dbc.Tabs(tabs, id=f"{collapse_id}-tabs", className="mb-0")
+    # Una tab por grupo; el contenido va aparte, en el cuerpo de la galería
+    tab_ids = [f"grupo-{i}" for i in range(len(groups))]
+    tabs_component = dbc.Tabs(
+        [dbc.Tab(label=label, tab_id=tab_id) for label, tab_id in zip(groups, tab_ids)],
+        id={"type": GALLERY_TABS, "index": index},
+        active_tab=tab_ids[0] if tab_ids else None,
+        className="mb-3",
+    )
+    spec = {"table_id": table_id, "tabs": dict(zip(tab_ids, groups.items())), "loaded": None}
+    body = html.Div(
+        html.P("Cargando imágenes…", className="text-muted"),
+        id={"type": GALLERY_BODY, "index": index},
+    )
+    if initially_open and tab_ids:
+        label, imgs = spec["tabs"][tab_ids[0]]
+        body.children = build_gallery_group(label, imgs, table_id, lazy=False)
+        spec["loaded"] = tab_ids[0]
 
     return dbc.Card(
         [
@@ -480,7 +633,11 @@ def build_image_gallery_card(
                 )
             ),
             dbc.Collapse(
-                dbc.CardBody(tabs_component),
+                dbc.CardBody([
+                    tabs_component,
+                    body,
+                    dcc.Store(id={"type": GALLERY_SPEC, "index": index}, data=spec),
+                ]),
                 id=collapse_id,
                 is_open=initially_open,
             ),
@@ -488,11 +645,212 @@ def build_image_gallery_card(
         className="my-4 shadow-sm",
     )
 
+
+@callback(
+    Output({"type": GALLERY_BODY, "index": MATCH}, "children"),
+    Output({"type": GALLERY_SPEC, "index": MATCH}, "data"),
+    Input({"type": COLLAPSE_PANEL, "index": MATCH}, "is_open"),
+    Input({"type": GALLERY_TABS, "index": MATCH}, "active_tab"),
+    State({"type": GALLERY_SPEC, "index": MATCH}, "data"),
+)
+def render_gallery_tab(is_open, active_tab, spec):
+    """Arma las imágenes de la tab activa cuando el panel está abierto."""
+    if not is_open or not spec or active_tab not in spec["tabs"] or spec["loaded"] == active_tab:
+        raise PreventUpdate
+    label, imgs = spec["tabs"][active_tab]
+    return build_gallery_group(label, imgs, spec["table_id"]), {**spec, "loaded": active_tab}
+
+
+# Pasa data-src/data-srcset a src/srcset recién después de fijar loading="lazy":
+# así el navegador sólo descarga las imágenes que llegan a verse.
+clientside_callback(
+    """
+    function(children) {
+        window.requestAnimationFrame(function() {
+            document.querySelectorAll("img[data-src]").forEach(function(img) {
+                img.loading = "lazy";
+                img.decoding = "async";
+                var picture = img.parentElement;
+                if (picture && picture.tagName === "PICTURE") {
+                    picture.querySelectorAll("source[data-srcset]").forEach(function(source) {
+                        source.srcset = source.dataset.srcset;
+                        source.removeAttribute("data-srcset");
+                    });
+                }
+                if (img.dataset.srcset) {
+                    img.srcset = img.dataset.srcset;
+                    img.removeAttribute("data-srcset");
+                }
+                img.src = img.dataset.src;
+                img.removeAttribute("data-src");
+            });
+        });
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output({"type": GALLERY_BODY, "index": MATCH}, "className"),
+    Input({"type": GALLERY_BODY, "index": MATCH}, "children"),
+)
+
+def _to_records(df_reset: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Filas de ``df_reset`` como dicts con tipos compatibles con dash_table."""
+    data = []
+    for _, row in df_reset.iterrows():
+        row_dict = {}
+        for col in df_reset.columns:
+            value = row[col]
+            # Convertir a tipos compatible con dash_table
+            if pd.isna(value):
+                row_dict[str(col)] = None
+            elif isinstance(value, (int, float, str, bool)):
+                row_dict[str(col)] = value
+            else:
+                row_dict[str(col)] = str(value)
+        data.append(row_dict)
+    return data
+
+
+def _tooltips(data: List[Dict[str, Any]]) -> List[Dict[str, Dict[str, str]]]:
+    """Tooltips como texto plano para cada celda de ``data``."""
+    tooltip_data = []
+    for row_dict in data:
+        tooltip_row = {}
+        for col, value in row_dict.items():
+            tooltip_row[col] = {"value": str(value) if value is not None else "", "type": "text"}
+        tooltip_data.append(tooltip_row)
+    return tooltip_data
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Modo servidor de build_data_table (paginado, orden y filtro en el servidor)
+# ──────────────────────────────────────────────────────────────────────
+SERVER_TABLE = "server-data-table"
+
+# Las páginas de detalle pasan a modo servidor a partir de este número de filas
+SERVER_SIDE_MIN_ROWS = 500
+
+# Operadores de filter_query de dash_table, en el orden en que hay que probarlos
+_FILTER_OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "],
+]
+
+
+def _split_filter_part(filter_part: str) -> Tuple[Optional[str], Optional[str], Any]:
+    """Separa una condición ``{col} op valor`` en (columna, operador, valor)."""
+    for operator_type in _FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find("{") + 1: name_part.rfind("}")]
+
+                value_part = value_part.strip()
+                v0 = value_part[:1]
+                if v0 and v0 == value_part[-1] and v0 in ("'", '"', "`"):
+                    value = value_part[1:-1].replace("\\" + v0, v0)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+
+                # Se devuelve el primer operador de cada grupo (p.ej. "ge")
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+
+def filter_sort_page(
+    df_reset: pd.DataFrame,
+    page_current: int,
+    page_size: int,
+    sort_by: Optional[List[Dict[str, str]]] = None,
+    filter_query: Optional[str] = None,
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Aplica ``filter_query`` y ``sort_by`` de un DataTable a ``df_reset`` y
+    devuelve la página pedida junto con el número total de páginas.
+
+    Parameters
+    ----------
+    df_reset : pandas.DataFrame
+        Tabla completa con el índice como columna (``df.reset_index()``).
+    page_current, page_size : int
+        Página (desde 0) y filas por página.
+    sort_by : list of dict, optional
+        Lista ``[{"column_id": ..., "direction": "asc"|"desc"}, ...]``.
+    filter_query : str, optional
+        Expresión de filtro de dash_table (condiciones unidas con `` && ``).
+
+    Returns
+    -------
+    (página, page_count)
+    """
+    dff = df_reset
+    for filter_part in (filter_query or "").split(" && "):
+        col_name, operator, value = _split_filter_part(filter_part)
+        if col_name not in dff.columns:
+            continue
+        col = dff[col_name]
+        if operator in ("eq", "ne", "lt", "le", "gt", "ge"):
+            dff = dff.loc[getattr(col, operator)(value)]
+        elif operator == "contains":
+            dff = dff.loc[col.astype(str).str.contains(str(value), regex=False)]
+        elif operator == "datestartswith":
+            dff = dff.loc[col.astype(str).str.startswith(str(value))]
+
+    if sort_by:
+        by = [s["column_id"] for s in sort_by if s["column_id"] in dff.columns]
+        if by:
+            dff = dff.sort_values(
+                by,
+                ascending=[s["direction"] == "asc" for s in sort_by if s["column_id"] in dff.columns],
+                inplace=False,
+            )
+
+    page_count = max(1, -(-len(dff) // page_size))
+    start = page_current * page_size
+    return dff.iloc[start: start + page_size], page_count
+
+
+@callback(
+    Output({"type": SERVER_TABLE, "index": MATCH}, "data"),
+    Output({"type": SERVER_TABLE, "index": MATCH}, "tooltip_data"),
+    Output({"type": SERVER_TABLE, "index": MATCH}, "page_count"),
+    Input({"type": SERVER_TABLE, "index": MATCH}, "page_current"),
+    Input({"type": SERVER_TABLE, "index": MATCH}, "page_size"),
+    Input({"type": SERVER_TABLE, "index": MATCH}, "sort_by"),
+    Input({"type": SERVER_TABLE, "index": MATCH}, "filter_query"),
+    State({"type": SERVER_TABLE, "index": MATCH}, "id"),
+    prevent_initial_call=True,
+)
+def update_server_table(page_current, page_size, sort_by, filter_query, component_id):
+    """Entrega sólo la página visible de una tabla en modo servidor."""
+    table_id = component_id["index"]
+    # Sólo tablas declaradas en pages.yml: el id llega desde el navegador
+    if get_table_config(table_id) is None:
+        raise PreventUpdate
+    df, load_error = load_table_data(table_id)   # servido por la caché de get_df
+    if load_error:
+        raise PreventUpdate
+    page, page_count = filter_sort_page(
+        df.reset_index(), page_current or 0, page_size, sort_by, filter_query
+    )
+    data = _to_records(page)
+    return data, _tooltips(data), page_count
+
+
 def build_data_table(
     df,
     table_id: str,
     table_styles: Optional[Dict[str, Any]] = None,
-    page_size: int = 10
+    page_size: int = 10,
+    server_side: bool = False,
 ):
     """
     Genera un componente DataTable estandarizado para cualquier tabla.
@@ -508,13 +866,18 @@ def build_data_table(
         Estructura esperada: {"style_table": {...}, "style_cell": {...}, "style_header": {...}}
     page_size : int, opcional
         Número de filas por página (por defecto 10).
+    server_side : bool, opcional
+        Si True, paginado, orden y filtro se resuelven en el servidor
+        (``page_action="custom"``): el layout sólo lleva la primera página y
+        ``update_server_table`` envía cada página visible. ``table_id`` debe
+        ser una tabla de pages.yml, porque el callback la relee con
+        ``load_table_data``. El id pasa a ser
+        ``{"type": SERVER_TABLE, "index": table_id}``.
 
     Retorna
     -------
     dash_table.DataTable
     """
-    import pandas as pd
-    
     # Validar que el DataFrame sea válido
     if not isinstance(df, pd.DataFrame):
         raise TypeError("df debe ser un pandas.DataFrame")
@@ -544,51 +907,53 @@ def build_data_table(
     
     # Preparar datos y columnas (llamar reset_index una sola vez)
     df_reset = df.reset_index()
-    
-    # Convertir datos asegurando tipos compatibles
-    data = []
-    for _, row in df_reset.iterrows():
-        row_dict = {}
-        for col in df_reset.columns:
-            value = row[col]
-            # Convertir a tipos compatible con dash_table
-            if pd.isna(value):
-                row_dict[str(col)] = None
-            elif isinstance(value, (int, float, str, bool)):
-                row_dict[str(col)] = value
-            else:
-                row_dict[str(col)] = str(value)
-        data.append(row_dict)
-    
+
+    if server_side:
+        # Sólo la primera página viaja con el layout
+        first_page, page_count = filter_sort_page(df_reset, 0, page_size)
+        data = _to_records(first_page)
+        mode_kwargs = dict(
+            id={"type": SERVER_TABLE, "index": table_id},
+            page_current=0,
+            page_count=page_count,
+            page_action="custom",
+            filter_action="custom",
+            filter_query="",
+            sort_action="custom",
+            sort_by=[],
+            # La exportación CSV de dash_table sólo cubre la página recibida
+            export_format="none",
+        )
+    else:
+        data = _to_records(df_reset)
+        mode_kwargs = dict(
+            id=f"{table_id}-table",
+            page_action="native",
+            filter_action="native",
+            sort_action="native",
+            export_format="csv",
+            export_headers="display",
+            virtualization=True,
+        )
+
     # Preparar columnas
     columns = [{"name": str(c), "id": str(c)} for c in df_reset.columns]
     
     # Tooltips como texto plano
-    tooltip_data = []
-    for row_dict in data:
-        tooltip_row = {}
-        for col, value in row_dict.items():
-            tooltip_row[col] = {"value": str(value) if value is not None else "", "type": "text"}
-        tooltip_data.append(tooltip_row)
+    tooltip_data = _tooltips(data)
     
     # Determinar la columna del índice para el estilo condicional
     index_column = str(df.index.name) if df.index.name else str(df_reset.columns[0])
     
     return dash_table.DataTable(
-        id=f"{table_id}-table",
         data=data,
         columns=columns,
         page_size=page_size,
-        page_action="native",
-        filter_action="native",
-        sort_action="native",
         sort_mode="multi",
-        export_format="csv",
-        export_headers="display",
-        virtualization=True,
         fixed_rows={"headers": True},
         tooltip_data=tooltip_data,
         tooltip_duration=None,
+        **mode_kwargs,
         # Estilos personalizados
         **table_styles,
         # Style_conditional para filas y celdas específicas
@@ -598,4 +963,137 @@ def build_data_table(
         style_cell_conditional=[
             {"if": {"column_id": index_column}, "text-align": "left", "font-weight": "600"},
         ],
-    ) 
\ No newline at end of file
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Página de detalle genérica (/<sección>/<tabla>) construida desde pages.yml
+# ──────────────────────────────────────────────────────────────────────
+# Campos opcionales por tabla en pages.yml (si faltan se usan los valores por defecto):
+#   titulo      → título de la pestaña y del encabezado (por defecto: label)
+#   encabezado  → título del encabezado si difiere de 'titulo'
+#   breadcrumb  → texto del último breadcrumb (por defecto: titulo recortado)
+#   pie         → texto del pie de página
+#   page_size   → filas por página de la tabla (por defecto: 10)
+# Y por sección:
+#   pagina      → ruta de la página de la sección si difiere de 'path'
+
+def _short_label(text: str, max_len: int = 30) -> str:
+    """Recorta ``text`` para el breadcrumb ("..." si supera ``max_len``)."""
+    return text if len(text) <= max_len else text[:max_len] + "..."
+
+
+def table_page_title(seccion: Optional[str] = None, tabla: Optional[str] = None, **kwargs) -> str:
+    """
+    Título de la pestaña para la URL /<seccion>/<tabla>.
+
+    Se registra como ``title`` de la página genérica; Dash lo llama con las
+    variables de la ruta.
+    """
+    info = get_table_by_route(seccion, tabla)
+    if info is None:
+        return "Tabla no encontrada"
+    cfg = info["config"]
+    return cfg.get("titulo", cfg["label"])
+
+
+def build_table_not_found(seccion: Optional[str], tabla: Optional[str]) -> dbc.Container:
+    """Contenido para una URL /<seccion>/<tabla> que no existe en pages.yml."""
+    return dbc.Container([
+        html.H2("Tabla no encontrada"),
+        html.P(f"No existe la página /{seccion}/{tabla}.", className="text-muted"),
+        dbc.Button("Volver al inicio", href="/", color="primary", size="sm"),
+    ], fluid=True, className="pt-2")
+
+
+def build_table_page(seccion: Optional[str], tabla: Optional[str]) -> dbc.Container:
+    """
+    Construye la página de detalle de una tabla a partir de su entrada en pages.yml.
+
+    Parameters
+    ----------
+    seccion : str
+        Ruta de la sección sin "/" (p.ej. "cuentas-nacionales").
+    tabla : str
+        Clave o nombre de la tabla con '-' en lugar de '_' (p.ej. "pib-ramas").
+
+    Returns
+    -------
+    dbc.Container
+        Breadcrumb, encabezado con metadatos, galería, tabla de datos y pie.
+        Los paneles colapsables usan los ids por defecto de collapse_ids y
+        se abren con el callback de cliente de este módulo.
+    """
+    info = get_table_by_route(seccion, tabla)
+    if info is None:
+        return build_table_not_found(seccion, tabla)
+
+    section = info["section"]
+    cfg = info["config"]
+    table_id = cfg["tabla"]
+    title = cfg.get("titulo", cfg["label"])
+
+    # 1. Carga de datos segura (vía la caché de get_df)
+    df, load_error = load_table_data(table_id)
+
+    # Rutas relativas a assets/ desde el índice en memoria (sin listar carpetas)
+    images = {
+        label: [img.path for img in imgs] if not df.empty else []
+        for label, imgs in get_asset_index().groups(table_id).items()
+    }
+
+    # 2. Metadatos desde pages.yml (o valores por defecto)
+    metadata = load_metadata_from_config(table_id)
+    if metadata is None:
+        metadata = {
+            "Nombre descriptivo": title,
+            "Período": "N/A",
+            "Unidad": "N/A",
+            "Fuente": ["Pendiente de configuración"],
+            "Estado de validación": "⚠️ Sin metadatos",
+            "Notas": ["Metadatos pendientes de configuración en pages.yml"]
+        }
+
+    # El período sale de los datos (índice de cobertura), no del texto de pages.yml
+    coverage = get_coverage_index(DB_PATH).table(table_id) if not df.empty else None
+    if coverage is not None and coverage.first_year is not None:
+        metadata["Período"] = f"{coverage.first_year} – {coverage.last_year}"
+
+    # 3. Layout
+    return dbc.Container([
+        build_breadcrumb(
+            crumbs=[
+                {"label": "Inicio", "href": "/"},
+                {"label": section["name"], "href": section.get("pagina", section["path"])},
+                {"label": cfg.get("breadcrumb", _short_label(title)), "active": True},
+            ],
+            status=metadata["Estado de validación"],
+            badge_success_marker="✅"
+        ),
+
+        build_header(
+            title=cfg.get("encabezado", title),
+            desc=metadata["Nombre descriptivo"],
+            metadata=metadata,
+        ),
+
+        dbc.Alert(f"Error cargando datos: {load_error}", color="danger") if load_error else None,
+
+        build_image_gallery_card(
+            groups=images,
+            table_id=table_id,
+            title="Galería de imágenes",
+            initially_open=False,
+        ),
+
+        build_data_table(
+            df,
+            table_id,
+            page_size=cfg.get("page_size", 10),
+            server_side=len(df) >= SERVER_SIDE_MIN_ROWS,
+        ),
+
+        html.Hr(),
+        html.Small(cfg.get("pie", f"Tabla: {table_id} – Última validación pendiente")),
+
+    ], fluid=True, className="pt-2")
@@ -7,9 +7,12 @@ import numpy as np
 from datetime import datetime
 
 from proyectomacro.extract_data import list_table_image_groups
-from proyectomacro.page_utils import build_breadcrumb, build_header, build_data_table, load_metadata_from_config
-from func_auxiliares.graficos_utils import get_df
+from proyectomacro.page_utils import build_breadcrumb, build_header, build_data_table, load_metadata_from_config, collapse_ids
+from func_auxiliares.graficos_utils import get_df, table_cycle_stats
 from func_auxiliares.config import DB_PATH
+from func_auxiliares.result_cache import ResultCache, data_version
+from func_auxiliares.schema_catalog import get_schema_catalog
+from func_auxiliares.coverage_index import get_coverage_index
 
 import plotly.graph_objects as go
 import plotly.express as px
@@ -23,31 +26,54 @@ dash.register_page(
     metadata={"section": "Herramientas"},
 )
 
+# Panel de metadatos: lo abre el callback de cliente compartido de page_utils
+CALC_META_TOGGLE, CALC_META_PANEL = collapse_ids("calc-meta")
+
 # ────────────────────────────────────────────────────────────────────────
 # Funciones auxiliares
 # ────────────────────────────────────────────────────────────────────────
 
 def get_available_tables():
-    """Obtener lista de tablas disponibles en la base de datos"""
+    """Obtener lista de tablas disponibles (desde el catálogo de esquema)"""
     try:
-        # Obtener lista de tablas desde la base de datos
-        query = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        tables_df = get_df(query, conn_str=str(DB_PATH))
-        return tables_df['name'].tolist()
+        return get_schema_catalog(DB_PATH).table_names()
     except Exception as e:
         print(f"Error obteniendo tablas: {e}")
         return []
 
 def get_table_columns(table_name):
-    """Obtener columnas de una tabla específica"""
+    """Obtener las columnas numéricas de una tabla, sin la columna de año"""
     try:
-        query = f"PRAGMA table_info({table_name})"
-        columns_df = get_df(query, conn_str=str(DB_PATH))
-        return columns_df['name'].tolist()
+        return get_schema_catalog(DB_PATH).numeric_columns(table_name)
     except Exception as e:
         print(f"Error obteniendo columnas de {table_name}: {e}")
         return []
 
+def year_slider_props(table_name=None, column=None, current=None):
+    """
+    Límites, marcas y valor del RangeSlider de años según la cobertura de
+    ``table_name`` en el catálogo o, si hay ``column``, los años con datos
+    válidos (no NaN, ≠ 0) de esa columna en el índice de cobertura. Sin datos
+    devuelve el rango por defecto 1950–2025.
+    """
+    bounds = None
+    if table_name:
+        col_cov = get_coverage_index(DB_PATH).column(table_name, column) if column else None
+        if col_cov is not None and col_cov.first_year is not None:
+            bounds = (col_cov.first_year, col_cov.last_year)
+        else:
+            bounds = get_schema_catalog(DB_PATH).year_bounds(table_name)
+    lo, hi = bounds or (1950, 2025)
+    step = 10 if hi - lo > 30 else 5
+    marks = {i: str(i) for i in range(lo - lo % step + step, hi + 1, step)}
+    marks.update({lo: str(lo), hi: str(hi)})
+    # Conservar la selección actual recortada al nuevo rango
+    v0, v1 = current if current else (2000, 2023)
+    v0, v1 = max(lo, v0), min(hi, v1)
+    if v0 > v1:
+        v0, v1 = lo, hi
+    return lo, hi, marks, [v0, v1]
+
 def calculate_growth_rates(df, column, method='anual', periods=1):
     """
     Calcular tasas de crecimiento para una serie temporal
@@ -156,8 +182,8 @@ def layout(**kwargs):
         title="🧮 Calculadora Macroeconómica",
         desc="Herramienta para cálculos personalizados de tasas de crecimiento y medias estadísticas",
         metadata=metadata,
-        toggle_id="calc-btn-toggle-meta",
-        collapse_id="calc-meta-panel"
+        toggle_id=CALC_META_TOGGLE,
+        collapse_id=CALC_META_PANEL
     )
     
     return html.Div([
@@ -316,15 +342,6 @@ def layout(**kwargs):
 # Callbacks
 # ────────────────────────────────────────────────────────────────────────
 
-@callback(
-    Output("calc-meta-panel", "is_open"),
-    Input("calc-btn-toggle-meta", "n_clicks"),
-    State("calc-meta-panel", "is_open"),
-    prevent_initial_call=True,
-)
-def toggle_meta(n_clicks, is_open):
-    return not is_open
-
 @callback(
     Output("calc-column-dropdown", "options"),
     Output("calc-column-dropdown", "value"),
@@ -335,13 +352,25 @@ def update_column_options(selected_table):
     if not selected_table:
         return [], None
     
-    columns = get_table_columns(selected_table)
-    # Filtrar columnas numéricas típicas (excluir año que suele ser índice)
-    numeric_columns = [col for col in columns if col.lower() not in ['año', 'year', 'fecha', 'date']]
+    # Columnas numéricas desde el catálogo (sin la columna de año)
+    numeric_columns = get_table_columns(selected_table)
     
     options = [{"label": col, "value": col} for col in numeric_columns]
     return options, None
 
+@callback(
+    Output("calc-year-range", "min"),
+    Output("calc-year-range", "max"),
+    Output("calc-year-range", "marks"),
+    Output("calc-year-range", "value"),
+    Input("calc-table-dropdown", "value"),
+    Input("calc-column-dropdown", "value"),
+    State("calc-year-range", "value"),
+    prevent_initial_call=True
+)
+def update_year_range(selected_table, selected_column, current):
+    return year_slider_props(selected_table, selected_column, current)
+
 @callback(
     Output("calc-mean-window", "disabled"),
     Input("calc-mean-method", "value"),
@@ -350,6 +379,275 @@ def update_column_options(selected_table):
 def toggle_mean_window(mean_method):
     return mean_method != "movil"
 
+# ────────────────────────────────────────────────────────────────────────
+# Cálculo y gráficos (memoizados)
+# ────────────────────────────────────────────────────────────────────────
+# Los resultados se comparten entre peticiones y usuarios: la clave incluye
+# la versión de la base (data_version), así que un cambio en los datos los
+# invalida sin esperar al TTL. También hacen de almacén del lado del servidor:
+# calc-data-store sólo lleva los parámetros normalizados del cálculo.
+_results_cache = ResultCache()
+_plots_cache = ResultCache()
+
+
+def calc_params(table, column, year_range, growth_method, growth_periods, mean_method, mean_window):
+    """Parámetros normalizados (y hashables) de un cálculo."""
+    return (
+        table,
+        column,
+        tuple(year_range) if year_range else None,
+        growth_method,
+        growth_periods,
+        mean_method,
+        mean_window if mean_method == "movil" else None,
+    )
+
+
+def compute_results(table, column, year_range, growth_method, growth_periods, mean_method, mean_window):
+    """
+    Ejecuta el cálculo de la calculadora.
+
+    Returns
+    -------
+    (results_df, stats) o None si la columna no existe en la tabla.
+    """
+    # Cargar datos
+    query = f"SELECT * FROM {table}"
+    df = get_df(query, conn_str=str(DB_PATH))
+
+    # Filtrar por años si hay columna año
+    if 'año' in df.columns:
+        df = df.set_index('año')
+        df = df.loc[year_range[0]:year_range[1]]
+
+    if column not in df.columns:
+        return None
+
+    # Calcular tasas de crecimiento
+    growth_rates = calculate_growth_rates(df, column, growth_method, growth_periods)
+
+    # Calcular medias
+    if mean_method == "movil":
+        mean_result = calculate_means(df, column, mean_method, mean_window)
+    else:
+        mean_result = calculate_means(df, column, mean_method)
+
+    # Preparar resultados
+    results_df = pd.DataFrame({
+        'Año': df.index,
+        f'{column}': df[column],
+        f'Tasa_Crecimiento_{growth_method}': growth_rates
+    })
+
+    if isinstance(mean_result, pd.Series):
+        results_df[f'Media_{mean_method}'] = mean_result
+
+    # Estadísticas resumen
+    stats = {
+        'Media Original': df[column].mean(),
+        'Desviación Estándar': df[column].std(),
+        'Mínimo': df[column].min(),
+        'Máximo': df[column].max(),
+        'Tasa Crecimiento Promedio': growth_rates.mean(),
+        'Tasa Crecimiento Máxima': growth_rates.max(),
+        'Tasa Crecimiento Mínima': growth_rates.min()
+    }
+
+    if isinstance(mean_result, (int, float)):
+        stats[f'Media {mean_method}'] = mean_result
+
+    return results_df, stats
+
+
+def cycle_stats_table(table, column):
+    """
+    Media, CAGR, mínimo y máximo de ``column`` por ciclo (serie completa).
+
+    Sale de las estadísticas materializadas en la base cuando existen (ver
+    func_auxiliares.period_stats). Devuelve None si la tabla no es anual.
+    """
+    info = get_schema_catalog(DB_PATH).table(table)
+    if info is None or not info.has_year:
+        return None
+    try:
+        stats = table_cycle_stats(info.name, "ciclos", DB_PATH, [column])
+    except (KeyError, ValueError):
+        return None
+    cycles = list(dict.fromkeys(stats.index.get_level_values("ciclo")))
+    wide = stats[column].unstack("estadistica").reindex(cycles)[["mean", "cagr", "min", "max"]]
+    wide.columns = ["Media", "CAGR (%)", "Mínimo", "Máximo"]
+    wide.index.name = "Ciclo"
+    return wide.round(2)
+
+
+def build_results_content(results_df, stats, cycle_stats=None):
+    """Cards de estadísticas resumen, por ciclo y de resultados detallados."""
+    cycle_card = [] if cycle_stats is None else [
+        dbc.Card([
+            dbc.CardHeader([
+                html.H5("🔁 Estadísticas por Ciclo (serie completa)", className="mb-0")
+            ]),
+            dbc.CardBody([
+                build_data_table(cycle_stats, "calc-cycle-stats", page_size=10)
+            ])
+        ], className="mb-4")
+    ]
+    return [
+        # Card de estadísticas
+        dbc.Card([
+            dbc.CardHeader([
+                html.H5("📊 Estadísticas Resumen", className="mb-0")
+            ]),
+            dbc.CardBody([
+                dbc.Row([
+                    dbc.Col([
+                        html.P([
+                            html.Strong(f"{key}: "),
+                            f"{value:.2f}" if isinstance(value, (int, float)) else str(value)
+                        ]) for key, value in list(stats.items())[:4]
+                    ], width=6),
+                    dbc.Col([
+                        html.P([
+                            html.Strong(f"{key}: "),
+                            f"{value:.2f}%" if 'Tasa' in key and isinstance(value, (int, float)) else 
+                            f"{value:.2f}" if isinstance(value, (int, float)) else str(value)
+                        ]) for key, value in list(stats.items())[4:]
+                    ], width=6)
+                ])
+            ])
+        ], className="mb-4"),
+
+        *cycle_card,
+
+        # Card de tabla de resultados
+        dbc.Card([
+            dbc.CardHeader([
+                html.H5("📋 Resultados Detallados", className="mb-0")
+            ]),
+            dbc.CardBody([
+                build_data_table(
+                    results_df.set_index('Año'),
+                    "calc-results",
+                    page_size=15
+                )
+            ])
+        ])
+    ]
+
+
+def cached_results(params):
+    """
+    Resultado memoizado de ``params`` (ver calc_params).
+
+    Returns
+    -------
+    (results_content, results_df, stats) o None si la columna no existe.
+    """
+    def _compute():
+        computed = compute_results(*params)
+        if computed is None:
+            return None
+        results_df, stats = computed
+        cycle_stats = cycle_stats_table(params[0], params[1])
+        return build_results_content(results_df, stats, cycle_stats), results_df, stats
+
+    return _results_cache.get_or_compute((params, data_version(DB_PATH)), _compute)
+
+
+def build_plots_card(results_df, column):
+    """Card con el análisis gráfico 2x2 de un resultado."""
+    # Crear gráficos con subplots
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=[
+            f'Serie Original: {column}',
+            'Tasas de Crecimiento',
+            'Media Móvil (si aplica)',
+            'Distribución de Tasas'
+        ],
+        specs=[[{"secondary_y": False}, {"secondary_y": False}],
+               [{"secondary_y": False}, {"secondary_y": False}]]
+    )
+
+    # Gráfico 1: Serie original
+    fig.add_trace(
+        go.Scatter(
+            x=results_df['Año'],
+            y=results_df[column],
+            mode='lines+markers',
+            name=column,
+            line=dict(color='blue', width=2)
+        ),
+        row=1, col=1
+    )
+
+    # Gráfico 2: Tasas de crecimiento
+    growth_col = [col for col in results_df.columns if 'Tasa_Crecimiento' in col][0]
+    fig.add_trace(
+        go.Scatter(
+            x=results_df['Año'],
+            y=results_df[growth_col],
+            mode='lines+markers',
+            name='Tasa de Crecimiento',
+            line=dict(color='red', width=2)
+        ),
+        row=1, col=2
+    )
+
+    # Gráfico 3: Media móvil si existe
+    media_cols = [col for col in results_df.columns if 'Media_' in col]
+    if media_cols:
+        fig.add_trace(
+            go.Scatter(
+                x=results_df['Año'],
+                y=results_df[media_cols[0]],
+                mode='lines',
+                name='Media Calculada',
+                line=dict(color='green', width=2)
+            ),
+            row=2, col=1
+        )
+
+    # Gráfico 4: Histograma de tasas
+    fig.add_trace(
+        go.Histogram(
+            x=results_df[growth_col].dropna(),
+            name='Distribución Tasas',
+            marker_color='orange',
+            opacity=0.7
+        ),
+        row=2, col=2
+    )
+
+    fig.update_layout(
+        height=800,
+        showlegend=True,
+        title_text=f"Análisis Completo: {column}",
+        title_x=0.5
+    )
+
+    # Actualizar ejes usando update_layout
+    fig.update_layout(
+        xaxis_title="Año",
+        xaxis2_title="Año", 
+        xaxis3_title="Año",
+        xaxis4_title="Tasa de Crecimiento (%)",
+        yaxis_title=column,
+        yaxis2_title="Tasa (%)",
+        yaxis3_title="Media",
+        yaxis4_title="Frecuencia"
+    )
+
+    return dbc.Card([
+        dbc.CardHeader([
+            html.H5("📈 Análisis Gráfico", className="mb-0")
+        ]),
+        dbc.CardBody([
+            dcc.Graph(figure=fig, config={'displayModeBar': True})
+        ])
+    ], className="mt-4")
+
+
 @callback(
     Output("calc-results-area", "children"),
     Output("calc-data-store", "data"),
@@ -369,100 +667,15 @@ def calculate_results(n_clicks, table, column, year_range, growth_method, growth
         return html.Div(), {}, True
     
     try:
-        # Cargar datos
-        query = f"SELECT * FROM {table}"
-        df = get_df(query, conn_str=str(DB_PATH))
-        
-        # Filtrar por años si hay columna año
-        if 'año' in df.columns:
-            df = df.set_index('año')
-            df = df.loc[year_range[0]:year_range[1]]
-        
-        if column not in df.columns:
+        params = calc_params(table, column, year_range, growth_method, growth_periods, mean_method, mean_window)
+        cached = cached_results(params)
+        if cached is None:
             return dbc.Alert("Columna no encontrada en la tabla.", color="danger"), {}, True
+        results_content, results_df, stats = cached
         
-        # Calcular tasas de crecimiento
-        growth_rates = calculate_growth_rates(df, column, growth_method, growth_periods)
-        
-        # Calcular medias
-        if mean_method == "movil":
-            mean_result = calculate_means(df, column, mean_method, mean_window)
-        else:
-            mean_result = calculate_means(df, column, mean_method)
-        
-        # Preparar resultados
-        results_df = pd.DataFrame({
-            'Año': df.index,
-            f'{column}': df[column],
-            f'Tasa_Crecimiento_{growth_method}': growth_rates
-        })
-        
-        if isinstance(mean_result, pd.Series):
-            results_df[f'Media_{mean_method}'] = mean_result
-        
-        # Estadísticas resumen
-        stats = {
-            'Media Original': df[column].mean(),
-            'Desviación Estándar': df[column].std(),
-            'Mínimo': df[column].min(),
-            'Máximo': df[column].max(),
-            'Tasa Crecimiento Promedio': growth_rates.mean(),
-            'Tasa Crecimiento Máxima': growth_rates.max(),
-            'Tasa Crecimiento Mínima': growth_rates.min()
-        }
-        
-        if isinstance(mean_result, (int, float)):
-            stats[f'Media {mean_method}'] = mean_result
-        
-        # Crear cards con resultados
-        results_content = [
-            # Card de estadísticas
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H5("📊 Estadísticas Resumen", className="mb-0")
-                ]),
-                dbc.CardBody([
-                    dbc.Row([
-                        dbc.Col([
-                            html.P([
-                                html.Strong(f"{key}: "),
-                                f"{value:.2f}" if isinstance(value, (int, float)) else str(value)
-                            ]) for key, value in list(stats.items())[:4]
-                        ], width=6),
-                        dbc.Col([
-                            html.P([
-                                html.Strong(f"{key}: "),
-                                f"{value:.2f}%" if 'Tasa' in key and isinstance(value, (int, float)) else 
-                                f"{value:.2f}" if isinstance(value, (int, float)) else str(value)
-                            ]) for key, value in list(stats.items())[4:]
-                        ], width=6)
-                    ])
-                ])
-            ], className="mb-4"),
-            
-            # Card de tabla de resultados
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H5("📋 Resultados Detallados", className="mb-0")
-                ]),
-                dbc.CardBody([
-                    build_data_table(
-                        results_df.set_index('Año'),
-                        "calc-results",
-                        page_size=15
-                    )
-                ])
-            ])
-        ]
-        
-        # Preparar datos para store
-        store_data = {
-            'table': table,
-            'column': column,
-            'results_df': results_df.to_dict('records'),
-            'stats': stats,
-            'year_range': year_range
-        }
+        # El store sólo guarda la clave: los resultados quedan en el servidor
+        # (_results_cache) y create_plots los recupera o recalcula con ella
+        store_data = {'params': list(params)}
         
         return results_content, store_data, False
         
@@ -481,100 +694,16 @@ def create_plots(n_clicks, stored_data):
         return html.Div()
     
     try:
-        # Reconstruir DataFrame
-        results_df = pd.DataFrame(stored_data['results_df'])
-        column = stored_data['column']
-        
-        # Crear gráficos con subplots
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=[
-                f'Serie Original: {column}',
-                'Tasas de Crecimiento',
-                'Media Móvil (si aplica)',
-                'Distribución de Tasas'
-            ],
-            specs=[[{"secondary_y": False}, {"secondary_y": False}],
-                   [{"secondary_y": False}, {"secondary_y": False}]]
-        )
-        
-        # Gráfico 1: Serie original
-        fig.add_trace(
-            go.Scatter(
-                x=results_df['Año'],
-                y=results_df[column],
-                mode='lines+markers',
-                name=column,
-                line=dict(color='blue', width=2)
-            ),
-            row=1, col=1
-        )
-        
-        # Gráfico 2: Tasas de crecimiento
-        growth_col = [col for col in results_df.columns if 'Tasa_Crecimiento' in col][0]
-        fig.add_trace(
-            go.Scatter(
-                x=results_df['Año'],
-                y=results_df[growth_col],
-                mode='lines+markers',
-                name='Tasa de Crecimiento',
-                line=dict(color='red', width=2)
-            ),
-            row=1, col=2
-        )
-        
-        # Gráfico 3: Media móvil si existe
-        media_cols = [col for col in results_df.columns if 'Media_' in col]
-        if media_cols:
-            fig.add_trace(
-                go.Scatter(
-                    x=results_df['Año'],
-                    y=results_df[media_cols[0]],
-                    mode='lines',
-                    name='Media Calculada',
-                    line=dict(color='green', width=2)
-                ),
-                row=2, col=1
-            )
-        
-        # Gráfico 4: Histograma de tasas
-        fig.add_trace(
-            go.Histogram(
-                x=results_df[growth_col].dropna(),
-                name='Distribución Tasas',
-                marker_color='orange',
-                opacity=0.7
-            ),
-            row=2, col=2
-        )
-        
-        fig.update_layout(
-            height=800,
-            showlegend=True,
-            title_text=f"Análisis Completo: {column}",
-            title_x=0.5
-        )
-        
-        # Actualizar ejes usando update_layout
-        fig.update_layout(
-            xaxis_title="Año",
-            xaxis2_title="Año", 
-            xaxis3_title="Año",
-            xaxis4_title="Tasa de Crecimiento (%)",
-            yaxis_title=column,
-            yaxis2_title="Tasa (%)",
-            yaxis3_title="Media",
-            yaxis4_title="Frecuencia"
-        )
-        
-        return dbc.Card([
-            dbc.CardHeader([
-                html.H5("📈 Análisis Gráfico", className="mb-0")
-            ]),
-            dbc.CardBody([
-                dcc.Graph(figure=fig, config={'displayModeBar': True})
-            ])
-        ], className="mt-4")
+        params = calc_params(*stored_data['params'])
+
+        def _build():
+            # Si el resultado salió de la caché (TTL o LRU) se recalcula aquí
+            cached = cached_results(params)
+            if cached is None:
+                return dbc.Alert("Columna no encontrada en la tabla.", color="danger")
+            return build_plots_card(cached[1], params[1])
+
+        return _plots_cache.get_or_compute((params, data_version(DB_PATH)), _build)
         
     except Exception as e:
         return dbc.Alert(f"Error creando gráficos: {str(e)}", color="danger")
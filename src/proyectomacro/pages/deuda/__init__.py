@@ -1,4 +0,0 @@
-# src/proyectomacro/pages/deuda/__init__.py
-"""
-Páginas relacionadas con deuda
-"""
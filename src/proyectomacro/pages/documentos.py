@@ -1,16 +1,17 @@
 # src/proyectomacro/pages/documentos.py
-import os
 from datetime import datetime
 import dash
 from dash import html, dcc, callback, Input, Output
 import dash_bootstrap_components as dbc
-from pathlib import Path
+from func_auxiliares.config import DOCUMENTS_DIR
+from func_auxiliares.document_catalog import Document, get_document_catalog
+from func_auxiliares.document_search import get_document_search, highlight_segments
 
 # Registro de la página
 dash.register_page(__name__, name="Documentos", path="/documentos")
 
-# Directorio de documentos
-DOCUMENTS_DIR = Path(__file__).parent.parent.parent.parent / "reports" / "documents"
+# Segundos sin teclear antes de enviar la búsqueda al servidor
+SEARCH_DEBOUNCE_S = 0.3
 
 def get_file_icon(file_extension):
     """Devuelve el icono apropiado según la extensión del archivo"""
@@ -33,65 +34,18 @@ def get_file_icon(file_extension):
     }
     return icons.get(file_extension.lower(), '📁')
 
-def get_file_size(filepath):
-    """Devuelve el tamaño del archivo en formato legible"""
-    try:
-        size = os.path.getsize(filepath)
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
-    except:
-        return "N/A"
-
-def get_file_modified_date(filepath):
-    """Devuelve la fecha de modificación del archivo"""
-    try:
-        timestamp = os.path.getmtime(filepath)
-        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
-    except:
-        return "N/A"
-
-def scan_documents_directory():
-    """Escanea el directorio de documentos y devuelve una lista de archivos"""
-    documents = []
-    
-    if not DOCUMENTS_DIR.exists():
-        return documents
-    
-    for root, dirs, files in os.walk(DOCUMENTS_DIR):
-        for file in files:
-            filepath = Path(root) / file
-            relative_path = filepath.relative_to(DOCUMENTS_DIR)
-            
-            file_info = {
-                'name': file,
-                'path': str(relative_path),
-                'full_path': str(filepath),
-                'extension': filepath.suffix,
-                'icon': get_file_icon(filepath.suffix),
-                'size': get_file_size(filepath),
-                'modified': get_file_modified_date(filepath),
-                'category': get_file_category(filepath.suffix)
-            }
-            documents.append(file_info)
-    
-    return sorted(documents, key=lambda x: x['name'])
-
-def get_file_category(extension):
-    """Categoriza los archivos por tipo"""
-    categories = {
-        'Documentos': ['.pdf', '.docx', '.doc', '.txt', '.md', '.tex'],
-        'Hojas de Cálculo': ['.xlsx', '.xls', '.csv'],
-        'Imágenes': ['.png', '.jpg', '.jpeg', '.gif'],
-        'Archivos Comprimidos': ['.zip', '.rar'],
+def document_info(doc: Document) -> dict:
+    """Datos de un documento del catálogo tal como los muestra su tarjeta"""
+    return {
+        'name': doc.name,
+        'path': doc.path,
+        'full_path': str(DOCUMENTS_DIR / doc.path),
+        'extension': doc.extension,
+        'icon': get_file_icon(doc.extension),
+        'size': get_file_size_from_bytes(doc.size),
+        'modified': datetime.fromtimestamp(doc.mtime).strftime("%Y-%m-%d %H:%M"),
+        'category': doc.category,
     }
-    
-    for category, extensions in categories.items():
-        if extension.lower() in extensions:
-            return category
-    return 'Otros'
 
 def create_file_card(file_info):
     """Crea una tarjeta para mostrar información del archivo"""
@@ -118,20 +72,12 @@ def create_file_card(file_info):
 
 def create_documents_layout():
     """Crea el layout principal de la página de documentos"""
-    documents = scan_documents_directory()
+    catalog = get_document_catalog()
+    categories = catalog.categories()
     
-    # Agrupa documentos por categoría
-    categories = {}
-    for doc in documents:
-        category = doc['category']
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(doc)
-    
-    # Estadísticas generales
-    total_files = len(documents)
-    total_size = sum([os.path.getsize(doc['full_path']) if os.path.exists(doc['full_path']) else 0 for doc in documents])
-    total_size_str = get_file_size_from_bytes(total_size)
+    # Estadísticas generales (del índice en memoria)
+    total_files = len(catalog)
+    total_size_str = get_file_size_from_bytes(catalog.total_size())
     
     # Controles de filtrado
     category_options = [{"label": "Todas las categorías", "value": "all"}]
@@ -148,12 +94,13 @@ def create_documents_layout():
             )
         ], width=4),
         dbc.Col([
-            html.Label("Buscar archivo:", className="form-label"),
+            html.Label("Buscar:", className="form-label"),
             dcc.Input(
                 id="search-input",
                 type="text",
-                placeholder="Escriba el nombre del archivo...",
-                className="form-control"
+                placeholder="Nombre del archivo o palabras del contenido...",
+                className="form-control",
+                debounce=SEARCH_DEBOUNCE_S
             )
         ], width=4),
         dbc.Col([
@@ -222,6 +169,9 @@ def create_documents_layout():
         # Controles de filtrado
         filter_controls,
         
+        # Coincidencias en el texto de los documentos (índice FTS5)
+        html.Div(id="fulltext-results", className="mb-4"),
+        
         # Contenedor de documentos
         html.Div(id="documents-container"),
         
@@ -251,8 +201,8 @@ def get_file_size_from_bytes(size_bytes):
         size_bytes /= 1024.0
     return f"{size_bytes:.1f} TB"
 
-# Layout principal
-layout = create_documents_layout()
+# Layout principal (función: las estadísticas se leen del catálogo en cada visita)
+layout = create_documents_layout
 
 # Callback para filtrar y ordenar documentos
 @callback(
@@ -263,26 +213,11 @@ layout = create_documents_layout()
 )
 def update_documents_display(category_filter, search_term, sort_by):
     """Actualiza la visualización de documentos según los filtros"""
-    documents = scan_documents_directory()
-    
-    # Filtrar por categoría
-    if category_filter and category_filter != "all":
-        documents = [doc for doc in documents if doc['category'] == category_filter]
-    
-    # Filtrar por término de búsqueda
-    if search_term:
-        search_term = search_term.lower()
-        documents = [doc for doc in documents if search_term in doc['name'].lower()]
-    
-    # Ordenar
-    if sort_by == "name":
-        documents = sorted(documents, key=lambda x: x['name'].lower())
-    elif sort_by == "modified":
-        documents = sorted(documents, key=lambda x: x['modified'], reverse=True)
-    elif sort_by == "size":
-        documents = sorted(documents, key=lambda x: os.path.getsize(x['full_path']) if os.path.exists(x['full_path']) else 0, reverse=True)
-    elif sort_by == "extension":
-        documents = sorted(documents, key=lambda x: x['extension'])
+    # Filtro por categoría, búsqueda y orden se resuelven en el índice del catálogo
+    documents = [
+        document_info(doc)
+        for doc in get_document_catalog().search(search_term, category_filter, sort_by or "name")
+    ]
     
     if not documents:
         return dbc.Alert(
@@ -299,3 +234,35 @@ def update_documents_display(category_filter, search_term, sort_by):
         )
     
     return dbc.Row(cards)
+
+def create_fulltext_result(hit):
+    """Fila con la ruta del documento y el fragmento donde aparecen las palabras"""
+    snippet = [
+        html.Mark(text) if is_match else text
+        for text, is_match in highlight_segments(hit.snippet.replace("\n", " "))
+    ]
+    return dbc.ListGroupItem([
+        html.Div([
+            html.Span(get_file_icon(f".{hit.kind}"), className="me-2"),
+            html.Strong(hit.path),
+            dbc.Badge(hit.kind, color="secondary", className="ms-2"),
+        ]),
+        html.Small(snippet, className="text-muted"),
+    ])
+
+# Callback para la búsqueda de texto completo
+@callback(
+    Output("fulltext-results", "children"),
+    Input("search-input", "value")
+)
+def update_fulltext_results(search_term):
+    """Busca las palabras en el contenido de PDF, .tex, .md y hojas de Excel"""
+    if not search_term or not search_term.strip():
+        return None
+    hits = get_document_search().search(search_term)
+    if not hits:
+        return html.Small("Sin coincidencias en el contenido de los documentos.", className="text-muted")
+    return dbc.Card([
+        dbc.CardHeader(f"🔎 Coincidencias en el contenido ({len(hits)})"),
+        dbc.ListGroup([create_fulltext_result(hit) for hit in hits], flush=True),
+    ])
@@ -1,4 +0,0 @@
-# src/proyectomacro/pages/empleo/__init__.py
-"""
-Páginas relacionadas con empleo
-"""
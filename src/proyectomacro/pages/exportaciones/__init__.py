@@ -1,4 +0,0 @@
-# src/proyectomacro/pages/exportaciones/__init__.py
-"""
-Páginas relacionadas con exportaciones
-"""
@@ -1,4 +0,0 @@
-# src/proyectomacro/pages/importaciones/__init__.py
-"""
-Páginas relacionadas con importaciones
-"""
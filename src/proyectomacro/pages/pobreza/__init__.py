@@ -1,4 +0,0 @@
-# src/proyectomacro/pages/pobreza/__init__.py
-"""
-Páginas relacionadas con pobreza
-"""
@@ -1,4 +0,0 @@
-# src/proyectomacro/pages/precios_y_produccion/__init__.py
-"""
-Páginas relacionadas con precios y producción
-"""
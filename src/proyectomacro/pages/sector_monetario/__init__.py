@@ -1,4 +0,0 @@
-# src/proyectomacro/pages/sector_monetario/__init__.py
-"""
-Páginas relacionadas con el sector monetario
-"""
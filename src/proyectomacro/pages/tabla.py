@@ -0,0 +1,25 @@
+# src/proyectomacro/pages/tabla.py
+"""
+Página de detalle genérica para todas las tablas de pages.yml.
+
+Una sola ruta /<seccion>/<tabla> reemplaza a los módulos por tabla: el layout,
+el título y el breadcrumb se arman desde la configuración con
+page_utils.build_table_page. Los paneles colapsables usan el callback de
+cliente compartido de page_utils, así que este módulo no registra callbacks.
+"""
+import dash
+
+from proyectomacro.page_utils import build_table_page, table_page_title
+
+dash.register_page(
+    __name__,
+    path_template="/<seccion>/<tabla>",
+    name="Tabla",
+    title=table_page_title,
+)
+
+
+def layout(seccion=None, tabla=None, **kwargs):
+    """Construye la página en la primera visita (datos vía la caché de get_df)."""
+    return build_table_page(seccion, tabla)
+
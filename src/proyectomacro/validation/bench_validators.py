@@ -0,0 +1,128 @@
+# src/proyectomacro/validation/bench_validators.py
+"""
+Compara el motor vectorizado (CompiledRule) con la implementación anterior
+columna por columna: verifica que ambos den los mismos hallazgos y mide los
+tiempos sobre las tablas reales y sobre tablas sintéticas anchas.
+
+Uso (desde src/proyectomacro):
+    python -m validation.bench_validators
+"""
+
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from func_auxiliares.config import DB_PATH
+from func_auxiliares.db_pool import get_pool
+from .rules import TableRule, load_rules
+from .validate_all import list_tables
+from .validators import CompiledRule
+
+
+def _reference_checks(df: pd.DataFrame, table: str, rule: TableRule, warn: Callable[[str], None]) -> None:
+    """Chequeos 5-8 tal como estaban antes de vectorizar (referencia)."""
+    idx = df.index
+    if rule.check_no_nulls:
+        nulos = df[rule.value_cols].isnull().sum()
+        if nulos.any():
+            warn(f"{table}: nulos detectados {nulos[nulos>0].to_dict()}")
+
+    if rule.check_numeric:
+        non_num = [c for c in rule.value_cols if not is_numeric_dtype(df[c])]
+        if non_num:
+            raise TypeError(f"{table}: columnas no numéricas {non_num}")
+
+    if rule.check_gaps and len(idx) > 1:
+        dif = idx.to_series().diff().dropna()
+        mode_gap = dif.mode()[0] if not dif.mode().empty else None
+        if mode_gap is not None and (dif != mode_gap).any():
+            gaps = sorted(set(range(idx.min(), idx.max() + 1)) - set(idx))
+            warn(f"{table}: huecos en los años {gaps}")
+
+    if rule.check_outliers:
+        for col in rule.value_cols:
+            delta = df[col].diff().abs().dropna()
+            if delta.empty:
+                continue
+            thr = delta.std() * 4
+            outs = delta[delta > thr]
+            if not outs.empty:
+                warn(f"{table}: outliers en {col} años {outs.index.tolist()}")
+
+
+def _findings(check, df, table, rule) -> List[str]:
+    found: List[str] = []
+    try:
+        check(df, table, rule, found.append)
+    except Exception as exc:  # noqa: BLE001
+        found.append(f"ERROR {type(exc).__name__}: {exc}")
+    return found
+
+
+def _vectorized_checks(df, table, rule, warn) -> None:
+    CompiledRule.from_rule(rule).run(df, table, warn)
+
+
+def _timeit(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def synthetic_table(n_years: int, n_cols: int, seed: int = 0) -> Tuple[pd.DataFrame, TableRule]:
+    """Tabla anual con nulos, un hueco y saltos atípicos inyectados."""
+    rng = np.random.default_rng(seed)
+    years = np.arange(1900, 1900 + n_years + 1)
+    years = np.delete(years, n_years // 2)   # un hueco
+    values = rng.normal(100, 5, size=(len(years), n_cols)).cumsum(axis=0)
+    values[rng.random(values.shape) < 0.01] = np.nan
+    jumps = rng.random(values.shape) < 0.002
+    values[jumps] += 1_000
+    cols = [f"c{i}" for i in range(n_cols)]
+    df = pd.DataFrame(values, index=pd.Index(years, name="año"), columns=cols)
+    rule = TableRule(value_cols=cols, check_outliers=True)
+    return df, rule
+
+
+def main(repeat: int = 5) -> None:
+    rows = []
+
+    # 1. Tablas reales con sus reglas de rules.yml
+    rules = load_rules()
+    with get_pool(DB_PATH).connection() as conn:
+        tables = list_tables(conn)
+        frames = {t: pd.read_sql(f"SELECT * FROM {t}", conn) for t in tables}
+    mismatches = 0
+    for table, df in frames.items():
+        rule = rules.get(table, TableRule())
+        if rule.index not in df.columns:
+            continue
+        df = df.set_index(rule.index)
+        if _findings(_reference_checks, df, table, rule) != _findings(_vectorized_checks, df, table, rule):
+            mismatches += 1
+            print(f"Diferencia en {table}")
+    print(f"Tablas reales: {len(frames)} comparadas, {mismatches} diferencias")
+
+    # 2. Tablas sintéticas anchas
+    for n_years, n_cols in [(75, 10), (75, 200), (500, 200), (500, 2000)]:
+        df, rule = synthetic_table(n_years, n_cols)
+        same = _findings(_reference_checks, df, "sintetica", rule) == _findings(_vectorized_checks, df, "sintetica", rule)
+        t_ref = _timeit(lambda: _findings(_reference_checks, df, "sintetica", rule), repeat)
+        t_vec = _timeit(lambda: _findings(_vectorized_checks, df, "sintetica", rule), repeat)
+        rows.append({
+            "años": n_years, "columnas": n_cols, "iguales": same,
+            "referencia_ms": t_ref * 1e3, "vectorizado_ms": t_vec * 1e3,
+            "speedup": t_ref / t_vec,
+        })
+
+    print(pd.DataFrame(rows).round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
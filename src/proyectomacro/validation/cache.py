@@ -0,0 +1,117 @@
+"""Persistent cache of validation results keyed by table content and rule hashes."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from func_auxiliares.table_cache import resolve_db_file
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation_cache (
+    table_name        TEXT PRIMARY KEY,
+    content_hash      TEXT NOT NULL,
+    rule_hash         TEXT NOT NULL,
+    validator_version TEXT NOT NULL,
+    status            TEXT NOT NULL,
+    error             TEXT NOT NULL,
+    warnings          TEXT NOT NULL,
+    updated_at        REAL NOT NULL
+)
+"""
+
+
+def cache_path_for(db_path: str | Path) -> Path:
+    """Return the sidecar cache file for *db_path* (``<db>.validation_cache.db``)."""
+    db_file = resolve_db_file(db_path)
+    return db_file.with_name(f"{db_file.stem}.validation_cache.db")
+
+
+class ValidationCache:
+    """Sidecar SQLite store of validation results.
+
+    An entry is reused only when the table content hash, the hash of its
+    ``TableRule`` and the validator version all match the stored ones.
+    Every operation uses a short-lived connection, so the cache can be shared
+    by thread and process pools.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+        finally:
+            conn.close()
+
+    @classmethod
+    def for_database(cls, db_path: str | Path) -> "ValidationCache":
+        """Open the cache that lives next to *db_path*."""
+        return cls(cache_path_for(db_path))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(
+        self, table: str, content_hash: str, rule_hash: str, version: str
+    ) -> Optional[Dict[str, object]]:
+        """Return the cached result for *table* or ``None`` if it is stale or missing."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT status, error, warnings FROM validation_cache "
+                "WHERE table_name = ? AND content_hash = ? AND rule_hash = ? "
+                "AND validator_version = ?",
+                (table, content_hash, rule_hash, version),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        status, error, warnings = row
+        return {
+            "table": table,
+            "status": status,
+            "error": error,
+            "warnings": json.loads(warnings),
+        }
+
+    def put(
+        self,
+        result: Dict[str, object],
+        content_hash: str,
+        rule_hash: str,
+        version: str,
+    ) -> None:
+        """Store (or replace) the validation *result* of one table."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO validation_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        result["table"],
+                        content_hash,
+                        rule_hash,
+                        version,
+                        result["status"],
+                        result["error"],
+                        json.dumps(result["warnings"], ensure_ascii=False),
+                        time.time(),
+                    ),
+                )
+        finally:
+            conn.close()
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM validation_cache")
+        finally:
+            conn.close()
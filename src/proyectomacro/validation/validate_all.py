@@ -3,29 +3,40 @@
 from __future__ import annotations
 
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 from fpdf import FPDF
 
-from . import validators
-from .validators import validate_df
-from func_auxiliares.config import DB_PATH
+import logging
+
+from .cache import ValidationCache
+from .validators import VALIDATOR_VERSION, rule_digest, validate_df
+from func_auxiliares.config import DB_PATH, DERIVED_TABLES
+from func_auxiliares.db_pool import get_pool
+from func_auxiliares.table_cache import frame_digest
+
+logger = logging.getLogger(__name__)
 
 
 def list_tables(conn: sqlite3.Connection) -> List[str]:
-    """Return the list of tables in the SQLite database."""
+    """Return the list of source tables in the SQLite database.
+
+    Derived tables (``DERIVED_TABLES``) are generated from the others and are
+    not validated.
+    """
     query = (
         "SELECT name FROM sqlite_master WHERE type='table' "
         "AND name NOT LIKE 'sqlite_%'"
     )
     cursor = conn.execute(query)
-    return [row[0] for row in cursor.fetchall()]
+    return [row[0] for row in cursor.fetchall() if row[0] not in DERIVED_TABLES]
 
 
 def _capture_warnings() -> Tuple[List[str], Callable[[str], None]]:
-    """Temporarily capture warnings emitted by :func:`validate_df`."""
+    """Return a list and a collector that appends every warning to it."""
     captured: List[str] = []
 
     def collector(msg: str) -> None:
@@ -34,42 +45,100 @@ def _capture_warnings() -> Tuple[List[str], Callable[[str], None]]:
     return captured, collector
 
 
-def validate_table(conn: sqlite3.Connection, table: str) -> Dict[str, object]:
-    """Validate a single table and return the result dictionary."""
-    df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+def validate_frame(
+    df: pd.DataFrame,
+    table: str,
+    cache: Optional[ValidationCache] = None,
+) -> Dict[str, object]:
+    """Validate an already loaded *df* for *table* and return the result dictionary.
+
+    When *cache* is given, a stored result is reused if the table content,
+    its rule and the validator version are unchanged. The returned dict has
+    a ``cached`` flag telling whether the checks were skipped.
+    """
+    if cache is not None:
+        content_hash = frame_digest(df)
+        rule_hash = rule_digest(table)
+        hit = cache.get(table, content_hash, rule_hash, VALIDATOR_VERSION)
+        if hit is not None:
+            return {**hit, "cached": True}
 
     warnings, collector = _capture_warnings()
-    original = validators._warn
     try:
-        # monkey patch the warning function
-        validators._warn = collector  # type: ignore
-        validate_df(df, table)
+        validate_df(df, table, warn=collector)
         status = "OK"
         error = ""
     except Exception as exc:  # noqa: BLE001
         status = "ERROR"
         error = str(exc)
-    finally:
-        validators._warn = original  # type: ignore
 
-    return {
+    result = {
         "table": table,
         "status": status,
         "error": error,
         "warnings": warnings,
     }
+    if cache is not None:
+        cache.put(result, content_hash, rule_hash, VALIDATOR_VERSION)
+    return {**result, "cached": False}
 
 
-def validate_database(db_path: str = DB_PATH) -> pd.DataFrame:
-    """Validate every table in *db_path* and return a DataFrame of results."""
-    conn = sqlite3.connect(db_path, uri=True)
-    try:
+def validate_table(
+    conn: sqlite3.Connection,
+    table: str,
+    cache: Optional[ValidationCache] = None,
+) -> Dict[str, object]:
+    """Validate a single table and return the result dictionary."""
+    df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+    return validate_frame(df, table, cache)
+
+
+def _validate_table_at(db_path: str, table: str, use_cache: bool) -> Dict[str, object]:
+    """Validate *table* on a pooled connection (entry point for worker pools)."""
+    cache = ValidationCache.for_database(db_path) if use_cache else None
+    with get_pool(db_path).connection() as conn:
+        return validate_table(conn, table, cache)
+
+
+def validate_database(
+    db_path: str = DB_PATH,
+    workers: Optional[int] = None,
+    use_processes: bool = False,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Validate every table in *db_path* and return a DataFrame of results.
+
+    With ``workers`` > 1 the tables are validated concurrently on a thread
+    pool (or a process pool when ``use_processes`` is true). Results keep
+    the table order of the serial run.
+
+    With ``use_cache`` only tables whose content or rule changed since the
+    last run are revalidated (see :mod:`validation.cache`). Hit and miss
+    counts are logged and stored in ``results.attrs``.
+    """
+    cache = ValidationCache.for_database(db_path) if use_cache else None
+    with get_pool(db_path).connection() as conn:
         tables = list_tables(conn)
-        results = [validate_table(conn, table) for table in tables]
-    finally:
-        conn.close()
-
-    return pd.DataFrame(results)
+        if not workers or workers <= 1:
+            results = [validate_table(conn, table, cache) for table in tables]
+
+    if workers and workers > 1:
+        executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        n = len(tables)
+        with executor_cls(max_workers=workers) as executor:
+            results = list(
+                executor.map(_validate_table_at, [str(db_path)] * n, tables, [use_cache] * n)
+            )
+
+    df_results = pd.DataFrame(results)
+    if use_cache:
+        hits = int(df_results["cached"].sum()) if not df_results.empty else 0
+        df_results.attrs["cache_hits"] = hits
+        df_results.attrs["cache_misses"] = len(df_results) - hits
+        logger.info(
+            "Validation cache: %d hits, %d misses", hits, len(df_results) - hits
+        )
+    return df_results
 
 
 def generate_report(results: pd.DataFrame, report_path: Path) -> None:
@@ -7,9 +7,13 @@ Uso:
     validate_df(df, "PIB_Real_Gasto")   # lanza error o emite warnings
 """
 
+import hashlib
+import json
 import logging
-from typing import Dict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from pandas.api.types import (
     is_integer_dtype,
@@ -28,6 +32,17 @@ logging.basicConfig(
 
 _rules: Dict[str, TableRule] = load_rules()
 
+# Versión del motor de validación: incrementarla cuando cambie lo que
+# validate_df detecta, para invalidar los resultados cacheados.
+VALIDATOR_VERSION = "1"
+
+
+def rule_digest(table: str) -> str:
+    """Hash SHA-256 de la regla efectiva de `table` (YAML o valores por defecto)."""
+    rule = _rules.get(table, TableRule())
+    payload = json.dumps(asdict(rule), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 def _warn(msg: str) -> None:
     """Wrapper para warnings."""
@@ -35,16 +50,127 @@ def _warn(msg: str) -> None:
 
 
 # ---------------------------------------------------------------------
-def validate_df(df: pd.DataFrame, table: str) -> bool:
+@dataclass(frozen=True)
+class CompiledRule:
+    """
+    Chequeos de contenido (5-8) de un TableRule listos para ejecutarse en
+    una sola pasada NumPy sobre la matriz 2-D ``años x value_cols``.
+    """
+
+    value_cols: Tuple[str, ...]
+    check_no_nulls: bool
+    check_numeric: bool
+    check_gaps: bool
+    check_outliers: bool
+
+    @classmethod
+    def from_rule(cls, rule: TableRule) -> "CompiledRule":
+        return cls(
+            value_cols=tuple(rule.value_cols),
+            check_no_nulls=rule.check_no_nulls,
+            check_numeric=rule.check_numeric,
+            check_gaps=rule.check_gaps,
+            check_outliers=rule.check_outliers,
+        )
+
+    def run(self, df: pd.DataFrame, table: str, warn: Callable[[str], None]) -> None:
+        cols = list(self.value_cols)
+        idx = df.index
+        block = df[cols]
+
+        # 5. Nulos: conteo por columna de una sola vez
+        if self.check_no_nulls:
+            counts = block.isna().to_numpy().sum(axis=0)
+            if counts.any():
+                nulos = {c: int(n) for c, n in zip(cols, counts) if n > 0}
+                warn(f"{table}: nulos detectados {nulos}")
+
+        # 6. Tipo numérico
+        if self.check_numeric:
+            non_num = [c for c in cols if not is_numeric_dtype(block[c])]
+            if non_num:
+                raise TypeError(f"{table}: columnas no numéricas {non_num}")
+
+        # 7. Gaps: diferencias del índice contra la moda
+        if self.check_gaps and len(idx) > 1:
+            gaps = _find_gaps(idx)
+            if gaps is not None:
+                warn(f"{table}: huecos en los años {gaps}")
+
+        # 8. Outliers: |Δ interanual| > 4σ para todas las columnas a la vez
+        if self.check_outliers and cols and len(idx) > 1:
+            values = block.to_numpy(dtype=float)
+            delta = np.abs(np.diff(values, axis=0))
+            valid = ~np.isnan(delta)
+            n = valid.sum(axis=0)
+            filled = np.where(valid, delta, 0.0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = filled.sum(axis=0) / n
+                var = (np.where(valid, delta - mean, 0.0) ** 2).sum(axis=0) / (n - 1)
+                thr = np.sqrt(var) * 4
+                outliers = delta > thr
+            years = idx[1:]
+            for j, col in enumerate(cols):
+                if n[j] == 0:
+                    continue
+                if outliers[:, j].any():
+                    warn(f"{table}: outliers en {col} años {years[outliers[:, j]].tolist()}")
+
+
+def _find_gaps(idx: pd.Index) -> Optional[List[int]]:
+    """
+    Devuelve los años faltantes si algún salto del índice difiere del salto
+    más frecuente; ``None`` si la secuencia es regular.
+    """
+    if not is_integer_dtype(idx):
+        dif = idx.to_series().diff().dropna()
+        mode_gap = dif.mode()[0] if not dif.mode().empty else None
+        if mode_gap is not None and (dif != mode_gap).any():
+            return sorted(set(range(idx.min(), idx.max() + 1)) - set(idx))
+        return None
+
+    years = idx.to_numpy()
+    dif = np.diff(years)
+    steps, freq = np.unique(dif, return_counts=True)
+    mode_gap = steps[np.argmax(freq)]
+    if not (dif != mode_gap).any():
+        return None
+    return np.setdiff1d(np.arange(years.min(), years.max() + 1), years).tolist()
+
+
+_compiled: Dict[str, CompiledRule] = {}
+
+
+def compile_rule(table: str) -> CompiledRule:
+    """Compila (y memoriza) los chequeos de contenido de la regla de `table`."""
+    compiled = _compiled.get(table)
+    if compiled is None:
+        compiled = CompiledRule.from_rule(_rules.get(table, TableRule()))
+        _compiled[table] = compiled
+    return compiled
+
+
+# ---------------------------------------------------------------------
+def validate_df(
+    df: pd.DataFrame,
+    table: str,
+    warn: Optional[Callable[[str], None]] = None,
+) -> bool:
     """
     Valida un DataFrame según las reglas de `table`.
 
+    `warn` recibe cada advertencia emitida; si es None se envían al log.
+    No se modifica ningún estado global, por lo que es seguro validar
+    varias tablas en paralelo con un colector distinto por llamada.
+
     Lanza:
         - ValueError, TypeError, KeyError en fallos críticos
     Devuelve:
         - True si todo está OK (solo warnings emitidos)
     """
     rule: TableRule = _rules.get(table, TableRule())
+    if warn is None:
+        warn = _warn
 
     # -----------------------------------------------------------------
     # 0. Colocar índice
@@ -73,7 +199,7 @@ def validate_df(df: pd.DataFrame, table: str) -> bool:
     # -----------------------------------------------------------------
     # 3. Índice monotónico creciente
     if rule.check_monotonic_index and not idx.is_monotonic_increasing:
-        _warn(f"{table}: índice no está en orden cronológico")
+        warn(f"{table}: índice no está en orden cronológico")
 
     # -----------------------------------------------------------------
     # 4. Columnas requeridas
@@ -83,38 +209,7 @@ def validate_df(df: pd.DataFrame, table: str) -> bool:
             raise KeyError(f"{table}: faltan columnas {missing}")
 
     # -----------------------------------------------------------------
-    # 5. No Nulls
-    if rule.check_no_nulls:
-        nulos = df[rule.value_cols].isnull().sum()
-        if nulos.any():
-            _warn(f"{table}: nulos detectados {nulos[nulos>0].to_dict()}")
-
-    # -----------------------------------------------------------------
-    # 6. Tipo numérico
-    if rule.check_numeric:
-        non_num = [c for c in rule.value_cols if not is_numeric_dtype(df[c])]
-        if non_num:
-            raise TypeError(f"{table}: columnas no numéricas {non_num}")
-
-    # -----------------------------------------------------------------
-    # 7. Gaps en la secuencia
-    if rule.check_gaps and len(idx) > 1:
-        dif = idx.to_series().diff().dropna()
-        mode_gap = dif.mode()[0] if not dif.mode().empty else None
-        if mode_gap is not None and (dif != mode_gap).any():
-            gaps = sorted(set(range(idx.min(), idx.max() + 1)) - set(idx))
-            _warn(f"{table}: huecos en los años {gaps}")
-
-    # -----------------------------------------------------------------
-    # 8. Outliers simples (> 4 desviaciones estándar del cambio interanual)
-    if rule.check_outliers:
-        for col in rule.value_cols:
-            delta = df[col].diff().abs().dropna()
-            if delta.empty:
-                continue
-            thr = delta.std() * 4
-            outs = delta[delta > thr]
-            if not outs.empty:
-                _warn(f"{table}: outliers en {col} años {outs.index.tolist()}")
+    # 5-8. Chequeos de contenido en una sola pasada vectorizada
+    compile_rule(table).run(df, table, warn)
 
     return True